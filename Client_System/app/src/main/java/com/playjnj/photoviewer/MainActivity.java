@@ -127,15 +127,17 @@ public class MainActivity extends AppCompatActivity {
         protected List<ImageItem> doInBackground(String... urls) {
             List<ImageItem> itemList = new ArrayList<>();
             HttpURLConnection conn = null;
+            // 커서 페이지네이션 응답 {next, previous, results}의 next가 null이 될 때까지 모든 페이지를 읽음
+            String apiUrl = urls[0];
             try {
-                String apiUrl = urls[0];
-                URL urlAPI = new URL(apiUrl);
-                conn = (HttpURLConnection) urlAPI.openConnection();
-                conn.setRequestMethod("GET");
-                conn.setConnectTimeout(3000);
-                conn.setReadTimeout(3000);
-                int responseCode = conn.getResponseCode();
-                if (responseCode == HttpURLConnection.HTTP_OK) {
+                while (apiUrl != null && !apiUrl.isEmpty() && !isCancelled()) {
+                    URL urlAPI = new URL(apiUrl);
+                    conn = (HttpURLConnection) urlAPI.openConnection();
+                    conn.setRequestMethod("GET");
+                    conn.setConnectTimeout(3000);
+                    conn.setReadTimeout(3000);
+                    int responseCode = conn.getResponseCode();
+                    if (responseCode != HttpURLConnection.HTTP_OK) break;
                     InputStream is = conn.getInputStream();
                     BufferedReader reader = new BufferedReader(new InputStreamReader(is));
                     StringBuilder result = new StringBuilder();
@@ -144,8 +146,11 @@ public class MainActivity extends AppCompatActivity {
                         result.append(line);
                     }
                     is.close();
-                    String strJson = result.toString();
-                    JSONArray aryJson = new JSONArray(strJson);
+                    conn.disconnect();
+                    conn = null;
+                    JSONObject page = new JSONObject(result.toString());
+                    apiUrl = page.isNull("next") ? null : page.optString("next", null);
+                    JSONArray aryJson = page.getJSONArray("results");
                     // 각각 게시글에 대해 ImageItem object 생성
                     for (int i = 0; i < aryJson.length(); i++) {
                         post_json = (JSONObject) aryJson.get(i);
@@ -153,11 +158,15 @@ public class MainActivity extends AppCompatActivity {
                         String title = post_json.optString("title", "");
                         String text = post_json.optString("text", "");
                         int id = post_json.optInt("id", -1);
+                        // 목록에는 썸네일을 받고, 상세 화면에는 원본 URL 전달
+                        JSONObject renditions = post_json.optJSONObject("renditions");
+                        String thumbnailUrl = renditions != null
+                                ? renditions.optString("thumbnail", imageUrl) : imageUrl;
                         if (imageUrl != null && !imageUrl.isEmpty()) {
                             HttpURLConnection imgConn = null;
                             InputStream imgStream = null;
                             try {
-                                URL myImageUrl = new URL(imageUrl);
+                                URL myImageUrl = new URL(thumbnailUrl);
                                 imgConn = (HttpURLConnection) myImageUrl.openConnection();
                                 imgConn.setConnectTimeout(5000);
                                 imgConn.setReadTimeout(5000);
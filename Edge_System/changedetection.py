@@ -2,10 +2,16 @@ import datetime
 import os
 import pathlib
 import base64
+import queue
+import struct
+import threading
 import time
+from collections import deque
 
 import cv2
+import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
 
 BASE_DIR = pathlib.Path(__file__).resolve().parent
@@ -22,13 +28,34 @@ class ChangeDetection:
     # 볼라드 API 설정
     BOLLARD_API_ENABLED = os.getenv("BOLLARD_API_ENABLED", "true").lower() == "true"
     last_bollard_send_time = 0
-    BOLLARD_SEND_INTERVAL = 1
+    BOLLARD_SEND_INTERVAL = float(os.getenv("BOLLARD_SEND_INTERVAL", "1"))
+
+    # 배치 전송 설정 (BOLLARD_BATCH_SIZE > 1 이면 프레임을 모아서 전송)
+    BOLLARD_BATCH_SIZE = int(os.getenv("BOLLARD_BATCH_SIZE", "1"))
+    BOLLARD_BATCH_INTERVAL = float(os.getenv("BOLLARD_BATCH_INTERVAL", "2"))
+
+    # 전송 포맷: "json" (JSON + base64), "binary" (application/x-bollard-frame),
+    # "grpc" (Result.Ingest 스트림, BOLLARD_GRPC_TARGET=서버:포트)
+    BOLLARD_TRANSPORT = os.getenv("BOLLARD_TRANSPORT", "json").lower()
+    BOLLARD_GRPC_TARGET = os.getenv("BOLLARD_GRPC_TARGET", "localhost:50051")
+    BOLLARD_FRAME_MEDIA_TYPE = "application/x-bollard-frame"
+    # magic, width, height, timestamp, n_det, jpeg_len
+    BOLLARD_FRAME_HEADER = struct.Struct("<4sIIdII")
+
+    # 이 카메라가 담당하는 볼라드 ID
+    BOLLARD_ID = int(os.getenv("BOLLARD_ID", "0"))
 
     def __init__(self, names):
         self.result_prev = [0 for i in range(len(names))]
+        self.bollard_sender = None
+        if self.BOLLARD_API_ENABLED and self.token and self.HOST:
+            self.bollard_sender = BollardSender(self)
         print(self.token)
 
-    def add(self, names, detected_current, save_dir, image, detections=None):
+    def add(
+        self, names, detected_current, save_dir, image, detections=None, timestamp=None
+    ):
+        """timestamp: 프레임 촬영 시각 (epoch 초, 없으면 현재 시각) - 서버의 지연 계산/프레임 순서 판단에 사용"""
         self.title = ""
         self.text = ""
         change_flag = 0
@@ -51,7 +78,11 @@ class ChangeDetection:
         if self.BOLLARD_API_ENABLED and detections is not None:
             current_time = time.time()
             if current_time - self.last_bollard_send_time >= self.BOLLARD_SEND_INTERVAL:
-                self.send_to_bollard_api(detections, image)
+                # 인코딩과 네트워크 전송은 전송 스레드에서 처리 (추론 루프는 대기하지 않음)
+                if self.bollard_sender:
+                    self.bollard_sender.submit(
+                        detections, image, timestamp or current_time
+                    )
                 self.last_bollard_send_time = current_time
 
     def send(self, save_dir, image):
@@ -89,43 +120,376 @@ class ChangeDetection:
         )
         print(res)
 
-    def send_to_bollard_api(self, detections, image):
-        """볼라드 API로 검출 결과 전송"""
-        if not self.token or not self.HOST:
-            return
+    def close(self):
+        """전송 대기 중인 프레임을 보내고 전송 스레드 종료"""
+        if self.bollard_sender:
+            self.bollard_sender.close()
 
-        headers = {
-            "Authorization": f"Token {self.token}",
-            "Content-Type": "application/json",
-        }
+    @staticmethod
+    def encode_jpeg(image):
+        try:
+            _, encoded = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, 70])
+            return encoded.tobytes()
+        except:
+            return b""
 
+    def build_bollard_payload(self, detections, image, timestamp):
+        """볼라드 API 전송용 프레임 데이터 생성"""
         height, width = image.shape[:2]
 
-        # 이미지 base64 인코딩 (검출 시에만)
-        image_base64 = ""
-        if detections:
-            try:
-                _, encoded = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, 70])
-                image_base64 = base64.b64encode(encoded).decode("utf-8")
-            except:
-                pass
-
         payload = {
             "detections": detections if detections else [],
             "image_width": width,
             "image_height": height,
+            "bollard_id": self.BOLLARD_ID,
+            "timestamp": datetime.datetime.fromtimestamp(timestamp)
+            .astimezone()
+            .isoformat(),
         }
 
-        # 이미지가 있을 때만 포함
-        if image_base64:
-            payload["image"] = image_base64
+        # 이미지 base64 인코딩 (검출 시에만)
+        if detections:
+            jpeg = self.encode_jpeg(image)
+            if jpeg:
+                payload["image"] = base64.b64encode(jpeg).decode("utf-8")
+
+        return payload
+
+    def build_bollard_frame(self, detections, image, timestamp):
+        """볼라드 API 바이너리 프레임 생성 (헤더 + float32 박스 배열 + JPEG 원본)"""
+        height, width = image.shape[:2]
+
+        jpeg = self.encode_jpeg(image) if detections else b""
+
+        boxes = np.array(
+            [
+                [*d["bbox"][:4], d["confidence"], d["class_id"]]
+                for d in detections or []
+            ],
+            dtype="<f4",
+        )
+        header = self.BOLLARD_FRAME_HEADER.pack(
+            b"BLD1", width, height, timestamp, len(boxes), len(jpeg)
+        )
+        return header + boxes.tobytes() + jpeg
+
+    @staticmethod
+    def encode_varint(value):
+        out = bytearray()
+        while value > 0x7F:
+            out.append(0x80 | value & 0x7F)
+            value >>= 7
+        out.append(value)
+        return bytes(out)
+
+    def build_bollard_message(
+        self, detections, image, timestamp, seq, attach_image=False
+    ):
+        """
+        gRPC Ingest용 Frame 메시지 (protobuf 인코딩, Service_System result.proto 참고)
+
+        JPEG는 attach_image일 때만 실음 (서버가 상태 변경을 알린 직후 프레임)
+        """
+        height, width = image.shape[:2]
+        varint = self.encode_varint
+
+        jpeg = self.encode_jpeg(image) if attach_image else b""
+        boxes = np.array(
+            [
+                [*d["bbox"][:4], d["confidence"], d["class_id"]]
+                for d in detections or []
+            ],
+            dtype="<f4",
+        ).tobytes()
+
+        message = b"\x08" + varint(self.BOLLARD_ID & 0xFFFFFFFFFFFFFFFF)
+        message += b"\x10" + varint(seq)
+        message += b"\x18" + varint(width) + b"\x20" + varint(height)
+        message += b"\x29" + struct.pack("<d", timestamp)
+        if boxes:
+            message += b"\x32" + varint(len(boxes)) + boxes
+        if jpeg:
+            message += b"\x3a" + varint(len(jpeg)) + jpeg
+        return message
+
+
+class BollardIngestStream:
+    """
+    gRPC Ingest 스트림 (BOLLARD_TRANSPORT=grpc)
+
+    - 하나의 HTTP/2 스트림으로 Frame 메시지를 보내고 같은 스트림으로 Decision 응답을 받음
+    - 응답을 기다리는 프레임이 MAX_INFLIGHT개면 새 프레임을 버림 (서버 지연 시 적체 방지)
+    - 스트림이 끊기면 다음 프레임을 보낼 때 다시 연결하되, 연속으로 끊기면 재연결 간격을
+      지수적으로 늘림 (BOLLARD_GRPC_BACKOFF ~ BOLLARD_GRPC_BACKOFF_MAX초, 응답을 받으면 초기화)
+    - 재연결을 기다리는 동안 들어온 프레임은 버림 (dropped)
+    - 프레임은 검출 결과만 보내고(수백 바이트), Decision의 action이 none/error가 아니면
+      (서버에서 볼라드 상태가 바뀜) 다음에 보내는 프레임 하나에만 JPEG를 붙임
+    """
+
+    MAX_INFLIGHT = int(os.getenv("BOLLARD_GRPC_MAX_INFLIGHT", "4"))
+    BACKOFF = float(os.getenv("BOLLARD_GRPC_BACKOFF", "0.5"))
+    BACKOFF_MAX = float(os.getenv("BOLLARD_GRPC_BACKOFF_MAX", "10"))
+
+    def __init__(self, cd):
+        import grpc  # BOLLARD_TRANSPORT=grpc 일 때만 필요 (pip install grpcio)
+
+        self.grpc = grpc
+        self.cd = cd
+        self.channel = grpc.insecure_channel(cd.BOLLARD_GRPC_TARGET)
+        # 직렬화는 build_bollard_message에서 하므로 bytes를 그대로 주고받음
+        self.ingest = self.channel.stream_stream("/result.Result/Ingest")
+        self.metadata = (("authorization", f"Token {cd.token}"),)
+        self.lock = threading.Lock()
+        self.requests = None
+        self.inflight = 0
+        self.seq = 0
+        self.failures = 0  # 응답 없이 연속으로 끊긴 횟수
+        self.retry_at = 0.0
+        self.want_image = False  # 서버가 상태 변경을 알림 -> 다음 프레임에 JPEG 첨부
+        self.sent = self.acked = self.dropped = self.failed = 0
+
+    def connect(self):
+        requests_queue = queue.Queue()
+        responses = self.ingest(iter(requests_queue.get, None), metadata=self.metadata)
+        self.requests = requests_queue
+        self.inflight = 0
+        threading.Thread(
+            target=self.read,
+            args=(responses, requests_queue),
+            name="bollard-ingest",
+            daemon=True,
+        ).start()
+
+    @staticmethod
+    def decode_decision_action(data):
+        """Decision 메시지(bytes)에서 action(필드 4) 문자열만 꺼냄"""
+        pos = 0
+        while pos < len(data):
+            key, pos = BollardIngestStream.decode_varint(data, pos)
+            field, wire_type = key >> 3, key & 7
+            if wire_type == 0:
+                _, pos = BollardIngestStream.decode_varint(data, pos)
+            elif wire_type == 5:
+                pos += 4
+            elif wire_type == 1:
+                pos += 8
+            elif wire_type == 2:
+                length, pos = BollardIngestStream.decode_varint(data, pos)
+                if field == 4:
+                    return data[pos : pos + length].decode("utf-8", "replace")
+                pos += length
+            else:
+                break
+        return "none"
 
+    @staticmethod
+    def decode_varint(data, pos):
+        value = shift = 0
+        while True:
+            byte = data[pos]
+            pos += 1
+            value |= (byte & 0x7F) << shift
+            if not byte & 0x80:
+                return value, pos
+            shift += 7
+
+    def read(self, responses, requests_queue):
         try:
-            requests.post(
-                self.HOST + "/api/bollard/detection/",
-                json=payload,
-                headers=headers,
-                timeout=1,
+            for response in responses:
+                action = self.decode_decision_action(response)
+                with self.lock:
+                    self.inflight -= 1
+                    self.acked += 1
+                    self.failures = 0
+                    if action not in ("none", "error"):
+                        self.want_image = True
+        except self.grpc.RpcError as e:
+            print(f"Bollard ingest stream closed: {e.code()}")
+
+        with self.lock:
+            if self.requests is requests_queue:
+                self.failed += self.inflight
+                self.requests = None
+                delay = min(self.BACKOFF * 2**self.failures, self.BACKOFF_MAX)
+                self.failures += 1
+                self.retry_at = time.monotonic() + delay
+        requests_queue.put(None)
+
+    def send(self, detections, image, timestamp):
+        with self.lock:
+            if self.requests is None:
+                if time.monotonic() < self.retry_at:
+                    self.dropped += 1
+                    return False
+                self.connect()
+            if self.inflight >= self.MAX_INFLIGHT:
+                self.dropped += 1
+                return False
+            self.seq += 1
+            self.inflight += 1
+            requests_queue = self.requests
+            seq = self.seq
+            attach_image, self.want_image = self.want_image, False
+
+        requests_queue.put(
+            self.cd.build_bollard_message(
+                detections, image, timestamp, seq, attach_image=attach_image
             )
-        except:
-            pass
+        )
+        self.sent += 1
+        return True
+
+    def close(self):
+        with self.lock:
+            if self.requests is not None:
+                self.requests.put(None)
+                self.requests = None
+        self.channel.close()
+
+
+class BollardSender:
+    """
+    볼라드 API 전송 스레드
+
+    - keep-alive 연결을 재사용하는 requests.Session 사용
+    - 단건 모드: 대기 큐에서 가장 최근 프레임만 전송 (latest-wins)
+    - 배치 모드: 개수(BOLLARD_BATCH_SIZE) 또는 시간(BOLLARD_BATCH_INTERVAL) 조건으로 전송
+    - 실패 시 지수 백오프로 재시도, 단건 모드에서는 새 프레임이 오면 재시도 중단
+    - BOLLARD_TRANSPORT=grpc 이면 단건 프레임을 Ingest 스트림(BollardIngestStream)으로 전송
+    """
+
+    QUEUE_SIZE = int(os.getenv("BOLLARD_QUEUE_SIZE", "0"))
+    RETRIES = int(os.getenv("BOLLARD_SEND_RETRIES", "3"))
+    BACKOFF = float(os.getenv("BOLLARD_SEND_BACKOFF", "0.2"))
+    TIMEOUT = float(os.getenv("BOLLARD_SEND_TIMEOUT", "1"))
+
+    def __init__(self, cd):
+        self.cd = cd
+        self.batch_size = max(1, cd.BOLLARD_BATCH_SIZE)
+        self.pending = deque(maxlen=self.QUEUE_SIZE or self.batch_size * 4)
+        self.cond = threading.Condition()
+        self.closed = False
+        self.sent = self.dropped = self.failed = 0
+
+        self.session = requests.Session()
+        self.session.headers["Authorization"] = f"Token {cd.token}"
+        self.session.mount(cd.HOST, HTTPAdapter(pool_connections=1, pool_maxsize=1))
+        self.ingest = None
+        if cd.BOLLARD_TRANSPORT == "grpc":
+            self.ingest = BollardIngestStream(cd)
+
+        self.thread = threading.Thread(
+            target=self.run, name="bollard-sender", daemon=True
+        )
+        self.thread.start()
+
+    def submit(self, detections, image, timestamp):
+        """추론 루프에서 호출, 대기 없이 반환 (큐가 가득 차면 가장 오래된 프레임을 버림)"""
+        with self.cond:
+            if len(self.pending) == self.pending.maxlen:
+                self.dropped += 1
+            self.pending.append((detections, image, timestamp))
+            self.cond.notify()
+
+    def close(self, timeout=5):
+        with self.cond:
+            self.closed = True
+            self.cond.notify()
+        self.thread.join(timeout)
+        self.session.close()
+        if self.ingest:
+            self.ingest.close()
+
+    def run(self):
+        batch, deadline = [], None
+        while True:
+            with self.cond:
+                while not self.pending and not self.closed:
+                    if batch and time.time() >= deadline:
+                        break
+                    self.cond.wait(
+                        None if not batch else max(0, deadline - time.time())
+                    )
+
+                if self.batch_size == 1:
+                    if self.pending:
+                        item = self.pending.pop()
+                        self.dropped += len(
+                            self.pending
+                        )  # 처리 전에 새 프레임으로 대체됨
+                        self.pending.clear()
+                    else:
+                        item = None
+                else:
+                    if deadline is None and self.pending:
+                        deadline = time.time() + self.cd.BOLLARD_BATCH_INTERVAL
+                    batch.extend(self.pending)
+                    self.pending.clear()
+                closed = self.closed
+
+            if self.batch_size == 1:
+                if item:
+                    self.send_frame(*item)
+            else:
+                while len(batch) >= self.batch_size:
+                    self.send_batch(batch[: self.batch_size])
+                    del batch[: self.batch_size]
+                if batch and (closed or time.time() >= deadline):
+                    self.send_batch(batch)
+                    batch = []
+                if not batch:
+                    deadline = None
+
+            if closed and not self.pending and not batch:
+                return
+
+    def send_frame(self, detections, image, timestamp):
+        if self.ingest:
+            self.ingest.send(detections, image, timestamp)
+            return
+
+        url = self.cd.HOST + "/api/bollard/detection/"
+        if self.cd.BOLLARD_TRANSPORT == "binary":
+            self.post(
+                url,
+                data=self.cd.build_bollard_frame(detections, image, timestamp),
+                params={"bollard_id": self.cd.BOLLARD_ID},
+                headers={"Content-Type": self.cd.BOLLARD_FRAME_MEDIA_TYPE},
+            )
+        else:
+            self.post(
+                url, json=self.cd.build_bollard_payload(detections, image, timestamp)
+            )
+
+    def send_batch(self, batch):
+        frames = [self.cd.build_bollard_payload(*item) for item in batch]
+        self.post(
+            self.cd.HOST + "/api/bollard/detection/batch/",
+            json={"frames": frames},
+            retry_stale=True,
+        )
+
+    def post(self, url, retry_stale=False, **kwargs):
+        for attempt in range(self.RETRIES + 1):
+            try:
+                res = self.session.post(url, timeout=self.TIMEOUT, **kwargs)
+                if res.ok:
+                    self.sent += 1
+                    return True
+                if res.status_code < 500:
+                    # 4xx(인증/검증 실패)는 재시도해도 같은 결과이므로 바로 실패 처리
+                    self.failed += 1
+                    print(
+                        f"Bollard API rejected frame: {res.status_code} {res.text[:200]}"
+                    )
+                    return False
+            except requests.RequestException:
+                pass
+
+            # 더 최신 프레임이 대기 중이면 지난 프레임 재시도는 의미 없음
+            if not retry_stale and self.pending:
+                break
+            time.sleep(self.BACKOFF * 2**attempt)
+
+        self.failed += 1
+        return False
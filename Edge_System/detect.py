@@ -33,6 +33,7 @@ import csv
 import os
 import platform
 import sys
+import time
 from pathlib import Path
 
 import torch
@@ -48,6 +49,8 @@ from ultralytics.utils.plotting import Annotator, colors, save_one_box
 from models.common import DetectMultiBackend
 from utils.dataloaders import IMG_FORMATS, VID_FORMATS, LoadImages, LoadScreenshots, LoadStreams
 from changedetection import ChangeDetection
+from utils.motion import MotionGate
+from utils.pipeline import Pipeline
 from utils.general import (
     LOGGER,
     Profile,
@@ -98,6 +101,15 @@ def run(
     half=False,  # use FP16 half-precision inference
     dnn=False,  # use OpenCV DNN for ONNX inference
     vid_stride=1,  # video frame-rate stride
+    pipeline=False,  # run capture/preprocess/inference/postprocess on separate threads
+    pipeline_depth=2,  # max batches queued between pipeline stages
+    motion_gate=False,  # skip inference on frames without motion and reuse the previous result
+    motion_method="diff",  # motion gate method, diff or mog2
+    motion_threshold=0.005,  # fraction of changed gate pixels that counts as motion
+    motion_pixel_threshold=15,  # grey-level difference that marks a gate pixel as changed
+    motion_refresh=5.0,  # re-run inference at least every N seconds per stream
+    motion_region=None,  # gated region as pixel x1 y1 x2 y2, whole frame (or ROI) if None
+    roi=None,  # region of interest cropped before letterboxing: x1 y1 x2 y2, polygon x y pairs or per-camera *.yaml
 ):
     """Runs YOLOv5 detection inference on various sources like images, videos, directories, streams, etc.
 
@@ -133,6 +145,24 @@ def run(
         half (bool): If True, use FP16 half-precision inference. Default is False.
         dnn (bool): If True, use OpenCV DNN backend for ONNX inference. Default is False.
         vid_stride (int): Stride for processing video frames, to skip frames between processing. Default is 1.
+        pipeline (bool): If True, run capture, preprocessing, inference and postprocessing as threaded stages joined
+            by bounded queues, so inference on one batch overlaps with postprocessing of the previous one. Default is
+            False.
+        pipeline_depth (int): Maximum number of batches queued between two pipeline stages. Default is 2.
+        motion_gate (bool): If True, run a downscaled motion check before inference and reuse a stream's previous
+            detections when nothing moved in `motion_region`. Default is False.
+        motion_method (str): Motion check, 'diff' against the last inferred frame or 'mog2' background subtraction.
+            Default is 'diff'.
+        motion_threshold (float): Fraction of changed gate pixels above which a frame counts as moving. Default is
+            0.005.
+        motion_pixel_threshold (int): Grey-level difference above which a gate pixel counts as changed. Default is 15.
+        motion_refresh (float): Seconds after which a stream is re-inferred even without motion. Default is 5.0.
+        motion_region (list[int] | None): Gated region as pixel x1, y1, x2, y2 on the full frame. Default is None
+            (the region of interest if set, else the whole frame).
+        roi (list[float] | str | None): Region of interest cropped before letterboxing, as pixel x1, y1, x2, y2, as
+            x, y pairs of a polygon, or as a *.yaml file mapping stream indices to such lists. Boxes are mapped back
+            to full-frame coordinates, so a smaller `imgsz` (e.g. 320) keeps the same effective resolution on the
+            region. Default is None (whole frame).
 
     Returns:
         None
@@ -172,73 +202,146 @@ def run(
     bs = 1  # batch_size
     if webcam:
         view_img = check_imshow(warn=True)
-        dataset = LoadStreams(source, img_size=imgsz, stride=stride, auto=pt, vid_stride=vid_stride)
+        # batches stay valid while queued between pipeline stages: 3 queues of pipeline_depth plus one per stage
+        hold = 3 * pipeline_depth + 4 if pipeline else 1
+        dataset = LoadStreams(
+            source, img_size=imgsz, stride=stride, auto=pt, vid_stride=vid_stride, hold=hold, roi=roi
+        )
         bs = len(dataset)
     elif screenshot:
         dataset = LoadScreenshots(source, img_size=imgsz, stride=stride, auto=pt)
     else:
-        dataset = LoadImages(source, img_size=imgsz, stride=stride, auto=pt, vid_stride=vid_stride)
+        dataset = LoadImages(source, img_size=imgsz, stride=stride, auto=pt, vid_stride=vid_stride, roi=roi)
     vid_path, vid_writer = [None] * bs, [None] * bs
+    rois = getattr(dataset, "rois", [None] * bs)  # per-stream regions of interest
 
     # Run inference
     model.warmup(imgsz=(1 if pt or model.triton else bs, 3, *imgsz))  # warmup
     seen, windows, dt = 0, [], (Profile(device=device), Profile(device=device), Profile(device=device))
-    for path, im, im0s, vid_cap, s in dataset:
+    gate, last_pred = None, {}  # motion gate and the last detections per stream, reused for skipped frames
+    if motion_gate:
+        gate = MotionGate(
+            threshold=motion_threshold,
+            pixel_threshold=motion_pixel_threshold,
+            refresh=motion_refresh,
+            region=motion_region,
+            method=motion_method,
+        )
+
+    # Define the path for the CSV file
+    csv_path = save_dir / "predictions.csv"
+
+    # Create or append to the CSV file
+    def write_to_csv(image_name, prediction, confidence):
+        """Writes prediction data for an image to a CSV file, appending if the file exists."""
+        data = {"Image Name": image_name, "Prediction": prediction, "Confidence": confidence}
+        file_exists = os.path.isfile(csv_path)
+        with open(csv_path, mode="a", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=data.keys())
+            if not file_exists:
+                writer.writeheader()
+            writer.writerow(data)
+
+    def capture():
+        """Yields dataset batches with the source mode, frame index and (streams only) capture times/freshness."""
+        for path, im, im0s, vid_cap, s in dataset:
+            if webcam:
+                meta = (dataset.mode, dataset.count, dataset.frame_times, dataset.fresh)
+            else:
+                meta = (dataset.mode, getattr(dataset, "frame", 0), None, None)
+            yield path, im, im0s, vid_cap, s, meta
+
+    def preprocess(batch):
+        """
+        Converts the images of a letterboxed numpy batch that need inference to a normalized model input tensor.
+
+        Streams that repeated their previous frame (`fresh[i]` False) and, with the motion gate, fresh frames without
+        motion are marked False in `run` and left out of the tensor.
+        """
+        path, im, im0s, vid_cap, s, meta = batch
+        fresh = meta[3]
+        run = None  # False: no forward pass for this image
+        if gate or (fresh and not all(fresh)):
+            run = list(fresh) if fresh else [True] * (len(im0s) if webcam else 1)
+            if gate:
+                frames = im0s if webcam else [im0s]
+                if motion_region is None:  # gate on the regions of interest
+                    frames = [r.crop(x) if r else x for x, r in zip(frames, rois)]
+                run = [r and gate.check(i, x) for i, (x, r) in enumerate(zip(frames, run))]
         with dt[0]:
+            if im.ndim == 3:
+                im = im[None]  # expand for batch dim
+            if run is not None and not all(run):
+                im = im[[i for i, r in enumerate(run) if r]]
             im = torch.from_numpy(im).to(model.device)
             im = im.half() if model.fp16 else im.float()  # uint8 to fp16/32
             im /= 255  # 0 - 255 to 0.0 - 1.0
-            if len(im.shape) == 3:
-                im = im[None]  # expand for batch dim
-            if model.xml and im.shape[0] > 1:
-                ims = torch.chunk(im, im.shape[0], 0)
-
-        # Inference
+        return path, im, im0s, vid_cap, s, meta, run
+
+    @smart_inference_mode()  # grad mode is per thread and this stage may run on a pipeline worker
+    def infer(batch):
+        """Runs the model forward pass and NMS, returning predictions with the inference time in ms.
+
+        Images left out of the input by `preprocess` get a copy of their stream's previous detections instead (stale
+        frames are skipped by `postprocess` anyway).
+        """
+        path, im, im0s, vid_cap, s, meta, run = batch
+        if run is None:
+            return path, im, im0s, vid_cap, s, meta, forward(im, path), dt[1].dt
+
+        keep = [i for i, r in enumerate(run) if r]
+        pred = forward(im, path) if keep else []
+        if gate:
+            gate.record(len(keep), dt[1].dt + dt[2].dt if keep else 0.0)
+        for i, det in zip(keep, pred):
+            last_pred[i] = det
+        empty = torch.zeros((0, 6), device=im.device)
+        pred = [last_pred.get(i, empty).clone() for i in range(len(run))]  # postprocess rescales boxes in place
+        return path, im, im0s, vid_cap, s, meta, pred, dt[1].dt if keep else 0.0
+
+    def forward(im, path):
+        """Returns NMS-filtered predictions for a model input batch."""
         with dt[1]:
-            visualize = increment_path(save_dir / Path(path).stem, mkdir=True) if visualize else False
+            visualize_path = increment_path(save_dir / Path(path).stem, mkdir=True) if visualize else False
             if model.xml and im.shape[0] > 1:
                 pred = None
-                for image in ims:
+                for image in torch.chunk(im, im.shape[0], 0):
                     if pred is None:
-                        pred = model(image, augment=augment, visualize=visualize).unsqueeze(0)
+                        pred = model(image, augment=augment, visualize=visualize_path).unsqueeze(0)
                     else:
-                        pred = torch.cat((pred, model(image, augment=augment, visualize=visualize).unsqueeze(0)), dim=0)
+                        pred = torch.cat(
+                            (pred, model(image, augment=augment, visualize=visualize_path).unsqueeze(0)), dim=0
+                        )
                 pred = [pred, None]
             else:
-                pred = model(im, augment=augment, visualize=visualize)
+                pred = model(im, augment=augment, visualize=visualize_path)
         # NMS
         with dt[2]:
             pred = non_max_suppression(pred, conf_thres, iou_thres, classes, agnostic_nms, max_det=max_det)
 
         # Second-stage classifier (optional)
         # pred = utils.general.apply_classifier(pred, classifier_model, im, im0s)
+        return pred
 
-        # Define the path for the CSV file
-        csv_path = save_dir / "predictions.csv"
-
-        # Create or append to the CSV file
-        def write_to_csv(image_name, prediction, confidence):
-            """Writes prediction data for an image to a CSV file, appending if the file exists."""
-            data = {"Image Name": image_name, "Prediction": prediction, "Confidence": confidence}
-            file_exists = os.path.isfile(csv_path)
-            with open(csv_path, mode="a", newline="") as f:
-                writer = csv.DictWriter(f, fieldnames=data.keys())
-                if not file_exists:
-                    writer.writeheader()
-                writer.writerow(data)
+    def postprocess(batch):
+        """Builds results, annotates, reports to the bollard API and saves/shows each image of the batch."""
+        nonlocal seen
+        path, im, im0s, vid_cap, s, (mode, frame, capture_times, fresh), pred, inference_dt = batch
 
         # Process predictions
         for i, det in enumerate(pred):  # per image
+            if fresh and not fresh[i]:
+                continue  # stream i repeated its previous frame, results were already reported
             seen += 1
             if webcam:  # batch_size >= 1
-                p, im0, frame = path[i], im0s[i].copy(), dataset.count
+                p, im0 = path[i], im0s[i].copy()  # the loader reuses im0s buffers, copy before annotating/sending
                 s += f"{i}: "
             else:
-                p, im0, frame = path, im0s.copy(), getattr(dataset, "frame", 0)
+                p, im0 = path, im0s.copy()
 
             p = Path(p)  # to Path
             save_path = str(save_dir / p.name)  # im.jpg
-            txt_path = str(save_dir / "labels" / p.stem) + ("" if dataset.mode == "image" else f"_{frame}")  # im.txt
+            txt_path = str(save_dir / "labels" / p.stem) + ("" if mode == "image" else f"_{frame}")  # im.txt
             s += "{:g}x{:g} ".format(*im.shape[2:])  # print string
             gn = torch.tensor(im0.shape)[[1, 0, 1, 0]]  # normalization gain whwh
             imc = im0.copy() if save_crop else im0  # for save_crop
@@ -246,8 +349,13 @@ def run(
             detected = [0 for _ in range(len(names))]
             detections_for_bollard = []  # 볼라드 API용 검출 정보
             if len(det):
-                # Rescale boxes from img_size to im0 size
-                det[:, :4] = scale_boxes(im.shape[2:], det[:, :4], im0.shape).round()
+                # Rescale boxes from img_size to im0 size, through the region of interest crop if any
+                r = rois[i if webcam else 0]
+                if r:
+                    x1, y1, x2, y2 = r.bounds(im0.shape)
+                    det[:, :4] = scale_boxes(im.shape[2:], det[:, :4], (y2 - y1, x2 - x1), offset=(x1, y1)).round()
+                else:
+                    det[:, :4] = scale_boxes(im.shape[2:], det[:, :4], im0.shape).round()
 
                 # Print results
                 for c in det[:, 5].unique():
@@ -291,7 +399,14 @@ def run(
                         annotator.box_label(xyxy, label, color=colors(c, True))
                     if save_crop:
                         save_one_box(xyxy, imc, file=save_dir / "crops" / names[c] / f"{p.stem}.jpg", BGR=True)
-            cd.add(names, detected, save_dir, im0, detections=detections_for_bollard)
+            cd.add(
+                names,
+                detected,
+                save_dir,
+                im0,
+                detections=detections_for_bollard,
+                timestamp=capture_times[i] if capture_times else None,
+            )
             # Stream results
             im0 = annotator.result()
             if view_img:
@@ -304,7 +419,7 @@ def run(
 
             # Save results (image with detections)
             if save_img:
-                if dataset.mode == "image":
+                if mode == "image":
                     cv2.imwrite(save_path, im0)
                 else:  # 'video' or 'stream'
                     if vid_path[i] != save_path:  # new video
@@ -322,11 +437,31 @@ def run(
                     vid_writer[i].write(im0)
 
         # Print time (inference-only)
-        LOGGER.info(f"{s}{'' if len(det) else '(no detections), '}{dt[1].dt * 1e3:.1f}ms")
+        LOGGER.info(f"{s}{'' if len(det) else '(no detections), '}{inference_dt * 1e3:.1f}ms")
+
+    start = time.perf_counter()
+    if pipeline:
+        # Inference on batch N overlaps with capture of N+1 and postprocessing of N-1
+        runner = Pipeline(
+            ("capture", capture()),
+            [("preprocess", preprocess), ("infer", infer), ("postprocess", postprocess)],
+            depth=pipeline_depth,
+        )
+        runner.run()
+        LOGGER.info(runner.summary())
+    else:
+        for batch in capture():
+            postprocess(infer(preprocess(batch)))
+    elapsed = time.perf_counter() - start
+
+    cd.close()  # flush frames still queued for the bollard API and stop the sender thread
 
     # Print results
     t = tuple(x.t / seen * 1e3 for x in dt)  # speeds per image
     LOGGER.info(f"Speed: %.1fms pre-process, %.1fms inference, %.1fms NMS per image at shape {(1, 3, *imgsz)}" % t)
+    LOGGER.info(f"Throughput: {seen / elapsed:.1f} images/s sustained over {elapsed:.1f}s")
+    if gate:
+        LOGGER.info(gate.summary())
     if save_txt or save_img:
         s = f"\n{len(list(save_dir.glob('labels/*.txt')))} labels saved to {save_dir / 'labels'}" if save_txt else ""
         LOGGER.info(f"Results saved to {colorstr('bold', save_dir)}{s}")
@@ -368,6 +503,17 @@ def parse_opt():
         --dnn (bool, optional): Flag to use OpenCV DNN for ONNX inference. Defaults to False.
         --vid-stride (int, optional): Video frame-rate stride, determining the number of frames to skip in between
             consecutive frames. Defaults to 1.
+        --pipeline (bool, optional): Flag to run capture/preprocess/inference/postprocess as threaded stages.
+            Defaults to False.
+        --pipeline-depth (int, optional): Maximum batches queued between pipeline stages. Defaults to 2.
+        --motion-gate (bool, optional): Flag to skip inference on frames without motion. Defaults to False.
+        --motion-method (str, optional): Motion gate method, 'diff' or 'mog2'. Defaults to 'diff'.
+        --motion-threshold (float, optional): Fraction of changed gate pixels that counts as motion. Defaults to 0.005.
+        --motion-pixel-threshold (int, optional): Grey-level change that marks a gate pixel. Defaults to 15.
+        --motion-refresh (float, optional): Seconds between forced inferences per stream. Defaults to 5.0.
+        --motion-region (list[int], optional): Gated region as pixel x1 y1 x2 y2. Defaults to the ROI or whole frame.
+        --roi (list[str], optional): Region of interest as x1 y1 x2 y2, polygon x y pairs, or a per-camera *.yaml.
+            Defaults to the whole frame.
 
     Returns:
         argparse.Namespace: Parsed command-line arguments as an argparse.Namespace object.
@@ -413,6 +559,15 @@ def parse_opt():
     parser.add_argument("--half", action="store_true", help="use FP16 half-precision inference")
     parser.add_argument("--dnn", action="store_true", help="use OpenCV DNN for ONNX inference")
     parser.add_argument("--vid-stride", type=int, default=1, help="video frame-rate stride")
+    parser.add_argument("--pipeline", action="store_true", help="overlap capture, inference and postprocessing")
+    parser.add_argument("--pipeline-depth", type=int, default=2, help="max batches queued between pipeline stages")
+    parser.add_argument("--motion-gate", action="store_true", help="skip inference on frames without motion")
+    parser.add_argument("--motion-method", default="diff", choices=["diff", "mog2"], help="motion gate method")
+    parser.add_argument("--motion-threshold", type=float, default=0.005, help="changed pixel fraction for motion")
+    parser.add_argument("--motion-pixel-threshold", type=int, default=15, help="grey-level change per gate pixel")
+    parser.add_argument("--motion-refresh", type=float, default=5.0, help="max seconds between inferences per stream")
+    parser.add_argument("--motion-region", nargs=4, type=int, help="gated region as pixel x1 y1 x2 y2")
+    parser.add_argument("--roi", nargs="+", help="region of interest: x1 y1 x2 y2, polygon x y pairs or *.yaml")
     opt = parser.parse_args()
     opt.imgsz *= 2 if len(opt.imgsz) == 1 else 1  # expand
     print_args(vars(opt))
@@ -0,0 +1,82 @@
+# Ultralytics 🚀 AGPL-3.0 License - https://ultralytics.com/license
+"""Tests for the threaded stage pipeline used by `detect.py --pipeline`."""
+
+import threading
+import time
+
+import pytest
+
+from utils.pipeline import Pipeline
+
+
+def test_items_pass_through_stages_in_order():
+    """Every item reaches the last stage once, in source order, after all stage functions."""
+    results = []
+    pipeline = Pipeline(("source", range(20)), [("double", lambda x: 2 * x), ("sink", results.append)])
+    pipeline.run()
+
+    assert results == [2 * x for x in range(20)]
+    assert [s.items for s in pipeline.stats] == [20, 20, 20]
+    assert "batches/s sustained" in pipeline.summary()
+
+
+def test_last_stage_runs_on_calling_thread():
+    """The final stage stays on the caller's thread so GUI calls such as cv2.imshow keep working."""
+    threads = set()
+    Pipeline(("source", range(3)), [("sink", lambda x: threads.add(threading.current_thread()))]).run()
+
+    assert threads == {threading.current_thread()}
+
+
+def test_slow_stage_applies_backpressure():
+    """A slow last stage bounds how far the source runs ahead to the queue depths plus the items in flight."""
+    produced, lead = [], []
+
+    def source():
+        for i in range(30):
+            produced.append(i)
+            yield i
+
+    def sink(i):
+        lead.append(len(produced) - i)
+        time.sleep(0.002)
+
+    depth = 2
+    Pipeline(("source", source()), [("stage", lambda x: x), ("sink", sink)], depth=depth).run()
+
+    # 2 queues of `depth`, plus one item held by the source, one by the middle stage and the one being consumed
+    assert max(lead) <= 2 * depth + 3
+
+
+def test_stages_overlap():
+    """Stages sleeping in parallel finish in about the time of the slowest stage, not the sum of all stages."""
+
+    def slow(x):
+        time.sleep(0.01)
+        return x
+
+    pipeline = Pipeline(("source", range(20)), [("a", slow), ("b", slow), ("c", slow)], depth=2)
+    pipeline.run()
+
+    assert pipeline.elapsed < 20 * 3 * 0.01 * 0.75
+
+
+def test_stage_error_stops_pipeline_and_is_raised():
+    """An exception in a worker stage stops the source and is re-raised from `run()`."""
+    consumed = []
+
+    def fail(x):
+        if x == 5:
+            raise ValueError("bad item")
+        return x
+
+    def endless():
+        i = 0
+        while True:
+            yield i
+            i += 1
+
+    pipeline = Pipeline(("source", endless()), [("fail", fail), ("sink", consumed.append)])
+    with pytest.raises(ValueError, match="bad item"):
+        pipeline.run()
+    assert consumed == [0, 1, 2, 3, 4]
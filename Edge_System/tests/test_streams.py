@@ -0,0 +1,180 @@
+# Ultralytics 🚀 AGPL-3.0 License - https://ultralytics.com/license
+"""CPU-only tests for LoadStreams frame sequencing and detect.py stream handling with fake cameras and a stub model."""
+
+import time
+
+import cv2
+import numpy as np
+import pytest
+import torch
+
+import detect
+from utils.augmentations import letterbox
+from utils.dataloaders import LoadStreams
+
+SHAPE = (48, 64, 3)  # h, w, c of fake camera frames
+
+
+class FakeCapture:
+    """`cv2.VideoCapture` stand-in for `fake-<stream>` sources delivering `frames` frames at `fps`.
+
+    Capture number k of stream s is a solid (s, k % 256, 0) BGR frame, so a frame's green value equals the sequence
+    number LoadStreams assigns to it.
+    """
+
+    frames = 40
+    fps = 100
+
+    def __init__(self, source):
+        """Opens fake stream `fake-<stream>`."""
+        self.stream = int(str(source).split("-")[1])
+        self.count = 0
+
+    def isOpened(self):
+        """Fake streams are always open."""
+        return True
+
+    def get(self, prop):
+        """Returns the stream's width, height, frame rate or frame count."""
+        return {
+            cv2.CAP_PROP_FRAME_WIDTH: SHAPE[1],
+            cv2.CAP_PROP_FRAME_HEIGHT: SHAPE[0],
+            cv2.CAP_PROP_FPS: self.fps,
+            cv2.CAP_PROP_FRAME_COUNT: self.frames,
+        }[prop]
+
+    def grab(self):
+        """Waits for the next frame of the stream."""
+        time.sleep(1 / self.fps)
+        self.count += 1
+        return True
+
+    def retrieve(self, image=None):
+        """Decodes the grabbed frame, into `image` when it has the frame's shape."""
+        if image is None or image.shape != SHAPE:
+            image = np.empty(SHAPE, dtype=np.uint8)
+        image[:] = (self.stream, self.count % 256, 0)
+        return True, image
+
+    def read(self):
+        """Grabs and decodes the next frame."""
+        self.grab()
+        return self.retrieve()
+
+    def open(self, source):
+        """Reopening a fake stream always succeeds."""
+        return True
+
+
+@pytest.fixture
+def fake_streams(monkeypatch, tmp_path):
+    """Returns a factory writing a `.streams` file of n fake cameras, with cv2 capture and GUI calls patched."""
+    monkeypatch.setattr(cv2, "VideoCapture", FakeCapture)
+    monkeypatch.setattr(cv2, "waitKey", lambda delay=0: -1)  # headless OpenCV builds have no GUI
+    monkeypatch.setattr(cv2, "destroyAllWindows", lambda: None)
+
+    def make(n):
+        source = tmp_path / "fake.streams"
+        source.write_text("\n".join(f"fake-{i}" for i in range(n)))
+        return str(source)
+
+    return make
+
+
+def test_batches_never_repeat_frames(fake_streams):
+    """Each batch has at least one new frame, and `fresh`/`frame_seqs` describe exactly which frames are new."""
+    dataset = LoadStreams(fake_streams(3), img_size=64, stride=32)
+    previous = [0] * 3
+    batches = 0
+    for _, _, im0s, _, _ in dataset:
+        batches += 1
+        seqs = dataset.frame_seqs
+        assert any(dataset.fresh)
+        for i, im0 in enumerate(im0s):
+            assert im0[0, 0, 0] == i
+            assert im0[0, 0, 1] == seqs[i] % 256  # the returned frame is the one the sequence number names
+            assert dataset.fresh[i] == (seqs[i] > previous[i])
+            assert seqs[i] >= previous[i]
+        previous = seqs
+    assert batches > 5
+    assert all(seq >= FakeCapture.frames * 0.8 for seq in previous)
+
+
+class StubBackend:
+    """DetectMultiBackend stand-in returning one 'car' box per image and recording the size of every model batch."""
+
+    stride, pt, triton, xml, fp16 = 32, True, False, False, False
+    names = {0: "person", 1: "bicycle", 2: "car"}
+    device = torch.device("cpu")
+
+    def __init__(self, *args, **kwargs):
+        """Records batch sizes in the class attribute `batches`."""
+        StubBackend.batches = []
+
+    def warmup(self, imgsz):
+        """No warmup needed."""
+
+    def __call__(self, im, augment=False, visualize=False):
+        """Returns raw predictions (x, y, w, h, obj, 3 class scores) for a box in the middle of each image."""
+        assert not torch.is_grad_enabled()  # also on pipeline worker threads
+        StubBackend.batches.append(im.shape[0])
+        box = torch.tensor([32.0, 32.0, 20.0, 20.0, 0.9, 0.0, 0.0, 0.9])
+        return box.repeat(im.shape[0], 1, 1)
+
+
+class Recorder:
+    """ChangeDetection stand-in recording the (stream, frame sequence, capture time) of every reported frame."""
+
+    def __init__(self, names):
+        """Starts an empty report list in the class attribute `reports`."""
+        Recorder.reports = []
+
+    def add(self, names, detected, save_dir, image, detections=None, timestamp=None):
+        """Records one reported frame and its detections."""
+        Recorder.reports.append((int(image[0, 0, 0]), int(image[0, 0, 1]), timestamp, len(detections)))
+
+    def close(self):
+        """Nothing to flush."""
+
+
+@pytest.mark.parametrize("pipeline", [False, True])
+def test_detect_reports_each_stream_frame_once(fake_streams, monkeypatch, tmp_path, pipeline):
+    """detect.run reports every stream frame at most once and runs the model only on new frames."""
+    monkeypatch.setattr(detect, "DetectMultiBackend", StubBackend)
+    monkeypatch.setattr(detect, "ChangeDetection", Recorder)
+
+    detect.run(
+        source=fake_streams(2), imgsz=(64, 64), device="cpu", nosave=True, project=tmp_path, pipeline=pipeline
+    )
+
+    reports = Recorder.reports
+    for stream in range(2):
+        frames = [(seq, stamp) for s, seq, stamp, _ in reports if s == stream]
+        assert len(frames) > 5
+        assert all(a[0] < b[0] and a[1] < b[1] for a, b in zip(frames, frames[1:]))
+    assert all(n == 1 for *_, n in reports)
+    assert sum(StubBackend.batches) == len(reports)  # repeated frames are left out of the model batch
+
+
+def test_held_batches_stay_intact_while_capture_continues(fake_streams):
+    """The last `hold` batches are views into leased ring slots and preallocated arrays that capture must not reuse."""
+    hold = 3
+    dataset = LoadStreams(fake_streams(2), img_size=64, stride=32, hold=hold)
+    held = []
+    for _, im, im0s, _, _ in dataset:
+        assert any(im is batch for batch in dataset.batches)  # letterboxed in place, no per-batch allocation
+        held = [*held, (im, im0s, dataset.frame_seqs, im.copy())][-hold:]
+        time.sleep(0.03)  # let capture run several frames ahead
+        for im, im0s, seqs, snapshot in held:
+            assert np.array_equal(im, snapshot)
+            assert [x[0, 0, 1] for x in im0s] == [seq % 256 for seq in seqs]
+
+
+def test_in_place_letterbox_matches_letterbox(fake_streams):
+    """The preallocated batch holds the same RGB CHW letterboxed pixels as `letterbox` on the returned frames."""
+    dataset = LoadStreams(fake_streams(2), img_size=64, stride=32)
+    _, im, im0s, _, _ = next(iter(dataset))
+
+    expected = np.stack([letterbox(x, 64, stride=32)[0] for x in im0s])[..., ::-1].transpose((0, 3, 1, 2))
+    assert im.shape == expected.shape
+    assert np.array_equal(im, expected)
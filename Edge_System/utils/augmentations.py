@@ -150,6 +150,39 @@ def letterbox(im, new_shape=(640, 640), color=(114, 114, 114), auto=True, scaleF
     return im, ratio, (dw, dh)
 
 
+def letterbox_into(im, out, new_shape=(640, 640), color=(114, 114, 114), scaleup=True, buffer=None):
+    """Letterboxes BGR HWC `im` into a preallocated RGB CHW uint8 array `out` in place, matching `letterbox()`.
+
+    The scale ratio is computed from `new_shape` as in `letterbox()` and the image is centered in `out`, so `out` shaped
+    like `letterbox(im, new_shape, auto=True)` yields identical pixels. `buffer` is a reusable resize destination;
+    the (possibly reallocated) buffer is returned for the next call.
+    """
+    shape = im.shape[:2]  # current shape [height, width]
+    if isinstance(new_shape, int):
+        new_shape = (new_shape, new_shape)
+
+    r = min(new_shape[0] / shape[0], new_shape[1] / shape[1])
+    if not scaleup:  # only scale down, do not scale up (for better val mAP)
+        r = min(r, 1.0)
+    new_unpad = round(shape[1] * r), round(shape[0] * r)
+    dw, dh = (out.shape[2] - new_unpad[0]) / 2, (out.shape[1] - new_unpad[1]) / 2
+    top, left = round(dh - 0.1), round(dw - 0.1)
+    bottom, right = top + new_unpad[1], left + new_unpad[0]
+
+    if shape[::-1] != new_unpad:  # resize
+        if buffer is None or buffer.shape[:2] != new_unpad[::-1]:
+            buffer = np.empty((new_unpad[1], new_unpad[0], 3), dtype=np.uint8)
+        im = cv2.resize(im, new_unpad, dst=buffer, interpolation=cv2.INTER_LINEAR)
+
+    for c in range(3):  # BGR to RGB, HWC to CHW, without temporaries
+        out[c, :top] = color[2 - c]
+        out[c, bottom:] = color[2 - c]
+        out[c, top:bottom, :left] = color[2 - c]
+        out[c, top:bottom, right:] = color[2 - c]
+        out[c, top:bottom, left:right] = im[..., 2 - c]
+    return buffer
+
+
 def random_perspective(
     im, targets=(), segments=(), degrees=10, translate=0.1, scale=0.1, shear=10, perspective=0.0, border=(0, 0)
 ):
@@ -10,10 +10,11 @@ import os
 import random
 import shutil
 import time
+from collections import deque
 from itertools import repeat
 from multiprocessing.pool import Pool, ThreadPool
 from pathlib import Path
-from threading import Thread
+from threading import Condition, Thread
 from urllib.parse import urlparse
 
 import numpy as np
@@ -33,6 +34,7 @@ from utils.augmentations import (
     classify_transforms,
     copy_paste,
     letterbox,
+    letterbox_into,
     mixup,
     random_perspective,
 )
@@ -55,6 +57,7 @@ from utils.general import (
     xywhn2xyxy,
     xyxy2xywhn,
 )
+from utils.roi import load_rois
 from utils.torch_utils import torch_distributed_zero_first
 
 # Parameters
@@ -318,8 +321,12 @@ class LoadScreenshots:
 class LoadImages:
     """YOLOv5 image/video dataloader, i.e. `python detect.py --source image.jpg/vid.mp4`."""
 
-    def __init__(self, path, img_size=640, stride=32, auto=True, transforms=None, vid_stride=1):
-        """Initializes YOLOv5 loader for images/videos, supporting glob patterns, directories, and lists of paths."""
+    def __init__(self, path, img_size=640, stride=32, auto=True, transforms=None, vid_stride=1, roi=None):
+        """Initializes YOLOv5 loader for images/videos, supporting glob patterns, directories, and lists of paths.
+
+        `roi` is an optional region of interest (see `utils.roi.load_rois`); images are cropped to it before
+        letterboxing while `im0` stays the full frame.
+        """
         if isinstance(path, str) and Path(path).suffix == ".txt":  # *.txt file with img/vid/dir on each line
             path = Path(path).read_text().rsplit()
         files = []
@@ -347,6 +354,7 @@ class LoadImages:
         self.auto = auto
         self.transforms = transforms  # optional
         self.vid_stride = vid_stride  # video frame-rate stride
+        self.rois = load_rois(roi, 1)  # one region of interest for all files
         if any(videos):
             self._new_video(videos[0])  # new video
         else:
@@ -392,12 +400,16 @@ class LoadImages:
             assert im0 is not None, f"Image Not Found {path}"
             s = f"image {self.count}/{self.nf} {path}: "
 
+        roi = self.rois[0]
+        crop = roi.crop(im0) if roi else im0
         if self.transforms:
-            im = self.transforms(im0)  # transforms
+            im = self.transforms(crop)  # transforms
         else:
-            im = letterbox(im0, self.img_size, stride=self.stride, auto=self.auto)[0]  # padded resize
+            im = letterbox(crop, self.img_size, stride=self.stride, auto=self.auto)[0]  # padded resize
             im = im.transpose((2, 0, 1))[::-1]  # HWC to CHW, BGR to RGB
             im = np.ascontiguousarray(im)  # contiguous
+            if roi:
+                roi.mask(im, crop.shape)
 
         return path, im, im0, self.cap, s
 
@@ -427,9 +439,28 @@ class LoadImages:
 class LoadStreams:
     """Loads and processes video streams for YOLOv5, supporting various sources including YouTube and IP cameras."""
 
-    def __init__(self, sources="file.streams", img_size=640, stride=32, auto=True, transforms=None, vid_stride=1):
+    def __init__(
+        self,
+        sources="file.streams",
+        img_size=640,
+        stride=32,
+        auto=True,
+        transforms=None,
+        vid_stride=1,
+        hold=1,
+        roi=None,
+    ):
         """Initializes a stream loader for processing video streams with YOLOv5, supporting various sources including
         YouTube.
+
+        Frames are captured into a preallocated ring of `hold + 2` buffers per stream and letterboxed into `hold`
+        preallocated batch arrays, so steady-state capture allocates no image memory. The arrays returned by
+        `__next__` are views into these buffers and stay valid until `hold` further batches have been requested; raise
+        `hold` when batches are consumed asynchronously (e.g. by a threaded pipeline) and copy frames that must live
+        longer.
+
+        `roi` gives optional per-stream regions of interest (see `utils.roi.load_rois`); frames are cropped to them
+        before letterboxing while the returned `im0` frames stay full size.
         """
         torch.backends.cudnn.benchmark = True  # faster for fixed-size inference
         self.mode = "stream"
@@ -439,7 +470,15 @@ class LoadStreams:
         sources = Path(sources).read_text().rsplit() if os.path.isfile(sources) else [sources]
         n = len(sources)
         self.sources = [clean_str(x) for x in sources]  # clean source names for later
+        self.rois = load_rois(roi, n)
         self.imgs, self.fps, self.frames, self.threads = [None] * n, [0] * n, [0] * n, [None] * n
+        # per-stream capture sequence numbers and epoch timestamps, guarded by self.cond
+        self.seqs, self.stamps, self.consumed = [0] * n, [0.0] * n, [0] * n
+        self.cond = Condition()
+        self.hold = max(1, hold)
+        # capture ring per stream: the published slot, one slot being written and up to `hold` leased slots
+        self.ring, self.slots = [None] * n, [0] * n
+        self.leases = deque(maxlen=self.hold)  # slot indices of the last `hold` returned batches
         for i, s in enumerate(sources):  # index, source
             # Start thread to read frames from video stream
             st = f"{i + 1}/{n}: {s}... "
@@ -462,19 +501,28 @@ class LoadStreams:
             self.fps[i] = max((fps if math.isfinite(fps) else 0) % 100, 0) or 30  # 30 FPS fallback
 
             _, self.imgs[i] = cap.read()  # guarantee first frame
+            self.ring[i] = [self.imgs[i]] + [np.empty_like(self.imgs[i]) for _ in range(self.hold + 1)]
+            self.seqs[i], self.stamps[i] = 1, time.time()
             self.threads[i] = Thread(target=self.update, args=([i, cap, s]), daemon=True)
             LOGGER.info(f"{st} Success ({self.frames[i]} frames {w}x{h} at {self.fps[i]:.2f} FPS)")
             self.threads[i].start()
         LOGGER.info("")  # newline
+        # wait up to two frame intervals of the slowest stream for every stream to deliver a new frame
+        self.max_wait = 2 * vid_stride / min(self.fps)
 
         # check for common shapes
-        s = np.stack([letterbox(x, img_size, stride=stride, auto=auto)[0].shape for x in self.imgs])
+        s = np.stack([letterbox(x, img_size, stride=stride, auto=auto)[0].shape for x in self._crops(self.imgs)])
         self.rect = np.unique(s, axis=0).shape[0] == 1  # rect inference if all shapes equal
         self.auto = auto and self.rect
         self.transforms = transforms  # optional
         if not self.rect:
             LOGGER.warning("WARNING ⚠️ Stream shapes differ. For optimal performance supply similarly-shaped streams.")
 
+        # preallocated letterboxed batches, filled in place while stream resolutions match the first frames
+        self.shapes = [x.shape for x in self.imgs]
+        self.batches = [np.empty((n, 3, *s[0][:2]), dtype=np.uint8) for _ in range(self.hold)]
+        self.buffers = [None] * n  # per-stream resize buffers
+
     def update(self, i, cap, stream):
         """Reads frames from stream `i`, updating imgs array; handles stream reopening on signal loss."""
         n, f = 0, self.frames[i]  # frame number, frame array
@@ -482,9 +530,18 @@ class LoadStreams:
             n += 1
             cap.grab()  # .read() = .grab() followed by .retrieve()
             if n % self.vid_stride == 0:
-                success, im = cap.retrieve()
+                with self.cond:  # a slot that is neither published nor leased to a returned batch
+                    busy = {self.slots[i], *(lease[i] for lease in self.leases)}
+                    j = next(k for k in range(len(self.ring[i])) if k not in busy)
+                success, im = cap.retrieve(self.ring[i][j])  # decode in place
                 if success:
-                    self.imgs[i] = im
+                    self.ring[i][j] = im  # reallocated by OpenCV only if the stream resolution changed
+                    with self.cond:
+                        self.slots[i] = j
+                        self.imgs[i] = im
+                        self.seqs[i] += 1
+                        self.stamps[i] = time.time()
+                        self.cond.notify_all()
                 else:
                     LOGGER.warning("WARNING ⚠️ Video stream unresponsive, please check your IP camera connection.")
                     self.imgs[i] = np.zeros_like(self.imgs[i])
@@ -499,22 +556,54 @@ class LoadStreams:
     def __next__(self):
         """Iterates over video frames or images, halting on thread stop or 'q' key press, raising `StopIteration` when
         done.
+
+        Blocks until every stream has captured a frame newer than the one returned last time, or until at least one
+        has and `max_wait` seconds have passed, so the same frame is never returned twice for all streams. The batch's
+        capture sequence numbers and timestamps are exposed as `frame_seqs` and `frame_times`, and `fresh[i]` is False
+        for a stream that repeats its previous frame.
         """
         self.count += 1
-        if not all(x.is_alive() for x in self.threads) or cv2.waitKey(1) == ord("q"):  # q to quit
-            cv2.destroyAllWindows()
-            raise StopIteration
-
-        im0 = self.imgs.copy()
+        deadline = None
+        while True:
+            if not all(x.is_alive() for x in self.threads) or cv2.waitKey(1) == ord("q"):  # q to quit
+                cv2.destroyAllWindows()
+                raise StopIteration
+
+            with self.cond:
+                fresh = [s > c for s, c in zip(self.seqs, self.consumed)]
+                if any(fresh) and deadline is None:
+                    deadline = time.time() + self.max_wait
+                if all(fresh) or (deadline is not None and time.time() >= deadline):
+                    im0 = self.imgs.copy()
+                    self.frame_seqs, self.frame_times = self.seqs.copy(), self.stamps.copy()
+                    self.leases.append(self.slots.copy())  # capture threads must not overwrite these frames
+                    break
+                self.cond.wait(timeout=0.05 if deadline is None else max(deadline - time.time(), 0))
+
+        self.fresh = fresh
+        self.consumed = self.frame_seqs
+        crops = self._crops(im0)
         if self.transforms:
-            im = np.stack([self.transforms(x) for x in im0])  # transforms
+            im = np.stack([self.transforms(x) for x in crops])  # transforms
         else:
-            im = np.stack([letterbox(x, self.img_size, stride=self.stride, auto=self.auto)[0] for x in im0])  # resize
-            im = im[..., ::-1].transpose((0, 3, 1, 2))  # BGR to RGB, BHWC to BCHW
-            im = np.ascontiguousarray(im)  # contiguous
+            if self.rect and all(x.shape == s for x, s in zip(im0, self.shapes)):
+                im = self.batches[self.count % self.hold]
+                for i, x in enumerate(crops):  # letterbox in place, BGR to RGB, HWC to CHW
+                    self.buffers[i] = letterbox_into(x, im[i], self.img_size, buffer=self.buffers[i])
+            else:
+                im = np.stack([letterbox(x, self.img_size, stride=self.stride, auto=self.auto)[0] for x in crops])
+                im = im[..., ::-1].transpose((0, 3, 1, 2))  # BGR to RGB, BHWC to BCHW
+                im = np.ascontiguousarray(im)  # contiguous
+            for x, roi, crop in zip(im, self.rois, crops):
+                if roi:
+                    roi.mask(x, crop.shape)  # blank letterboxed pixels outside polygon ROIs
 
         return self.sources, im, im0, None, ""
 
+    def _crops(self, frames):
+        """Returns views of `frames` cropped to each stream's region of interest."""
+        return [roi.crop(x) if roi else x for x, roi in zip(frames, self.rois)]
+
     def __len__(self):
         """Returns the number of sources in the dataset, supporting up to 32 streams at 30 FPS over 30 years."""
         return len(self.sources)  # 1E12 frames = 32 streams at 30 FPS for 30 years
@@ -946,8 +946,12 @@ def resample_segments(segments, n=1000):
     return segments
 
 
-def scale_boxes(img1_shape, boxes, img0_shape, ratio_pad=None):
-    """Rescales (xyxy) bounding boxes from img1_shape to img0_shape, optionally using provided `ratio_pad`."""
+def scale_boxes(img1_shape, boxes, img0_shape, ratio_pad=None, offset=None):
+    """Rescales (xyxy) bounding boxes from img1_shape to img0_shape, optionally using provided `ratio_pad`.
+
+    If img0 is a crop of a larger frame, `offset` (x, y) of the crop's top-left corner maps the boxes to full-frame
+    coordinates after clipping them to the crop.
+    """
     if ratio_pad is None:  # calculate from img0_shape
         gain = min(img1_shape[0] / img0_shape[0], img1_shape[1] / img0_shape[1])  # gain  = old / new
         pad = (img1_shape[1] - img0_shape[1] * gain) / 2, (img1_shape[0] - img0_shape[0] * gain) / 2  # wh padding
@@ -959,6 +963,9 @@ def scale_boxes(img1_shape, boxes, img0_shape, ratio_pad=None):
     boxes[..., [1, 3]] -= pad[1]  # y padding
     boxes[..., :4] /= gain
     clip_boxes(boxes, img0_shape)
+    if offset is not None:  # crop to full frame
+        boxes[..., [0, 2]] += offset[0]
+        boxes[..., [1, 3]] += offset[1]
     return boxes
 
 
@@ -0,0 +1,95 @@
+# Ultralytics 🚀 AGPL-3.0 License - https://ultralytics.com/license
+"""Motion gating to skip inference on frames where nothing moved since the last inference."""
+
+import time
+
+import cv2
+import numpy as np
+
+
+class MotionGate:
+    """
+    Decides per stream whether a frame needs a model forward pass, based on a cheap downscaled motion check.
+
+    Each frame is cropped to `region` (pixel xyxy, whole frame if None), downscaled to `scale` pixels wide, converted
+    to blurred grayscale and compared with a reference. With `method="diff"` the reference is the frame the last
+    inference ran on, so slow changes accumulate until they trigger; with `method="mog2"` a MOG2 background subtractor
+    is updated on every frame. A frame is considered moving when more than `threshold` of its pixels differ by more than
+    `pixel_threshold` grey levels (or are MOG2 foreground). Every stream is re-inferred at least every `refresh` seconds
+    so stale results cannot persist.
+
+    Example:
+        ```python
+        gate = MotionGate(threshold=0.005, refresh=5.0)
+        run = gate.check_batch(im0s)  # list of bools, False means reuse the previous result for that stream
+        ```
+    """
+
+    def __init__(self, threshold=0.005, pixel_threshold=15, refresh=5.0, scale=160, region=None, method="diff"):
+        """Initializes the gate; see the class docstring for the meaning of each threshold."""
+        assert method in {"diff", "mog2"}, f"invalid motion gate method '{method}', valid methods are diff and mog2"
+        self.threshold = threshold
+        self.pixel_threshold = pixel_threshold
+        self.refresh = refresh
+        self.scale = scale
+        self.region = region
+        self.method = method
+        self.references, self.subtractors, self.last_run = {}, {}, {}
+        self.frames = self.skipped = 0
+        self.gate_time = self.infer_time = 0.0
+        self.inferred = 0
+
+    def _small(self, im):
+        """Returns the blurred, downscaled grayscale version of the gated region of BGR image `im`."""
+        if self.region is not None:
+            x1, y1, x2, y2 = self.region
+            im = im[max(y1, 0) : y2, max(x1, 0) : x2]
+        h, w = im.shape[:2]
+        size = (self.scale, max(round(h * self.scale / w), 1)) if w > self.scale else (w, h)
+        small = cv2.cvtColor(cv2.resize(im, size, interpolation=cv2.INTER_LINEAR), cv2.COLOR_BGR2GRAY)
+        return cv2.GaussianBlur(small, (5, 5), 0)
+
+    def check(self, i, im, now=None):
+        """Returns True if stream `i` must be inferred for BGR frame `im`, False if its previous result still holds."""
+        t = time.perf_counter()
+        now = time.monotonic() if now is None else now
+        small = self._small(im)
+
+        if self.method == "mog2":
+            if i not in self.subtractors:
+                self.subtractors[i] = cv2.createBackgroundSubtractorMOG2(detectShadows=False)
+            moving = np.count_nonzero(self.subtractors[i].apply(small)) > self.threshold * small.size
+        else:
+            ref = self.references.get(i)
+            moving = ref is None or ref.shape != small.shape
+            if not moving:
+                diff = cv2.absdiff(small, ref)
+                moving = np.count_nonzero(diff > self.pixel_threshold) > self.threshold * small.size
+
+        run = moving or i not in self.last_run or now - self.last_run[i] >= self.refresh
+        if run:
+            self.references[i], self.last_run[i] = small, now
+        self.frames += 1
+        self.skipped += not run
+        self.gate_time += time.perf_counter() - t
+        return run
+
+    def check_batch(self, frames, now=None):
+        """Returns a list of `check()` results for a batch of BGR frames indexed by stream."""
+        return [self.check(i, im, now) for i, im in enumerate(frames)]
+
+    def record(self, n, seconds):
+        """Records that inference on `n` frames took `seconds`, used to estimate the time saved by skipping."""
+        self.inferred += n
+        self.infer_time += seconds
+
+    def summary(self):
+        """Returns a one-line report of the skipped fraction and the estimated inference time saved."""
+        per_frame = self.infer_time / self.inferred if self.inferred else 0.0
+        ungated = self.infer_time + self.skipped * per_frame  # estimated inference time without the gate
+        saved = ungated - self.infer_time - self.gate_time
+        return (
+            f"Motion gate: skipped {self.skipped}/{self.frames} frames ({self.skipped / max(self.frames, 1):.1%}), "
+            f"{self.gate_time / max(self.frames, 1) * 1e3:.2f}ms gating per frame, "
+            f"{saved:.1f}s of {ungated:.1f}s inference time saved"
+        )
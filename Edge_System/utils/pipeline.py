@@ -0,0 +1,147 @@
+# Ultralytics 🚀 AGPL-3.0 License - https://ultralytics.com/license
+"""Threaded stage pipeline with bounded queues for overlapping capture, inference and postprocessing."""
+
+import queue
+import threading
+import time
+
+_DONE = object()
+
+
+class StageStats:
+    """Tracks items processed and busy time for one pipeline stage."""
+
+    def __init__(self, name):
+        """Initializes counters for the stage called `name`."""
+        self.name = name
+        self.items = 0
+        self.busy = 0.0
+
+    def occupancy(self, elapsed):
+        """Returns the fraction of `elapsed` wall time the stage spent working."""
+        return self.busy / elapsed if elapsed else 0.0
+
+
+class Pipeline:
+    """
+    Runs a source iterable and a chain of stage functions on separate threads joined by bounded queues.
+
+    The first stage is an iterable producing items; every following stage is a callable mapping an item to the next
+    item. The last stage runs on the calling thread so GUI calls such as `cv2.imshow` stay on the main thread. Queues
+    hold at most `depth` items, so a slow stage applies backpressure instead of buffering frames without limit.
+
+    Example:
+        ```python
+        pipeline = Pipeline(("capture", dataset), [("infer", infer), ("postprocess", postprocess)], depth=2)
+        pipeline.run()
+        LOGGER.info(pipeline.summary())
+        ```
+    """
+
+    def __init__(self, source, stages, depth=2):
+        """Initializes the pipeline from a `(name, iterable)` source and a list of `(name, callable)` stages."""
+        self.source_name, self.source = source
+        self.stages = stages
+        self.depth = max(1, depth)
+        self.stats = [StageStats(self.source_name)] + [StageStats(name) for name, _ in stages]
+        self.elapsed = 0.0
+        self._stop = threading.Event()
+        self._errors = []
+
+    def _put(self, q, item):
+        """Puts `item` on `q`, giving up if the pipeline is stopping."""
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _get(self, q):
+        """Gets the next item from `q`, returning `_DONE` if the pipeline is stopping."""
+        while not self._stop.is_set():
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        return _DONE
+
+    def _produce(self, out_q):
+        """Source thread: pulls items from the source iterable."""
+        stats = self.stats[0]
+        iterator = iter(self.source)
+        try:
+            while not self._stop.is_set():
+                t = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    break
+                stats.busy += time.perf_counter() - t
+                stats.items += 1
+                if not self._put(out_q, item):
+                    break
+        except Exception as e:
+            self._errors.append(e)
+            self._stop.set()
+        finally:
+            self._put(out_q, _DONE)
+
+    def _work(self, index, func, in_q, out_q):
+        """Stage thread: applies `func` to each item from `in_q` and forwards the result."""
+        stats = self.stats[index]
+        try:
+            while True:
+                item = self._get(in_q)
+                if item is _DONE:
+                    break
+                t = time.perf_counter()
+                item = func(item)
+                stats.busy += time.perf_counter() - t
+                stats.items += 1
+                if not self._put(out_q, item):
+                    break
+        except Exception as e:
+            self._errors.append(e)
+            self._stop.set()
+        finally:
+            self._put(out_q, _DONE)
+
+    def run(self):
+        """Runs all stages until the source is exhausted; the last stage runs on the calling thread."""
+        queues = [queue.Queue(maxsize=self.depth) for _ in self.stages]
+        threads = [threading.Thread(target=self._produce, args=(queues[0],), name=self.source_name, daemon=True)]
+        for i, (name, func) in enumerate(self.stages[:-1], 1):
+            threads.append(
+                threading.Thread(target=self._work, args=(i, func, queues[i - 1], queues[i]), name=name, daemon=True)
+            )
+
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+
+        stats, func = self.stats[-1], self.stages[-1][1]
+        try:
+            while True:
+                item = self._get(queues[-1])
+                if item is _DONE:
+                    break
+                t = time.perf_counter()
+                func(item)
+                stats.busy += time.perf_counter() - t
+                stats.items += 1
+        finally:
+            self._stop.set()
+            self.elapsed = time.perf_counter() - start
+            for thread in threads:
+                thread.join(timeout=1)
+
+        if self._errors:
+            raise self._errors[0]
+
+    def summary(self):
+        """Returns a one-line report of per-stage occupancy and sustained throughput."""
+        occupancy = ", ".join(f"{s.name} {s.occupancy(self.elapsed):.0%}" for s in self.stats)
+        fps = self.stats[-1].items / self.elapsed if self.elapsed else 0.0
+        return f"Pipeline occupancy: {occupancy}; {fps:.1f} batches/s sustained"
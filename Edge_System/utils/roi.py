@@ -0,0 +1,83 @@
+# Ultralytics 🚀 AGPL-3.0 License - https://ultralytics.com/license
+"""Per-camera regions of interest that are cropped before letterboxing so inference only sees the relevant area."""
+
+from pathlib import Path
+
+import cv2
+import numpy as np
+import yaml
+
+
+class RegionOfInterest:
+    """
+    A rectangle or polygon in full-frame pixel coordinates.
+
+    Frames are cropped to the region's bounding box before letterboxing, and for polygons the letterboxed pixels outside
+    the polygon are filled with the letterbox padding colour. Detections on the crop are mapped back to full-frame
+    coordinates through the clipped bounding box returned by `roi.bounds(im0.shape)`, as detect.py does.
+
+    Example:
+        ```python
+        roi = RegionOfInterest([400, 300, 1500, 1080])  # x1, y1, x2, y2
+        im = letterbox(roi.crop(im0), 320)[0]
+        x1, y1, x2, y2 = roi.bounds(im0.shape)
+        boxes = scale_boxes(im.shape[:2], boxes, (y2 - y1, x2 - x1), offset=(x1, y1))
+        ```
+    """
+
+    def __init__(self, region):
+        """Initializes from 4 values (x1, y1, x2, y2) for a rectangle or 3+ (x, y) points for a polygon."""
+        points = np.asarray(region, dtype=np.float32).reshape(-1, 2)
+        assert len(points) >= 2, f"invalid ROI {region}, expected x1 y1 x2 y2 or at least 3 polygon points"
+        self.polygon = points.round().astype(np.int32) if len(points) > 2 else None
+        x1, y1 = points.min(0)
+        x2, y2 = points.max(0)
+        self.box = int(x1), int(y1), int(np.ceil(x2)), int(np.ceil(y2))
+        self._masks = {}  # (letterboxed shape, crop shape) -> outside-polygon mask
+
+    def bounds(self, shape):
+        """Returns the region's bounding box clipped to an image of `shape` (h, w, ...)."""
+        x1, y1, x2, y2 = self.box
+        h, w = shape[:2]
+        return min(max(x1, 0), w), min(max(y1, 0), h), min(max(x2, 0), w), min(max(y2, 0), h)
+
+    def crop(self, im):
+        """Returns a view of BGR image `im` cropped to the region's bounding box."""
+        x1, y1, x2, y2 = self.bounds(im.shape)
+        return im[y1:y2, x1:x2]
+
+    def mask(self, im, crop_shape, color=114):
+        """Fills pixels of letterboxed CHW image `im` that fall outside the polygon with `color`, in place."""
+        if self.polygon is None:
+            return im
+        key = (im.shape[1:], crop_shape[:2])
+        if key not in self._masks:
+            h, w = im.shape[1:]
+            gain = min(h / crop_shape[0], w / crop_shape[1])
+            pad = (w - crop_shape[1] * gain) / 2, (h - crop_shape[0] * gain) / 2
+            x1, y1 = self.box[:2]
+            points = (self.polygon - (max(x1, 0), max(y1, 0))) * gain + pad  # full frame to letterboxed crop
+            inside = np.zeros((h, w), dtype=np.uint8)
+            cv2.fillPoly(inside, [points.round().astype(np.int32)], 1)
+            self._masks[key] = inside == 0
+        im[:, self._masks[key]] = color
+        return im
+
+
+def load_rois(spec, n):
+    """
+    Returns a list of `n` RegionOfInterest (or None) from an ROI spec.
+
+    `spec` is None, a flat list of numbers applied to every stream (x1 y1 x2 y2, or x y pairs for a polygon), or the
+    path of a YAML file mapping 0-based stream indices to such lists, e.g. `{0: [400, 300, 1500, 1080]}`.
+    """
+    if not spec:
+        return [None] * n
+    if isinstance(spec, (list, tuple)) and len(spec) == 1:
+        spec = spec[0]
+    if isinstance(spec, (str, Path)) and Path(spec).suffix in {".yaml", ".yml"}:
+        with open(spec, errors="ignore") as f:
+            regions = yaml.safe_load(f) or {}
+        return [RegionOfInterest(regions[i]) if regions.get(i) else None for i in range(n)]
+    roi = RegionOfInterest([float(x) for x in spec])
+    return [roi] * n
@@ -1,5 +1,12 @@
 from django.contrib import admin
-from .models import Post
+from .models import Post, PostRendition
 
 # Register your models here.
 admin.site.register(Post)
+
+
+@admin.register(PostRendition)
+class PostRenditionAdmin(admin.ModelAdmin):
+    list_display = ("post", "name", "width", "height", "size", "render_ms")
+    list_filter = ("name",)
+    raw_id_fields = ("post",)
@@ -0,0 +1,33 @@
+# Generated by Django 6.1.2 on 2026-10-18 12:58
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0002_post_created_date_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostRendition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=20)),
+                ('source', models.CharField(help_text='생성에 사용한 원본 이미지 경로', max_length=255)),
+                ('image', models.ImageField(upload_to='blog_image/renditions/%Y/%m/%d/')),
+                ('width', models.PositiveIntegerField()),
+                ('height', models.PositiveIntegerField()),
+                ('size', models.PositiveIntegerField(help_text='파일 크기 (bytes)')),
+                ('render_ms', models.FloatField(help_text='생성 시간 (ms)')),
+                ('created_date', models.DateTimeField(default=django.utils.timezone.now)),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='renditions', to='blog.post')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('post', 'name'), name='blog_rendition_post_name_uniq')],
+            },
+        ),
+    ]
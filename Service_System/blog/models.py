@@ -2,7 +2,6 @@ from django.conf import settings
 from django.db import models
 from django.utils import timezone
 
-
 # Create your models here.
 
 
@@ -18,9 +17,60 @@ class Post(models.Model):
     published_date = models.DateTimeField(blank=True, null=True)
     image = models.ImageField(upload_to="blog_image/%Y/%m/%d/")
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_date"], name="blog_post_created_idx"),
+        ]
+
     def publish(self):
         self.published_date = timezone.now()
         self.save()
 
+    def get_rendition_url(self, name):
+        """
+        리사이즈 이미지 URL
+
+        아직 생성되지 않았으면 원본 이미지 URL을 대신 반환합니다. (원본 크기 그대로 전송됨)
+        빠진 렌디션의 생성 예약은 뷰/시리얼라이저에서 schedule_missing_renditions()로 합니다.
+        """
+        for rendition in self.renditions.all():
+            if rendition.name == name:
+                return rendition.image.url
+        return self.image.url if self.image else ""
+
+    @property
+    def thumbnail_url(self):
+        return self.get_rendition_url("thumbnail")
+
+    @property
+    def medium_url(self):
+        return self.get_rendition_url("medium")
+
     def __str__(self):
         return self.title
+
+
+class PostRendition(models.Model):
+    "게시글 이미지의 리사이즈 버전 (썸네일/중간 크기)"
+
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name="renditions")
+    name = models.CharField(max_length=20)
+    source = models.CharField(
+        max_length=255, help_text="생성에 사용한 원본 이미지 경로"
+    )
+    image = models.ImageField(upload_to="blog_image/renditions/%Y/%m/%d/")
+    width = models.PositiveIntegerField()
+    height = models.PositiveIntegerField()
+    size = models.PositiveIntegerField(help_text="파일 크기 (bytes)")
+    render_ms = models.FloatField(help_text="생성 시간 (ms)")
+    created_date = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["post", "name"], name="blog_rendition_post_name_uniq"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.post_id} {self.name} ({self.width}x{self.height})"
@@ -0,0 +1,15 @@
+from rest_framework.pagination import CursorPagination
+
+
+class PostCursorPagination(CursorPagination):
+    """
+    created_date 인덱스를 이용한 커서 페이지네이션
+
+    게시글 수와 관계없이 한 페이지 조회 비용이 일정합니다.
+    HTML 목록(post_list)과 Post API가 같은 커서 형식을 사용합니다.
+    """
+
+    ordering = "-created_date"
+    page_size = 10
+    page_size_query_param = "page_size"
+    max_page_size = 100
@@ -0,0 +1,194 @@
+"""
+게시글 이미지 리사이즈(렌디션) 생성
+
+이벤트 포스트는 카메라 원본 JPEG를 그대로 저장하므로, 목록/상세 화면용으로
+작은 JPEG를 미리 만들어 둡니다. 이미지가 저장되면 트랜잭션 커밋 후 blog 앱의
+렌디션 워커 스레드에서 생성되며 요청 경로에서는 실행되지 않습니다.
+
+워커에 넘기지 못했거나(프로세스 종료 중) 작업이 유실되어 렌디션이 없는 게시글은
+목록/상세 뷰와 Post API가 schedule_missing_renditions()로 다시 예약합니다. 렌디션이
+생기기 전까지 Post.get_rendition_url은 원본 URL을 대신 반환합니다.
+
+보관(bollard_retention)으로 원본이 아카이브 번들로 옮겨진 게시글은 번들에서 원본을
+읽어 렌디션을 만듭니다.
+
+각 렌디션의 크기와 생성 시간은 PostRendition에 기록됩니다.
+"""
+
+import io
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import IntegrityError, close_old_connections
+
+from blog.models import Post, PostRendition
+
+logger = logging.getLogger(__name__)
+
+# 이름 -> 긴 변 최대 픽셀
+DEFAULT_RENDITIONS = {"thumbnail": 320, "medium": 1024}
+DEFAULT_QUALITY = 80
+
+RENDITION_DIR = "blog_image/renditions/"
+# 렌디션 파일명은 생성마다 달라지므로 변경되지 않는 것으로 캐시
+RENDITION_CACHE_CONTROL = "public, max-age=31536000, immutable"
+DEFAULT_MEDIA_MAX_AGE = 86400
+# 같은 게시글의 렌디션 생성을 다시 시도하기까지의 최소 간격 (초)
+RETRY_INTERVAL = 300.0
+
+_executor = None
+_scheduled: Dict[int, float] = {}
+_lock = threading.Lock()
+
+
+def get_rendition_sizes() -> Dict[str, int]:
+    return getattr(settings, "BLOG_IMAGE_RENDITIONS", DEFAULT_RENDITIONS)
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="blog-rendition"
+            )
+        return _executor
+
+
+def schedule_renditions(post_id: int, force: bool = False) -> bool:
+    """
+    렌디션 생성을 워커에 예약. force가 아니고 최근에 이미 예약했으면 False
+
+    워커에 넘길 수 없으면(인터프리터 종료 중) 호출한 스레드에서 바로 생성합니다.
+    """
+    now = time.monotonic()
+    with _lock:
+        scheduled_at = _scheduled.get(post_id)
+        if (
+            not force
+            and scheduled_at is not None
+            and now - scheduled_at < RETRY_INTERVAL
+        ):
+            return False
+        _scheduled[post_id] = now
+
+    try:
+        _get_executor().submit(_render, post_id)
+    except RuntimeError:
+        _render(post_id)
+    return True
+
+
+def schedule_missing_renditions(posts: Iterable[Post]) -> int:
+    """
+    렌디션이 빠진 게시글의 생성을 예약 (게시글마다 RETRY_INTERVAL에 최대 한 번)
+
+    posts는 renditions를 prefetch해 두어야 추가 쿼리가 없습니다. 예약한 게시글 수 반환
+    """
+    names = get_rendition_sizes().keys()
+    scheduled = 0
+    for post in posts:
+        if not post.image:
+            continue
+        existing = {rendition.name for rendition in post.renditions.all()}
+        if not existing >= names and schedule_renditions(post.pk):
+            scheduled += 1
+    return scheduled
+
+
+def _render(post_id: int) -> None:
+    close_old_connections()
+    try:
+        generate_renditions(post_id)
+    except Exception as e:
+        logger.error(f"Failed to render post {post_id} images: {e}")
+        return
+    with _lock:
+        # 성공하면 이후 이미지 교체 시 바로 다시 예약할 수 있도록 기록 제거
+        _scheduled.pop(post_id, None)
+
+
+def _open_source(post: Post):
+    """게시글 원본 이미지 파일 (MEDIA_ROOT에 없으면 아카이브 번들에서 읽음)"""
+    try:
+        return post.image.open("rb")
+    except FileNotFoundError:
+        from bollard.utils.archive import read_archived
+
+        data = read_archived(post.image.name)
+        if data is None:
+            raise
+        return io.BytesIO(data)
+
+
+def generate_renditions(post_id: int) -> List[PostRendition]:
+    """게시글 이미지의 빠진 렌디션 생성 (원본이 바뀌었으면 이전 렌디션 교체)"""
+    from PIL import Image, ImageOps
+
+    post = Post.objects.filter(pk=post_id).first()
+    if post is None or not post.image:
+        return []
+
+    source = post.image.name
+    for stale in post.renditions.exclude(source=source):
+        stale.image.delete(save=False)
+        stale.delete()
+
+    existing = set(post.renditions.values_list("name", flat=True))
+    pending = {
+        name: max_edge
+        for name, max_edge in get_rendition_sizes().items()
+        if name not in existing
+    }
+    if not pending:
+        return []
+
+    quality = getattr(settings, "BLOG_IMAGE_RENDITION_QUALITY", DEFAULT_QUALITY)
+    largest = max(pending.values())
+    with _open_source(post) as f:
+        original = Image.open(f)
+        # JPEG는 필요한 크기 이상으로만 축소 디코딩 (DCT 스케일링)
+        original.draft("RGB", (largest, largest))
+        original = ImageOps.exif_transpose(original).convert("RGB")
+
+    stem = os.path.splitext(os.path.basename(source))[0]
+    created = []
+    for name, max_edge in sorted(pending.items(), key=lambda item: -item[1]):
+        start = time.perf_counter()
+        image = original.copy()
+        image.thumbnail((max_edge, max_edge), Image.Resampling.LANCZOS)
+        buffer = io.BytesIO()
+        image.save(buffer, format="JPEG", quality=quality, optimize=True)
+        render_ms = (time.perf_counter() - start) * 1e3
+
+        rendition = PostRendition(
+            post=post,
+            name=name,
+            source=source,
+            width=image.width,
+            height=image.height,
+            size=buffer.tell(),
+            render_ms=render_ms,
+        )
+        rendition.image.save(
+            f"{stem}_{name}.jpg", ContentFile(buffer.getvalue()), save=False
+        )
+        try:
+            rendition.save()
+        except IntegrityError:
+            # 다른 워커가 먼저 생성함
+            rendition.image.delete(save=False)
+            continue
+        created.append(rendition)
+
+    logger.info(
+        f"Rendered post {post.pk} images: "
+        + ", ".join(f"{r.name} {r.size}B {r.render_ms:.1f}ms" for r in created)
+    )
+    return created
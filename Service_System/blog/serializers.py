@@ -1,6 +1,7 @@
 from rest_framework import serializers
 
 from blog.models import Post
+from blog.renditions import schedule_missing_renditions
 from django.contrib.auth.models import User
 
 
@@ -12,6 +13,7 @@ class UserSerializer(serializers.ModelSerializer):
 
 class PostSerializer(serializers.ModelSerializer):
     author = UserSerializer(read_only=True)
+    renditions = serializers.SerializerMethodField()
 
     class Meta:
         model = Post
@@ -22,5 +24,23 @@ class PostSerializer(serializers.ModelSerializer):
             "created_date",
             "published_date",
             "image",
+            "renditions",
             "author",
         )
+
+    def get_renditions(self, post):
+        """
+        생성된 렌디션 이름별 이미지 URL (original은 원본)
+
+        빠진 렌디션은 목록/상세 화면과 같이 schedule_missing_renditions()로 생성을 예약합니다.
+        """
+        schedule_missing_renditions([post])
+        urls = {
+            rendition.name: rendition.image.url for rendition in post.renditions.all()
+        }
+        if post.image:
+            urls["original"] = post.image.url
+        request = self.context.get("request")
+        if request is not None:
+            urls = {name: request.build_absolute_uri(url) for name, url in urls.items()}
+        return urls
@@ -0,0 +1,22 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from blog.models import Post
+
+
+@receiver(post_save, sender=Post)
+def schedule_renditions(sender, instance, raw=False, **kwargs):
+    "이미지가 저장되면 커밋 후 렌디션 워커에서 생성"
+    if raw or not instance.image:
+        return
+    # 같은 인스턴스의 반복 저장(save 후 publish 등)은 한 번만 예약
+    if getattr(instance, "_rendition_source", None) == instance.image.name:
+        return
+    instance._rendition_source = instance.image.name
+
+    from blog.renditions import schedule_renditions
+
+    transaction.on_commit(partial(schedule_renditions, instance.pk, force=True))
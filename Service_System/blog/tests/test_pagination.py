@@ -0,0 +1,72 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from blog.models import Post
+
+
+class PostCursorPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        author = get_user_model().objects.create_user("author", password="pw")
+        now = timezone.now()
+        # 이미지가 없는 게시글 (렌디션 생성 예약 없음), 일부는 같은 시각에 생성
+        cls.posts = Post.objects.bulk_create(
+            Post(
+                author=author,
+                title=f"post {i}",
+                text="",
+                image="",
+                created_date=now - timedelta(minutes=i // 2),
+            )
+            for i in range(25)
+        )
+
+    def walk(self, url):
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            data = response.json()
+            ids.extend(post["id"] for post in data["results"])
+            url = data["next"]
+        return ids
+
+    def test_api_pages_cover_every_post_newest_first(self):
+        ids = self.walk(reverse("post-list"))
+
+        self.assertEqual(len(ids), 25)
+        self.assertEqual(len(set(ids)), 25)
+        dates = dict(Post.objects.values_list("pk", "created_date"))
+        self.assertEqual(
+            [dates[pk] for pk in ids], sorted(dates.values(), reverse=True)
+        )
+
+    def test_page_size_query_param(self):
+        response = self.client.get(reverse("post-list"), {"page_size": 7})
+        data = response.json()
+
+        self.assertEqual(len(data["results"]), 7)
+        self.assertIsNone(data["previous"])
+        self.assertEqual(len(self.walk(data["next"])), 18)
+
+    def test_previous_link_returns_to_first_page(self):
+        first = self.client.get(reverse("post-list")).json()
+        second = self.client.get(first["next"]).json()
+        back = self.client.get(second["previous"]).json()
+
+        self.assertEqual(
+            [post["id"] for post in back["results"]],
+            [post["id"] for post in first["results"]],
+        )
+
+    def test_new_post_does_not_shift_later_pages(self):
+        first = self.client.get(reverse("post-list")).json()
+        Post.objects.create(author=self.posts[0].author, title="new", text="", image="")
+        second = self.client.get(first["next"]).json()
+
+        seen = {post["id"] for post in first["results"]}
+        self.assertFalse(seen & {post["id"] for post in second["results"]})
@@ -0,0 +1,99 @@
+import io
+import shutil
+import tempfile
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.http import Http404
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+
+from blog import renditions
+from blog.models import Post
+from blog.renditions import RENDITION_CACHE_CONTROL, generate_renditions
+from blog.views import serve_media
+
+
+def jpeg(width, height):
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), (200, 40, 40)).save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+class RenditionTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        settings_patch = override_settings(MEDIA_ROOT=self.media_root)
+        settings_patch.enable()
+        self.addCleanup(settings_patch.disable)
+
+        self.author = get_user_model().objects.create_user("author", password="pw")
+        self.post = Post(author=self.author, title="event", text="")
+        self.post.image.save("event.jpg", ContentFile(jpeg(2000, 1000)), save=False)
+        self.post.save()
+
+        schedule = mock.patch.object(renditions, "schedule_renditions")
+        self.schedule = schedule.start()
+        self.addCleanup(schedule.stop)
+
+    def test_generate_renditions_scales_to_configured_sizes(self):
+        created = generate_renditions(self.post.pk)
+
+        sizes = {r.name: (r.width, r.height) for r in created}
+        self.assertEqual(sizes, {"thumbnail": (320, 160), "medium": (1024, 512)})
+        for rendition in created:
+            self.assertEqual(rendition.source, self.post.image.name)
+            with Image.open(rendition.image.path) as image:
+                self.assertEqual(image.size, sizes[rendition.name])
+        # 이미 있는 렌디션은 다시 만들지 않음
+        self.assertEqual(generate_renditions(self.post.pk), [])
+
+    def test_replaced_image_drops_stale_renditions(self):
+        generate_renditions(self.post.pk)
+        self.post.image.save("new.jpg", ContentFile(jpeg(400, 800)))
+
+        created = generate_renditions(self.post.pk)
+
+        self.assertEqual(
+            {r.name: (r.width, r.height) for r in created},
+            {"thumbnail": (160, 320), "medium": (400, 800)},
+        )
+        self.assertEqual(self.post.renditions.count(), 2)
+
+    def test_original_is_served_until_renditions_exist(self):
+        response = self.client.get(reverse("post_list"))
+
+        self.assertContains(response, f'src="{self.post.image.url}"')
+        self.schedule.assert_called_once_with(self.post.pk)
+
+        generate_renditions(self.post.pk)
+        self.schedule.reset_mock()
+        response = self.client.get(reverse("post_list"))
+
+        thumbnail = self.post.renditions.get(name="thumbnail")
+        self.assertContains(response, f'src="{thumbnail.image.url}"')
+        self.schedule.assert_not_called()
+
+    def test_api_schedules_missing_renditions(self):
+        data = self.client.get(reverse("post-detail", args=[self.post.pk])).json()
+
+        self.assertEqual(set(data["renditions"]), {"original"})
+        self.schedule.assert_called_once_with(self.post.pk)
+
+    def test_serve_media_cache_headers(self):
+        rendition, *_ = generate_renditions(self.post.pk)
+        request = RequestFactory().get("/media/")
+
+        response = serve_media(
+            request, rendition.image.name, document_root=self.media_root
+        )
+        self.assertEqual(response["Cache-Control"], RENDITION_CACHE_CONTROL)
+        response = serve_media(
+            request, self.post.image.name, document_root=self.media_root
+        )
+        self.assertEqual(response["Cache-Control"], "public, max-age=86400")
+        with self.assertRaises(Http404):
+            serve_media(request, "blog_image/missing.jpg", self.media_root)
@@ -1,9 +1,22 @@
+import mimetypes
+
 from rest_framework import viewsets
+from rest_framework.request import Request
 
+from django.http import Http404, HttpResponse
 from django.shortcuts import render, get_object_or_404, redirect
+from django.views.static import serve
+from django.conf import settings
 from django.contrib.auth import get_user_model
 
 from blog.models import Post
+from blog.pagination import PostCursorPagination
+from blog.renditions import (
+    DEFAULT_MEDIA_MAX_AGE,
+    RENDITION_CACHE_CONTROL,
+    RENDITION_DIR,
+    schedule_missing_renditions,
+)
 from blog.serializers import PostSerializer
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 from blog.permissions import IsOwnerOrReadOnly
@@ -11,9 +24,14 @@ from .forms import PostForm
 
 
 class BlogImage(viewsets.ModelViewSet):
-    queryset = Post.objects.order_by("-created_date")
+    queryset = (
+        Post.objects.select_related("author")
+        .prefetch_related("renditions")
+        .order_by("-created_date")
+    )
     serializer_class = PostSerializer
     permission_classes = [IsAuthenticatedOrReadOnly, IsOwnerOrReadOnly]
+    pagination_class = PostCursorPagination
 
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)
@@ -21,13 +39,26 @@ class BlogImage(viewsets.ModelViewSet):
 
 def post_list(request):
     "게시글 전체 목록"
-    posts = Post.objects.order_by("-created_date")
-    return render(request, "blog/post_list.html", {"posts": posts})
+    paginator = PostCursorPagination()
+    posts = paginator.paginate_queryset(
+        Post.objects.select_related("author").prefetch_related("renditions"),
+        Request(request),
+    )
+    schedule_missing_renditions(posts)
+    context = {
+        "posts": posts,
+        "next_url": paginator.get_next_link(),
+        "previous_url": paginator.get_previous_link(),
+    }
+    return render(request, "blog/post_list.html", context)
 
 
 def post_detail(request, pk):
     "게시글 상세보기"
-    post = get_object_or_404(Post, pk=pk)
+    post = get_object_or_404(
+        Post.objects.select_related("author").prefetch_related("renditions"), pk=pk
+    )
+    schedule_missing_renditions([post])
     return render(request, "blog/post_detail.html", {"post": post})
 
 
@@ -81,3 +112,23 @@ def post_edit(request, pk):
 def js_test(request):
     "API 테스트용"
     return render(request, "blog/js_test.html")
+
+
+def serve_media(request, path, document_root=None):
+    "업로드 이미지 제공 (렌디션은 장기 캐시, 보관된 파일은 번들에서 읽음)"
+    try:
+        response = serve(request, path, document_root=document_root)
+    except Http404:
+        from bollard.utils.archive import read_archived
+
+        data = read_archived(path)
+        if data is None:
+            raise
+        content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        response = HttpResponse(data, content_type=content_type)
+    if path.startswith(RENDITION_DIR):
+        response["Cache-Control"] = RENDITION_CACHE_CONTROL
+    else:
+        max_age = getattr(settings, "BLOG_MEDIA_MAX_AGE", DEFAULT_MEDIA_MAX_AGE)
+        response["Cache-Control"] = f"public, max-age={max_age}"
+    return response
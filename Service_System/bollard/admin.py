@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import BollardSetting, DetectionLog
+from .models import ArchivedMedia, BollardSetting, DetectionLog, OccupancyRollup
 
 
 @admin.register(BollardSetting)
@@ -20,6 +20,7 @@ class DetectionLogAdmin(admin.ModelAdmin):
     list_display = (
         "id",
         "timestamp",
+        "bollard_id",
         "detected",
         "occupy_ratio_actual",
         "action",
@@ -27,3 +28,28 @@ class DetectionLogAdmin(admin.ModelAdmin):
     )
     list_filter = ("detected", "action", "timestamp")
     ordering = ("-timestamp",)
+    # 수백만 건 테이블에서 전체 COUNT(*) 생략
+    show_full_result_count = False
+
+
+@admin.register(OccupancyRollup)
+class OccupancyRollupAdmin(admin.ModelAdmin):
+    list_display = (
+        "bucket_start",
+        "bollard_id",
+        "period",
+        "frames",
+        "close_count",
+        "open_count",
+        "ratio_max",
+    )
+    list_filter = ("period", "bollard_id")
+    ordering = ("-bucket_start",)
+    show_full_result_count = False
+
+
+@admin.register(ArchivedMedia)
+class ArchivedMediaAdmin(admin.ModelAdmin):
+    list_display = ("path", "bundle", "size", "archived_at")
+    search_fields = ("path",)
+    show_full_result_count = False
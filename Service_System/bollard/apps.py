@@ -11,6 +11,8 @@ class BollardConfig(AppConfig):
     _grpc_started = False
 
     def ready(self):
+        from . import signals  # noqa: F401
+
         # 이중호출 방지
         if os.environ.get("RUN_MAIN") != "true":
             return
@@ -18,6 +20,12 @@ class BollardConfig(AppConfig):
         if BollardConfig._grpc_started:
             return
 
+        from django.conf import settings
+
+        # 별도 컨트롤 플레인 프로세스(manage.py bollard_grpc)가 gRPC 서버를 실행
+        if getattr(settings, "BOLLARD_CONTROL_PLANE", False):
+            return
+
         from bollard.models import BollardSetting
 
         def start_grpc():
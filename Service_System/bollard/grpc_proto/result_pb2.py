@@ -1,8 +1,9 @@
 # -*- coding: utf-8 -*-
 # Generated protocol buffer code for bollard system
 
-from dataclasses import dataclass
-from typing import Optional
+import struct
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional, Tuple
 
 
 @dataclass
@@ -137,6 +138,123 @@ class OptVal:
         )
 
 
+def _iter_fields(data: bytes) -> Iterator[Tuple[int, int, object]]:
+    """(field 번호, wire type, 값) 순회. 길이 구분 필드는 memoryview 조각을 반환"""
+    view = memoryview(data)
+    idx = 0
+    while idx < len(data):
+        key, idx = Req._decode_varint(data, idx)
+        field_num = key >> 3
+        wire_type = key & 0x07
+        if wire_type == 0:
+            value, idx = Req._decode_varint(data, idx)
+        elif wire_type == 1:
+            value = view[idx : idx + 8]
+            idx += 8
+        elif wire_type == 2:
+            length, idx = Req._decode_varint(data, idx)
+            value = view[idx : idx + length]
+            idx += length
+        elif wire_type == 5:
+            value = view[idx : idx + 4]
+            idx += 4
+        else:
+            raise ValueError(f"Unsupported wire type {wire_type}")
+        yield field_num, wire_type, value
+
+
+@dataclass
+class Frame:
+    bollard_id: int = 0
+    seq: int = 0
+    image_width: int = 0
+    image_height: int = 0
+    timestamp: float = 0.0
+    # 검출마다 x1, y1, x2, y2, confidence, class_id (packed float)
+    boxes: List[float] = field(default_factory=list)
+    image: bytes = b""
+
+    def SerializeToString(self) -> bytes:
+        varint = Req._encode_varint
+        result = b""
+        if self.bollard_id:
+            result += b"\x08" + varint(self.bollard_id & 0xFFFFFFFFFFFFFFFF)
+        if self.seq:
+            result += b"\x10" + varint(self.seq)
+        if self.image_width:
+            result += b"\x18" + varint(self.image_width)
+        if self.image_height:
+            result += b"\x20" + varint(self.image_height)
+        if self.timestamp:
+            result += b"\x29" + struct.pack("<d", self.timestamp)
+        if self.boxes:
+            packed = struct.pack(f"<{len(self.boxes)}f", *self.boxes)
+            result += b"\x32" + varint(len(packed)) + packed
+        if self.image:
+            result += b"\x3a" + varint(len(self.image)) + self.image
+        return result
+
+    @classmethod
+    def FromString(cls, data: bytes) -> "Frame":
+        frame = cls()
+        for field_num, wire_type, value in _iter_fields(data):
+            if field_num == 1 and wire_type == 0:
+                # int32 음수는 64비트 2의 보수로 인코딩됨
+                frame.bollard_id = value - (1 << 64) if value >> 63 else value
+            elif field_num == 2 and wire_type == 0:
+                frame.seq = value
+            elif field_num == 3 and wire_type == 0:
+                frame.image_width = value
+            elif field_num == 4 and wire_type == 0:
+                frame.image_height = value
+            elif field_num == 5 and wire_type == 1:
+                frame.timestamp = struct.unpack("<d", value)[0]
+            elif field_num == 6 and wire_type == 2:
+                frame.boxes.extend(struct.unpack(f"<{len(value) // 4}f", value))
+            elif field_num == 6 and wire_type == 5:
+                frame.boxes.append(struct.unpack("<f", value)[0])
+            elif field_num == 7 and wire_type == 2:
+                frame.image = bytes(value)
+        return frame
+
+
+@dataclass
+class Decision:
+    seq: int = 0
+    should_close: bool = False
+    occupy_ratio: float = 0.0
+    action: str = ""
+
+    def SerializeToString(self) -> bytes:
+        result = b""
+        if self.seq:
+            result += b"\x08" + Req._encode_varint(self.seq)
+        if self.should_close:
+            result += b"\x10\x01"
+        if self.occupy_ratio:
+            result += b"\x1d" + struct.pack("<f", self.occupy_ratio)
+        if self.action:
+            action = self.action.encode("utf-8")
+            result += b"\x22" + Req._encode_varint(len(action)) + action
+        return result
+
+    @classmethod
+    def FromString(cls, data: bytes) -> "Decision":
+        decision = cls()
+        for field_num, wire_type, value in _iter_fields(data):
+            if field_num == 1 and wire_type == 0:
+                decision.seq = value
+            elif field_num == 2 and wire_type == 0:
+                decision.should_close = value != 0
+            elif field_num == 3 and wire_type == 5:
+                decision.occupy_ratio = struct.unpack("<f", value)[0]
+            elif field_num == 4 and wire_type == 2:
+                decision.action = bytes(value).decode("utf-8")
+        return decision
+
+
 _REQ = Req
 _RES = Res
 _OPTVAL = OptVal
+_FRAME = Frame
+_DECISION = Decision
@@ -18,6 +18,11 @@ class ResultStub(object):
             request_serializer=result__pb2.Req.SerializeToString,
             response_deserializer=result__pb2.OptVal.FromString,
         )
+        self.Ingest = channel.stream_stream(
+            "/result.Result/Ingest",
+            request_serializer=result__pb2.Frame.SerializeToString,
+            response_deserializer=result__pb2.Decision.FromString,
+        )
 
 
 class ResultServicer(object):
@@ -31,6 +36,11 @@ class ResultServicer(object):
         context.set_details("Method not implemented!")
         raise NotImplementedError("Method not implemented!")
 
+    def Ingest(self, request_iterator, context):
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
 
 def add_ResultServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -44,6 +54,11 @@ def add_ResultServicer_to_server(servicer, server):
             request_deserializer=result__pb2.Req.FromString,
             response_serializer=result__pb2.OptVal.SerializeToString,
         ),
+        "Ingest": grpc.stream_stream_rpc_method_handler(
+            servicer.Ingest,
+            request_deserializer=result__pb2.Frame.FromString,
+            response_serializer=result__pb2.Decision.SerializeToString,
+        ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
         "result.Result", rpc_method_handlers
@@ -0,0 +1,414 @@
+"""
+볼라드 시스템 마이크로벤치마크
+
+운영 DB를 건드리지 않도록 임시 SQLite 파일 DB에서 실행합니다.
+
+사용 예:
+    python manage.py bollard_benchmark analyzer --iterations 5000
+    python manage.py bollard_benchmark settings
+    python manage.py bollard_benchmark payload
+    python manage.py bollard_benchmark cameras --cameras 50
+    python manage.py bollard_benchmark logs --rows 1000000 10000000
+    python manage.py bollard_benchmark posts --rows 100000 1000000
+"""
+
+import base64
+import io
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, connections, transaction
+from django.utils import timezone
+
+from bollard.models import BollardSetting, BollardState, DetectionLog
+from bollard.serializers import DetectionResultSerializer
+from bollard.utils.analyzer import BollardAnalyzer, get_analyzer
+from bollard.utils.frame_codec import decode_frame, encode_frame
+from bollard.utils.setting_cache import get_setting_cache
+
+IMAGE_WIDTH = 1280
+IMAGE_HEIGHT = 720
+
+
+@contextmanager
+def benchmark_database():
+    """임시 테스트 DB를 만들고 종료 시 삭제"""
+    tmp_path = None
+    if connection.vendor == "sqlite":
+        # 인메모리 DB는 커밋 비용이 없어 결과가 왜곡되므로 파일 DB 사용
+        fd, tmp_path = tempfile.mkstemp(suffix=".sqlite3")
+        os.close(fd)
+        connection.settings_dict.setdefault("TEST", {})["NAME"] = tmp_path
+
+    old_name = connection.creation.create_test_db(
+        verbosity=0, autoclobber=True, serialize=False
+    )
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def make_frames(count):
+    """오토바이 진입(10프레임) / 빈 화면(40프레임)이 반복되는 검출 시퀀스"""
+    motorcycle = {
+        "class_id": 3,
+        "confidence": 0.9,
+        "bbox": [100.0, 100.0, 900.0, 650.0],
+    }
+    return [[motorcycle] if i % 50 < 10 else [] for i in range(count)]
+
+
+def make_jpeg(width=IMAGE_WIDTH, height=IMAGE_HEIGHT, quality=70):
+    """카메라 프레임 크기의 노이즈 JPEG (엣지와 같은 품질 70)"""
+    from PIL import Image
+
+    image = Image.effect_noise((width, height), 64).convert("RGB")
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=quality)
+    return buffer.getvalue()
+
+
+def make_detections(count):
+    detections = []
+    for _ in range(count):
+        x1 = random.uniform(0, IMAGE_WIDTH / 2)
+        y1 = random.uniform(0, IMAGE_HEIGHT / 2)
+        detections.append(
+            {
+                "class_id": random.choice([0, 2, 3]),
+                "class_name": "motorcycle",
+                "confidence": random.random(),
+                "bbox": [x1, y1, x1 + 200.0, y1 + 150.0],
+            }
+        )
+    return detections
+
+
+def legacy_analyze(detections, image_width, image_height):
+    """상태 엔진 도입 전 analyze()의 DB 접근 패턴 (매 호출 조회 2회 + 저장 1회)"""
+    setting = BollardSetting.load_active_setting()
+    state = BollardState.get_instance()
+
+    max_ratio = 0.0
+    img_area = image_width * image_height
+    for det in detections:
+        if det.get("class_id") == setting.target_object:
+            x1, y1, x2, y2 = det["bbox"][:4]
+            max_ratio = max(max_ratio, (x2 - x1) * (y2 - y1) / img_area * 100)
+
+    if max_ratio > setting.occupy_ratio:
+        state.counter = setting.maintain_frame
+    else:
+        state.counter = max(0, state.counter - 1)
+    state.is_closed = state.counter > 0
+    state.save()
+
+
+LOG_INTERVAL = timedelta(seconds=1)
+
+
+def seed_detection_logs(start, stop, now, chunk=50_000):
+    """감지 로그 start..stop번째 행을 1초 간격(과거 방향)으로 삽입 (ORM 생략)"""
+    table = DetectionLog._meta.db_table
+    sql = (
+        f"INSERT INTO {table} "
+        "(timestamp, bollard_id, detected, occupy_ratio_actual, action, image) "
+        "VALUES (%s, %s, %s, %s, %s, '')"
+    )
+    actions = ["none"] * 18 + ["open", "close"]
+    rng = random.Random(start)
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        for offset in range(start, stop, chunk):
+            batch = []
+            for i in range(offset, min(offset + chunk, stop)):
+                action = rng.choice(actions)
+                batch.append(
+                    (
+                        now - LOG_INTERVAL * i,
+                        i % 50,
+                        action != "none",
+                        rng.random() * 100,
+                        action,
+                    )
+                )
+            cursor.executemany(sql, batch)
+
+
+def seed_posts(start, stop, now, author_id, chunk=50_000):
+    """게시글 start..stop번째 행을 1초 간격(과거 방향)으로 삽입 (ORM 생략)"""
+    from blog.models import Post
+
+    table = Post._meta.db_table
+    sql = (
+        f"INSERT INTO {table} "
+        "(author_id, title, text, created_date, published_date, image) "
+        "VALUES (%s, %s, %s, %s, %s, %s)"
+    )
+    with transaction.atomic(), connection.cursor() as cursor:
+        for offset in range(start, stop, chunk):
+            batch = []
+            for i in range(offset, min(offset + chunk, stop)):
+                created = now - LOG_INTERVAL * i
+                batch.append(
+                    (
+                        author_id,
+                        f"볼라드 이벤트 {i}",
+                        "오토바이 감지",
+                        created,
+                        created,
+                        f"blog_image/bench/{i}.jpg",
+                    )
+                )
+            cursor.executemany(sql, batch)
+
+
+class Command(BaseCommand):
+    help = "볼라드 처리 경로의 초당 처리량을 측정합니다"
+
+    targets = ("analyzer", "settings", "payload", "cameras", "logs", "posts")
+
+    def add_arguments(self, parser):
+        parser.add_argument("target", choices=self.targets, help="측정 대상")
+        parser.add_argument(
+            "--iterations", type=int, default=2000, help="측정 반복 횟수"
+        )
+        parser.add_argument(
+            "--cameras", type=int, default=50, help="동시에 전송하는 카메라 수"
+        )
+        parser.add_argument(
+            "--rows",
+            type=int,
+            nargs="+",
+            default=[1_000_000, 10_000_000],
+            help="감지 로그/게시글 테이블 크기 (오름차순으로 추가 시딩)",
+        )
+
+    def handle(self, *args, **options):
+        with benchmark_database():
+            getattr(self, f"bench_{options['target']}")(options)
+
+    def report(self, label, count, elapsed):
+        rate = count / elapsed if elapsed > 0 else float("inf")
+        self.stdout.write(
+            f"{label:<32} {count:>8} calls  {elapsed * 1e3:>10.1f} ms  {rate:>12.1f} calls/s"
+        )
+
+    def bench_analyzer(self, options):
+        frames = make_frames(options["iterations"])
+        BollardSetting.get_active_setting()
+
+        start = time.perf_counter()
+        for detections in frames:
+            legacy_analyze(detections, IMAGE_WIDTH, IMAGE_HEIGHT)
+        self.report("before (DB per call)", len(frames), time.perf_counter() - start)
+
+        BollardState.objects.all().delete()
+        analyzer = BollardAnalyzer()
+        start = time.perf_counter()
+        for detections in frames:
+            analyzer.analyze(detections, IMAGE_WIDTH, IMAGE_HEIGHT)
+        analyzer.flush()
+        self.report("after (in-memory state)", len(frames), time.perf_counter() - start)
+
+    def bench_settings(self, options):
+        iterations = options["iterations"]
+        setting_cache = get_setting_cache()
+        setting_cache.invalidate()
+        BollardSetting.load_active_setting()
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            BollardSetting.load_active_setting()
+        self.report("uncached (DB query)", iterations, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            BollardSetting.get_active_setting()
+        self.report("cached", iterations, time.perf_counter() - start)
+        self.stdout.write(f"cache stats: {setting_cache.stats()}")
+
+    def bench_payload(self, options):
+        iterations = options["iterations"]
+        jpeg = make_jpeg()
+        detections = make_detections(8)
+
+        json_body = json.dumps(
+            {
+                "detections": detections,
+                "image_width": IMAGE_WIDTH,
+                "image_height": IMAGE_HEIGHT,
+                "timestamp": "2025-12-13T09:23:00+09:00",
+                "image": base64.b64encode(jpeg).decode("utf-8"),
+            }
+        ).encode("utf-8")
+        binary_body = encode_frame(
+            detections, IMAGE_WIDTH, IMAGE_HEIGHT, jpeg, time.time()
+        )
+
+        self.stdout.write(f"jpeg bytes:   {len(jpeg):>10}")
+        self.stdout.write(f"json bytes:   {len(json_body):>10}")
+        self.stdout.write(f"binary bytes: {len(binary_body):>10}")
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            serializer = DetectionResultSerializer(data=json.loads(json_body))
+            serializer.is_valid(raise_exception=True)
+            base64.b64decode(serializer.validated_data["image"])
+        self.report("json parse + validate", iterations, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            decode_frame(binary_body)
+        self.report("binary decode", iterations, time.perf_counter() - start)
+
+    def bench_cameras(self, options):
+        cameras = options["cameras"]
+        frames = make_frames(options["iterations"])
+        BollardSetting.get_active_setting()
+        barrier = threading.Barrier(cameras + 1)
+        errors = []
+
+        def camera(bollard_id):
+            analyzer = get_analyzer(bollard_id)
+            try:
+                barrier.wait()
+                for detections in frames:
+                    analyzer.analyze(detections, IMAGE_WIDTH, IMAGE_HEIGHT)
+                analyzer.flush()
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connections.close_all()
+
+        threads = [
+            threading.Thread(target=camera, args=(bollard_id,))
+            for bollard_id in range(1, cameras + 1)
+        ]
+        for thread in threads:
+            thread.start()
+        barrier.wait()
+        start = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        self.report(f"{cameras} cameras", cameras * len(frames), elapsed)
+
+        # 모든 카메라가 같은 시퀀스를 받았으므로 최종 상태가 같아야 함
+        reference = BollardAnalyzer(bollard_id=0, checkpoint_interval=3600)
+        for detections in frames:
+            reference.analyze(detections, IMAGE_WIDTH, IMAGE_HEIGHT)
+        expected = (reference.get_state().is_closed, reference.get_state().counter)
+        states = BollardState.objects.filter(bollard_id__gte=1)
+        mismatched = [
+            s.bollard_id for s in states if (s.is_closed, s.counter) != expected
+        ]
+        self.stdout.write(
+            f"state rows: {states.count()}  mismatched: {len(mismatched)}"
+            f"  errors: {len(errors)}"
+        )
+
+    def bench_logs(self, options):
+        """인덱스 유무에 따른 감지 로그 목록/필터 쿼리 시간"""
+        indexes = DetectionLog._meta.indexes
+        now = timezone.now()
+        seeded = 0
+
+        for rows in sorted(options["rows"]):
+            with connection.schema_editor() as editor:
+                for index in indexes:
+                    editor.remove_index(DetectionLog, index)
+
+            start = time.perf_counter()
+            seed_detection_logs(seeded, rows, now)
+            seeded = rows
+            self.stdout.write(
+                f"\n{rows:,} rows (seeded in {time.perf_counter() - start:.1f} s)"
+            )
+
+            self.bench_log_queries("no index", rows, now, options)
+            start = time.perf_counter()
+            with connection.schema_editor() as editor:
+                for index in indexes:
+                    editor.add_index(DetectionLog, index)
+            self.stdout.write(f"indexes built in {time.perf_counter() - start:.1f} s")
+            self.bench_log_queries("indexed", rows, now, options)
+
+    def bench_log_queries(self, label, rows, now, options):
+        repeat = max(1, min(options["iterations"], 20))
+        middle = now - LOG_INTERVAL * (rows // 2)
+        logs = DetectionLog.objects.all()
+        page = 100
+        queries = {
+            "latest page": logs.order_by("-timestamp")[: page + 1],
+            "deep page (offset)": logs.order_by("-timestamp")[
+                rows // 2 : rows // 2 + page
+            ],
+            "deep page (cursor)": logs.filter(timestamp__lt=middle).order_by(
+                "-timestamp"
+            )[: page + 1],
+            "action + 1 day range": logs.filter(
+                action="close",
+                timestamp__gte=middle - timedelta(days=1),
+                timestamp__lt=middle,
+            ).order_by("-timestamp")[: page + 1],
+        }
+
+        for name, queryset in queries.items():
+            start = time.perf_counter()
+            for _ in range(repeat):
+                list(queryset.all())
+            elapsed = (time.perf_counter() - start) / repeat
+            self.stdout.write(f"  {label:<10} {name:<24} {elapsed * 1e3:>10.2f} ms")
+
+    def bench_posts(self, options):
+        """게시글 목록(HTML/API) 첫 페이지와 커서로 이어 본 페이지의 응답 시간"""
+        from django.contrib.auth.models import User
+        from django.test import Client
+
+        author = User.objects.create_user("bench")
+        client = Client()
+        repeat = max(1, min(options["iterations"], 20))
+        now = timezone.now()
+        seeded = 0
+
+        for rows in sorted(options["rows"]):
+            start = time.perf_counter()
+            seed_posts(seeded, rows, now, author.pk)
+            seeded = rows
+            self.stdout.write(
+                f"\n{rows:,} posts (seeded in {time.perf_counter() - start:.1f} s)"
+            )
+
+            next_url = client.get("/api_root/Post/").json()["next"]
+            for name, url in (
+                ("api first page", "/api_root/Post/"),
+                ("api next page", next_url),
+                ("html first page", "/"),
+            ):
+                # request_started에서 쿼리 로그가 초기화되므로 실행 래퍼로 집계
+                queries = []
+                with connection.execute_wrapper(
+                    lambda execute, sql, *args: queries.append(sql)
+                    or execute(sql, *args)
+                ):
+                    client.get(url)
+                start = time.perf_counter()
+                for _ in range(repeat):
+                    response = client.get(url)
+                elapsed = (time.perf_counter() - start) / repeat
+                self.stdout.write(
+                    f"  {name:<20} {elapsed * 1e3:>10.2f} ms"
+                    f"  {len(queries)} queries  status {response.status_code}"
+                )
@@ -0,0 +1,65 @@
+"""
+gRPC 컨트롤 플레인 실행 (라즈베리파이 Result 서비스 전용 프로세스)
+
+라즈베리파이와의 Require/Option 스트림을 웹 서버와 분리된 하나의 프로세스에서
+유지합니다. Django 워커(gunicorn 등)는 BOLLARD_CONTROL_PLANE=True일 때 gRPC 서버를
+직접 띄우지 않고, 판단 결과와 수동 제어 명령을 Unix 도메인 소켓
+(BOLLARD_CONTROL_SOCKET)으로 이 프로세스에 보냅니다.
+
+사용 예:
+    python manage.py bollard_grpc
+    python manage.py bollard_grpc --port 50051 --socket /run/bollard/control.sock
+"""
+
+import signal
+import threading
+
+from django.core.management.base import BaseCommand, CommandError
+
+from bollard.models import BollardSetting
+from bollard.utils.control_channel import (
+    get_socket_path,
+    start_control_server,
+    stop_control_server,
+)
+from bollard.utils.grpc_client import start_grpc_server, stop_grpc_server
+
+
+class Command(BaseCommand):
+    help = "라즈베리파이 gRPC 서버와 웹 워커 명령 채널을 실행합니다"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--port",
+            type=int,
+            help="gRPC 포트 (기본: 활성 BollardSetting.grpc_server_port)",
+        )
+        parser.add_argument(
+            "--socket",
+            help="명령 채널 소켓 경로 (기본: BOLLARD_CONTROL_SOCKET)",
+        )
+
+    def handle(self, *args, **options):
+        port = options["port"]
+        if port is None:
+            setting = BollardSetting.objects.first()
+            port = setting.grpc_server_port if setting else 50051
+        path = options["socket"] or get_socket_path()
+
+        # 채널을 먼저 열어 두어야 이 프로세스의 명령이 자기 자신에게 전달되지 않음
+        start_control_server(path)
+        if not start_grpc_server(port=port):
+            stop_control_server()
+            raise CommandError(f"Failed to start gRPC server on port {port}")
+
+        self.stdout.write(f"gRPC server on port {port}, command channel at {path}")
+
+        stopped = threading.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *_: stopped.set())
+        while not stopped.wait(1.0):
+            pass
+
+        self.stdout.write("Stopping gRPC control plane")
+        stop_grpc_server()
+        stop_control_server()
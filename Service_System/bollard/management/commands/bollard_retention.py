@@ -0,0 +1,169 @@
+"""
+감지 로그/집계/미디어 보존 정책 적용
+
+BOLLARD_RETENTION의 계층별 보존 기간(일)이 지난 데이터를 정리합니다. None이면
+해당 계층은 무기한 보존합니다.
+
+    detection_log   원본 DetectionLog 행. 삭제 전 해당 구간의 시간/일 집계를 보장
+    rollup_minute   분 단위 OccupancyRollup
+    rollup_hour     시간 단위 OccupancyRollup
+    rollup_day      일 단위 OccupancyRollup
+    media           detection_logs/, blog_image/ 날짜 디렉터리 -> 압축 번들
+
+삭제는 --chunk-size 행씩 별도 트랜잭션으로 수행하여 쓰기 잠금 시간을 제한합니다.
+cron 등으로 하루 한 번 실행하는 것을 전제로 합니다.
+
+사용 예:
+    python manage.py bollard_retention
+    python manage.py bollard_retention --dry-run
+    python manage.py bollard_retention --tier media --tier detection_log
+"""
+
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from bollard.models import DetectionLog, OccupancyRollup
+from bollard.utils.archive import (
+    ARCHIVE_PREFIXES,
+    archive_day_dir,
+    iter_day_dirs,
+)
+from bollard.utils.rollup import backfill_rollups_from_logs
+
+DEFAULT_RETENTION = {
+    "detection_log": 90,
+    "rollup_minute": 14,
+    "rollup_hour": 400,
+    "rollup_day": None,
+    "media": 30,
+}
+
+
+def get_retention_policy():
+    return {**DEFAULT_RETENTION, **getattr(settings, "BOLLARD_RETENTION", {})}
+
+
+def local_midnight_before(days):
+    """현재로부터 days일 전 현지 자정 (버킷 경계에 맞춘 기준 시각)"""
+    cutoff = timezone.localtime() - timedelta(days=days)
+    return cutoff.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def delete_in_chunks(queryset, chunk_size, pause=0.0):
+    """pk를 chunk_size개씩 골라 트랜잭션마다 삭제. 삭제한 행 수 반환"""
+    model = queryset.model
+    deleted = 0
+    while True:
+        pks = list(queryset.values_list("pk", flat=True)[:chunk_size])
+        if not pks:
+            return deleted
+        with transaction.atomic():
+            count, _ = model.objects.filter(pk__in=pks).delete()
+        deleted += count
+        if pause:
+            time.sleep(pause)
+
+
+class Command(BaseCommand):
+    help = "보존 기간이 지난 감지 로그/집계를 삭제하고 오래된 미디어를 압축 보관합니다"
+
+    tiers = tuple(DEFAULT_RETENTION)
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tier",
+            action="append",
+            choices=self.tiers,
+            help="처리할 계층 (반복 지정 가능, 생략 시 전체)",
+        )
+        parser.add_argument(
+            "--chunk-size", type=int, default=1000, help="트랜잭션당 삭제 행 수"
+        )
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0.0,
+            help="청크 사이 대기 시간 (초, 다른 쓰기 작업에 양보)",
+        )
+        parser.add_argument(
+            "--dry-run", action="store_true", help="대상 건수만 출력하고 변경하지 않음"
+        )
+
+    def handle(self, *args, **options):
+        policy = get_retention_policy()
+        for tier in options["tier"] or self.tiers:
+            days = policy.get(tier)
+            if days is None:
+                self.stdout.write(f"{tier:<14} kept forever")
+                continue
+            start = time.perf_counter()
+            summary = getattr(self, f"apply_{tier}")(
+                local_midnight_before(days), options
+            )
+            self.stdout.write(
+                f"{tier:<14} older than {days} days: {summary}"
+                f"  ({time.perf_counter() - start:.1f} s)"
+            )
+
+    def apply_detection_log(self, cutoff, options):
+        logs = DetectionLog.objects.filter(timestamp__lt=cutoff).order_by("timestamp")
+        if options["dry_run"]:
+            return f"{logs.count()} rows would be deleted"
+
+        oldest = logs.first()
+        if oldest is None:
+            return "0 rows deleted"
+
+        # 현지 일 단위로 집계를 먼저 보장한 뒤 그 날의 로그를 삭제
+        backfilled = deleted = 0
+        day = timezone.localtime(oldest.timestamp).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        while day < cutoff:
+            next_day = min(day + timedelta(days=1), cutoff)
+            backfilled += backfill_rollups_from_logs(day, next_day)
+            deleted += delete_in_chunks(
+                logs.filter(timestamp__gte=day, timestamp__lt=next_day),
+                options["chunk_size"],
+                options["pause"],
+            )
+            day = next_day
+        return f"{deleted} rows deleted, {backfilled} rollup buckets backfilled"
+
+    def _apply_rollup(self, period, cutoff, options):
+        rollups = OccupancyRollup.objects.filter(
+            period=period, bucket_start__lt=cutoff
+        ).order_by("bucket_start")
+        if options["dry_run"]:
+            return f"{rollups.count()} rows would be deleted"
+        deleted = delete_in_chunks(rollups, options["chunk_size"], options["pause"])
+        return f"{deleted} rows deleted"
+
+    def apply_rollup_minute(self, cutoff, options):
+        return self._apply_rollup("minute", cutoff, options)
+
+    def apply_rollup_hour(self, cutoff, options):
+        return self._apply_rollup("hour", cutoff, options)
+
+    def apply_rollup_day(self, cutoff, options):
+        return self._apply_rollup("day", cutoff, options)
+
+    def apply_media(self, cutoff, options):
+        files = size = bundles = 0
+        for prefix in ARCHIVE_PREFIXES:
+            for day, directory in iter_day_dirs(prefix, cutoff.date()):
+                if options["dry_run"]:
+                    bundles += 1
+                    continue
+                count, nbytes = archive_day_dir(prefix, day, directory)
+                files += count
+                size += nbytes
+                bundles += bool(count)
+        if options["dry_run"]:
+            return f"{bundles} day directories would be archived"
+        return f"{files} files ({size / 1e6:.1f} MB) archived into {bundles} bundles"
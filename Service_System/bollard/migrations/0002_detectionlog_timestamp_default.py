@@ -0,0 +1,24 @@
+# Generated by Django 6.1.2 on 2026-10-18 12:34
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bollard', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='bollardsetting',
+            name='raspberry_pi_port',
+            field=models.IntegerField(default=50051, help_text='라즈베리파이 gRPC 포트'),
+        ),
+        migrations.AlterField(
+            model_name='detectionlog',
+            name='timestamp',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
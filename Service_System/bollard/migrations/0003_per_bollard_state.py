@@ -0,0 +1,23 @@
+# Generated by Django 6.1.2 on 2026-10-18 12:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bollard', '0002_detectionlog_timestamp_default'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bollardstate',
+            name='bollard_id',
+            field=models.PositiveIntegerField(default=0, help_text='볼라드(카메라) ID', unique=True),
+        ),
+        migrations.AddField(
+            model_name='detectionlog',
+            name='bollard_id',
+            field=models.PositiveIntegerField(default=0, help_text='볼라드(카메라) ID'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 6.1.2 on 2026-10-18 12:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0001_initial'),
+        ('bollard', '0003_per_bollard_state'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='detectionlog',
+            index=models.Index(fields=['timestamp'], name='bollard_log_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='detectionlog',
+            index=models.Index(fields=['action', 'timestamp'], name='bollard_log_action_ts_idx'),
+        ),
+    ]
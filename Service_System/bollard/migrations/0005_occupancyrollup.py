@@ -0,0 +1,33 @@
+# Generated by Django 6.1.2 on 2026-10-18 13:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bollard', '0004_detectionlog_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OccupancyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bollard_id', models.PositiveIntegerField(default=0, help_text='볼라드(카메라) ID')),
+                ('period', models.CharField(choices=[('minute', '분'), ('hour', '시간'), ('day', '일')], max_length=10)),
+                ('bucket_start', models.DateTimeField(help_text='버킷 시작 시각')),
+                ('frames', models.PositiveIntegerField(default=0, help_text='분석한 프레임 수')),
+                ('close_count', models.PositiveIntegerField(default=0, help_text='닫힘 횟수')),
+                ('open_count', models.PositiveIntegerField(default=0, help_text='열림 횟수')),
+                ('ratio_sum', models.FloatField(default=0.0, help_text='점유율 합계 (평균 계산용)')),
+                ('ratio_max', models.FloatField(default=0.0, help_text='최대 점유율 (%)')),
+            ],
+            options={
+                'verbose_name': '점유율 집계',
+                'verbose_name_plural': '점유율 집계',
+                'ordering': ['bucket_start'],
+                'constraints': [models.UniqueConstraint(fields=('bollard_id', 'period', 'bucket_start'), name='bollard_rollup_bucket_uniq')],
+            },
+        ),
+    ]
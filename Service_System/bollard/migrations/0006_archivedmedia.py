@@ -0,0 +1,28 @@
+# Generated by Django 6.1.2 on 2026-10-18 13:07
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bollard', '0005_occupancyrollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedMedia',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('path', models.CharField(help_text='원래 미디어 경로 (MEDIA_ROOT 기준)', max_length=255, unique=True)),
+                ('bundle', models.CharField(help_text='번들 경로 (BOLLARD_ARCHIVE_ROOT 기준)', max_length=255)),
+                ('size', models.PositiveIntegerField(help_text='원본 파일 크기 (bytes)')),
+                ('archived_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': '보관 미디어',
+                'verbose_name_plural': '보관 미디어',
+            },
+        ),
+    ]
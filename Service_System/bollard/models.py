@@ -1,5 +1,6 @@
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 from blog.models import Post
 
 
@@ -38,6 +39,19 @@ class BollardSetting(models.Model):
 
     @classmethod
     def get_active_setting(cls):
+        from bollard.utils.setting_cache import get_setting_cache
+
+        return get_setting_cache().get()
+
+    @classmethod
+    def get_active_setting_for_update(cls):
+        # 캐시 인스턴스는 모든 분석기가 공유하므로 수정할 때는 DB에서 새로 읽은 사본 사용
+        setting = cls.get_active_setting()
+        return cls.objects.filter(pk=setting.pk).first() or cls.load_active_setting()
+
+    @classmethod
+    def load_active_setting(cls):
+        # 캐시를 거치지 않고 DB에서 직접 조회
         setting = cls.objects.filter(is_active=True).first()
         if not setting:
             setting = cls.objects.create(is_active=True)
@@ -45,6 +59,9 @@ class BollardSetting(models.Model):
 
 
 class BollardState(models.Model):
+    bollard_id = models.PositiveIntegerField(
+        default=0, unique=True, help_text="볼라드(카메라) ID"
+    )
     is_closed = models.BooleanField(default=False, help_text="볼라드 닫힘 상태")
     counter = models.IntegerField(default=0, help_text="유지 프레임 카운터")
     last_updated = models.DateTimeField(auto_now=True)
@@ -57,11 +74,11 @@ class BollardState(models.Model):
     def __str__(self):
         status = "닫힘" if self.is_closed else "열림"
         mode = "수동" if self.manual_mode else "자동"
-        return f"볼라드 상태: {status} ({mode} 모드)"
+        return f"볼라드 #{self.bollard_id} 상태: {status} ({mode} 모드)"
 
     @classmethod
-    def get_instance(cls):
-        instance, _ = cls.objects.get_or_create(pk=1)
+    def get_instance(cls, bollard_id=0):
+        instance, _ = cls.objects.get_or_create(bollard_id=bollard_id)
         return instance
 
 
@@ -72,7 +89,8 @@ class DetectionLog(models.Model):
         ("none", "변화 없음"),
     ]
 
-    timestamp = models.DateTimeField(auto_now_add=True)
+    timestamp = models.DateTimeField(default=timezone.now)
+    bollard_id = models.PositiveIntegerField(default=0, help_text="볼라드(카메라) ID")
     detected = models.BooleanField(help_text="객체 감지 여부")
     occupy_ratio_actual = models.FloatField(
         null=True, blank=True, help_text="실제 측정된 점유율 (%)"
@@ -99,6 +117,77 @@ class DetectionLog(models.Model):
         verbose_name = "감지 로그"
         verbose_name_plural = "감지 로그"
         ordering = ["-timestamp"]
+        indexes = [
+            # 최신순 목록/기간 조회 및 커서 페이지네이션
+            models.Index(fields=["timestamp"], name="bollard_log_ts_idx"),
+            # 동작별 + 기간 조회
+            models.Index(
+                fields=["action", "timestamp"], name="bollard_log_action_ts_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"[{self.timestamp}] #{self.bollard_id} 감지: {self.detected}, 동작: {self.action}"
+
+
+class OccupancyRollup(models.Model):
+    """
+    볼라드별 분/시간/일 단위 점유율 집계
+
+    분석기가 프레임마다 메모리 버킷에 누적한 값을 주기적으로 더해 기록합니다.
+    기간 조회는 원본 로그 크기와 관계없이 버킷 수만큼의 행만 읽습니다.
+    """
+
+    PERIOD_CHOICES = [
+        ("minute", "분"),
+        ("hour", "시간"),
+        ("day", "일"),
+    ]
+
+    bollard_id = models.PositiveIntegerField(default=0, help_text="볼라드(카메라) ID")
+    period = models.CharField(max_length=10, choices=PERIOD_CHOICES)
+    bucket_start = models.DateTimeField(help_text="버킷 시작 시각")
+    frames = models.PositiveIntegerField(default=0, help_text="분석한 프레임 수")
+    close_count = models.PositiveIntegerField(default=0, help_text="닫힘 횟수")
+    open_count = models.PositiveIntegerField(default=0, help_text="열림 횟수")
+    ratio_sum = models.FloatField(default=0.0, help_text="점유율 합계 (평균 계산용)")
+    ratio_max = models.FloatField(default=0.0, help_text="최대 점유율 (%)")
+
+    class Meta:
+        verbose_name = "점유율 집계"
+        verbose_name_plural = "점유율 집계"
+        ordering = ["bucket_start"]
+        constraints = [
+            # 볼라드/단위별 기간 조회에도 사용
+            models.UniqueConstraint(
+                fields=["bollard_id", "period", "bucket_start"],
+                name="bollard_rollup_bucket_uniq",
+            ),
+        ]
+
+    def __str__(self):
+        return f"#{self.bollard_id} {self.period} {self.bucket_start}: 닫힘 {self.close_count}"
+
+    @property
+    def ratio_mean(self):
+        return self.ratio_sum / self.frames if self.frames else 0.0
+
+
+class ArchivedMedia(models.Model):
+    """보존 기간이 지나 압축 번들로 옮긴 미디어 파일 색인 (원래 경로 -> 번들)"""
+
+    path = models.CharField(
+        max_length=255, unique=True, help_text="원래 미디어 경로 (MEDIA_ROOT 기준)"
+    )
+    bundle = models.CharField(
+        max_length=255, help_text="번들 경로 (BOLLARD_ARCHIVE_ROOT 기준)"
+    )
+    size = models.PositiveIntegerField(help_text="원본 파일 크기 (bytes)")
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = "보관 미디어"
+        verbose_name_plural = "보관 미디어"
 
     def __str__(self):
-        return f"[{self.timestamp}] 감지: {self.detected}, 동작: {self.action}"
+        return f"{self.path} -> {self.bundle}"
@@ -0,0 +1,15 @@
+from rest_framework.pagination import CursorPagination
+
+
+class DetectionLogCursorPagination(CursorPagination):
+    """
+    timestamp 인덱스를 이용한 키셋(커서) 페이지네이션
+
+    OFFSET 없이 마지막으로 본 timestamp 이후부터 조회하므로 페이지 깊이와 관계없이
+    조회 비용이 일정합니다.
+    """
+
+    ordering = "-timestamp"
+    page_size = 100
+    page_size_query_param = "page_size"
+    max_page_size = 1000
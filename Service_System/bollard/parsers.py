@@ -0,0 +1,16 @@
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+from .utils.frame_codec import MEDIA_TYPE, FrameDecodeError, decode_frame
+
+
+class BollardFrameParser(BaseParser):
+    """application/x-bollard-frame 바이너리 검출 결과 파서"""
+
+    media_type = MEDIA_TYPE
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return decode_frame(stream.read())
+        except FrameDecodeError as e:
+            raise ParseError(f"Binary frame parse error - {e}")
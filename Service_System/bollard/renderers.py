@@ -0,0 +1,18 @@
+from rest_framework.renderers import BaseRenderer
+
+from .utils.live_events import format_event
+
+
+class EventStreamRenderer(BaseRenderer):
+    """text/event-stream 렌더러 (인증 실패 등 일반 응답은 error 이벤트로 변환)"""
+
+    media_type = "text/event-stream"
+    format = "event-stream"
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if isinstance(data, bytes):
+            return data
+        return format_event("error", data)
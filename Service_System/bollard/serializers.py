@@ -4,8 +4,9 @@
 YOLO 서버와의 통신 및 REST API를 위한 시리얼라이저입니다.
 """
 
+from django.conf import settings
 from rest_framework import serializers
-from .models import BollardSetting, BollardState, DetectionLog
+from .models import BollardSetting, BollardState, DetectionLog, OccupancyRollup
 
 
 class DetectionResultSerializer(serializers.Serializer):
@@ -27,6 +28,13 @@ class DetectionResultSerializer(serializers.Serializer):
         help_text="검출된 객체 리스트",
     )
 
+    bollard_id = serializers.IntegerField(
+        required=False,
+        default=0,
+        min_value=0,
+        help_text="검출 결과를 전달할 볼라드 ID (생략 시 기본 볼라드 0)",
+    )
+
     # 타임스탬프
     timestamp = serializers.DateTimeField(
         required=False, help_text="검출 시점 타임스탬프 (생략 시 서버 시간 사용)"
@@ -47,6 +55,22 @@ class DetectionResultSerializer(serializers.Serializer):
         return value
 
 
+class DetectionBatchSerializer(serializers.Serializer):
+    frames = DetectionResultSerializer(
+        many=True,
+        allow_empty=False,
+        help_text="촬영 순서대로 정렬된 프레임별 검출 결과",
+    )
+
+    def validate_frames(self, value):
+        max_frames = getattr(settings, "BOLLARD_DETECTION_BATCH_MAX", 500)
+        if len(value) > max_frames:
+            raise serializers.ValidationError(
+                f"A batch may contain at most {max_frames} frames"
+            )
+        return value
+
+
 class BollardSettingSerializer(serializers.ModelSerializer):
     class Meta:
         model = BollardSetting
@@ -72,6 +96,7 @@ class BollardStateSerializer(serializers.ModelSerializer):
     class Meta:
         model = BollardState
         fields = [
+            "bollard_id",
             "is_closed",
             "counter",
             "last_updated",
@@ -79,7 +104,7 @@ class BollardStateSerializer(serializers.ModelSerializer):
             "status_display",
             "mode_display",
         ]
-        read_only_fields = ["counter", "last_updated"]
+        read_only_fields = ["bollard_id", "counter", "last_updated"]
 
     def get_status_display(self, obj):
         return "닫힘" if obj.is_closed else "열림"
@@ -96,6 +121,7 @@ class DetectionLogSerializer(serializers.ModelSerializer):
         fields = [
             "id",
             "timestamp",
+            "bollard_id",
             "detected",
             "occupy_ratio_actual",
             "action",
@@ -106,6 +132,21 @@ class DetectionLogSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "timestamp", "action_display"]
 
 
+class OccupancyRollupSerializer(serializers.ModelSerializer):
+    ratio_mean = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = OccupancyRollup
+        fields = [
+            "bucket_start",
+            "frames",
+            "close_count",
+            "open_count",
+            "ratio_max",
+            "ratio_mean",
+        ]
+
+
 class BollardControlSerializer(serializers.Serializer):
     ACTION_CHOICES = [
         ("open", "볼라드 열기"),
@@ -116,6 +157,13 @@ class BollardControlSerializer(serializers.Serializer):
     ]
 
     action = serializers.ChoiceField(choices=ACTION_CHOICES, help_text="수행할 동작")
+    bollard_id = serializers.IntegerField(
+        required=False,
+        allow_null=True,
+        default=None,
+        min_value=0,
+        help_text="제어할 볼라드 ID (생략 시 전체 볼라드)",
+    )
 
     def validate_action(self, value):
         if value not in ["open", "close", "auto"]:
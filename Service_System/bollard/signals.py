@@ -0,0 +1,15 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import BollardSetting
+from .utils.setting_cache import get_setting_cache
+
+
+@receiver(post_save, sender=BollardSetting)
+@receiver(post_delete, sender=BollardSetting)
+def invalidate_active_setting(sender, **kwargs):
+    cache = get_setting_cache()
+    cache.invalidate()
+    # 커밋 전에 다른 요청이 이전 값을 다시 캐시했을 수 있으므로 커밋 후 한 번 더
+    transaction.on_commit(cache.invalidate)
@@ -0,0 +1,38 @@
+from django.core.cache import cache
+from django.test import TestCase
+
+from bollard.models import BollardSetting, BollardState
+from bollard.utils.analyzer import BollardAnalyzer
+
+# 640x480 이미지의 절반을 차지하는 자동차
+CAR = {"class_id": 2, "confidence": 0.9, "bbox": [0, 0, 640, 240]}
+
+
+class AnalyzerStateTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        BollardSetting.objects.create(
+            is_active=True, occupy_ratio=30, maintain_frame=3, target_object=2
+        )
+
+    def test_get_state_returns_snapshot(self):
+        analyzer = BollardAnalyzer(1)
+        snapshot = analyzer.get_state()
+        analyzer.force_close()
+
+        self.assertFalse(snapshot.is_closed)
+        self.assertTrue(analyzer.get_state().is_closed)
+        self.assertTrue(BollardState.objects.get(bollard_id=1).is_closed)
+
+    def test_counter_changes_wait_for_checkpoint(self):
+        analyzer = BollardAnalyzer(1, checkpoint_interval=60)
+        self.assertEqual(analyzer.analyze([CAR], 640, 480)[2], "close")
+        self.assertEqual(analyzer.analyze([], 640, 480)[2], "none")
+
+        # 닫힘 전환은 바로 저장되고, 이후 카운터 감소는 메모리에만 반영
+        saved = BollardState.objects.get(bollard_id=1)
+        self.assertEqual((saved.is_closed, saved.counter), (True, 3))
+        self.assertEqual(analyzer.get_state().counter, 2)
+
+        analyzer.flush()
+        self.assertEqual(BollardState.objects.get(bollard_id=1).counter, 2)
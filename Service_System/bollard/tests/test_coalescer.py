@@ -0,0 +1,67 @@
+import threading
+import time
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from bollard.utils.coalescer import FrameCoalescer
+
+
+class FrameCoalescerTests(TestCase):
+    def setUp(self):
+        self.coalescer = FrameCoalescer()
+        self.results = {}
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def submit(self, name, timestamp=None, block=False):
+        def process():
+            if block:
+                self.started.set()
+                self.release.wait(5)
+            return name
+
+        thread = threading.Thread(
+            target=lambda: self.results.__setitem__(
+                name, self.coalescer.submit(0, process, timestamp)
+            )
+        )
+        thread.start()
+        return thread
+
+    def wait_for_depth(self, depth):
+        deadline = time.monotonic() + 5
+        while self.coalescer.stats()["cameras"][0]["depth"] != depth:
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.001)
+
+    def test_newer_frame_supersedes_waiting_frame(self):
+        threads = [self.submit("first", block=True)]
+        self.started.wait(5)
+        threads.append(self.submit("second"))
+        self.wait_for_depth(2)
+        threads.append(self.submit("third"))
+        threads[1].join(5)
+
+        # 처리 중인 프레임이 끝나기 전에 대기 중이던 프레임은 바로 superseded
+        self.assertIsNone(self.results["second"])
+        self.release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(
+            self.results, {"first": "first", "second": None, "third": "third"}
+        )
+        stats = self.coalescer.stats()
+        self.assertEqual(
+            (stats["processed"], stats["shed"], stats["queue_depth"]), (2, 1, 0)
+        )
+
+    def test_frame_older_than_processed_frame_is_dropped(self):
+        now = timezone.now()
+        self.assertEqual(self.coalescer.submit(0, lambda: "new", now), "new")
+        self.assertIsNone(
+            self.coalescer.submit(0, lambda: "old", now - timedelta(seconds=1))
+        )
+        self.assertEqual(self.coalescer.stats()["cameras"][0]["stale"], 1)
@@ -0,0 +1,71 @@
+import os
+import shutil
+import socket
+import tempfile
+import time
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from bollard.grpc_proto.result_pb2 import OptVal
+from bollard.utils.control_channel import ControlChannelClient, ControlChannelServer
+from bollard.utils.grpc_client import BollardCommandQueue
+
+
+class ControlChannelTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, "control.sock")
+        self.servicer = mock.Mock()
+        patch = mock.patch(
+            "bollard.utils.grpc_client.get_grpc_servicer", return_value=self.servicer
+        )
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def start_server(self):
+        server = ControlChannelServer(self.path)
+        server.start()
+        self.addCleanup(server.stop)
+        return server
+
+    def wait_for(self, server, received):
+        deadline = time.monotonic() + 5
+        while server.received < received:
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.005)
+
+    def test_commands_reach_control_plane(self):
+        server = self.start_server()
+        client = ControlChannelClient(self.path)
+        command_queue = BollardCommandQueue()
+
+        self.assertTrue(client.send_result(801, True))
+        self.assertTrue(client.send_option(OptVal(manual_flag=True, manual=True), 802))
+        self.assertTrue(client.send_system_active(True))
+        self.wait_for(server, 3)
+
+        self.assertTrue(command_queue.get_current_result(801))
+        option = command_queue.get_option(timeout=1, device_id=802)
+        self.assertEqual((option.manual_flag, option.manual), (True, True))
+        self.servicer.set_system_active.assert_called_once_with(True)
+        self.assertEqual(server.stats()["received"], 3)
+
+    def test_malformed_datagram_is_ignored(self):
+        server = self.start_server()
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self.addCleanup(sock.close)
+        sock.sendto(b"junk", self.path)
+
+        ControlChannelClient(self.path).send_result(803, True)
+        self.wait_for(server, 1)
+        self.assertEqual(server.received, 1)
+
+    def test_send_without_control_plane_is_dropped(self):
+        client = ControlChannelClient(self.path)
+
+        with self.assertLogs("bollard.utils.control_channel", "WARNING"):
+            self.assertFalse(client.send_result(804, True))
+        self.assertFalse(client.send_system_active(False))
+        self.assertEqual(client.stats()["dropped"], 2)
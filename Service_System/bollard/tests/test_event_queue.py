@@ -0,0 +1,69 @@
+import threading
+
+from django.test import SimpleTestCase, override_settings
+
+from bollard.utils.event_queue import BollardEventQueue, submit_event
+
+
+class BollardEventQueueTests(SimpleTestCase):
+    def make_queue(self, **kwargs):
+        events = BollardEventQueue(**kwargs)
+        self.addCleanup(events.shutdown, timeout=5)
+        return events
+
+    def test_jobs_run_on_worker_thread(self):
+        events = self.make_queue()
+        done = threading.Event()
+        threads = []
+
+        def job(value):
+            threads.append((threading.current_thread().name, value))
+            done.set()
+
+        self.assertTrue(events.submit(job, 1))
+        self.assertTrue(done.wait(5))
+        self.assertEqual(threads, [("bollard-event-0", 1)])
+
+    def test_full_queue_drops_jobs_and_failures_are_counted(self):
+        events = self.make_queue(maxsize=1, submit_timeout=0.01)
+        started, release = threading.Event(), threading.Event()
+
+        def blocking():
+            started.set()
+            release.wait(5)
+
+        def failing():
+            raise RuntimeError("boom")
+
+        events.submit(blocking)
+        self.assertTrue(started.wait(5))
+        self.assertTrue(events.submit(failing))  # 큐에 대기
+        self.assertFalse(events.submit(failing))  # 큐가 가득 참
+        release.set()
+        events.shutdown(timeout=5)
+
+        stats = events.stats()
+        self.assertEqual(
+            (stats["submitted"], stats["processed"], stats["failed"], stats["dropped"]),
+            (2, 1, 1, 1),
+        )
+
+    def test_shutdown_runs_pending_jobs_then_rejects_new_ones(self):
+        events = self.make_queue()
+        results = []
+        for i in range(20):
+            events.submit(results.append, i)
+        events.shutdown(timeout=5)
+
+        self.assertEqual(results, list(range(20)))
+        self.assertFalse(events.submit(results.append, 99))
+        self.assertEqual(events.stats()["dropped"], 1)
+
+    @override_settings(BOLLARD_EVENT_ASYNC=False)
+    def test_sync_mode_runs_in_caller_thread(self):
+        threads = []
+
+        self.assertTrue(
+            submit_event(lambda: threads.append(threading.current_thread()))
+        )
+        self.assertEqual(threads, [threading.current_thread()])
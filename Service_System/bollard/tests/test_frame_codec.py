@@ -0,0 +1,64 @@
+import io
+import math
+
+from django.test import SimpleTestCase
+from rest_framework.exceptions import ParseError
+
+from bollard.parsers import BollardFrameParser
+from bollard.utils.frame_codec import (
+    HEADER,
+    MAGIC,
+    FrameDecodeError,
+    decode_frame,
+    encode_frame,
+)
+
+DETECTIONS = [
+    {"class_id": 2, "confidence": 0.5, "bbox": [1.0, 2.0, 300.5, 400.25]},
+    {"class_id": 7, "confidence": 0.25, "bbox": [0.0, 0.0, 640.0, 480.0]},
+]
+
+
+class FrameCodecTests(SimpleTestCase):
+    def test_round_trip(self):
+        data = encode_frame(
+            DETECTIONS, 640, 480, image=b"\xff\xd8jpeg", timestamp=1.7e9
+        )
+        frame = decode_frame(data)
+
+        self.assertEqual((frame["image_width"], frame["image_height"]), (640, 480))
+        self.assertEqual(frame["detections"], DETECTIONS)
+        self.assertEqual(frame["image_data"], b"\xff\xd8jpeg")
+        self.assertEqual(frame["timestamp"].timestamp(), 1.7e9)
+
+    def test_frame_without_image_or_timestamp(self):
+        frame = decode_frame(encode_frame([], 640, 480))
+
+        self.assertEqual(frame["detections"], [])
+        self.assertIsNone(frame["image_data"])
+        self.assertNotIn("timestamp", frame)
+
+    def test_length_must_match_header(self):
+        data = encode_frame(DETECTIONS, 640, 480, image=b"jpeg")
+
+        for bad in (data[:-1], data + b"\x00", data[: HEADER.size - 1]):
+            with self.assertRaises(FrameDecodeError):
+                decode_frame(bad)
+
+    def test_rejects_unknown_magic_and_invalid_timestamp(self):
+        data = encode_frame(DETECTIONS, 640, 480)
+        with self.assertRaises(FrameDecodeError):
+            decode_frame(b"XXXX" + data[len(MAGIC) :])
+
+        for timestamp in (math.nan, 1e20):
+            bad = HEADER.pack(MAGIC, 640, 480, timestamp, 0, 0)
+            with self.assertRaises(FrameDecodeError):
+                decode_frame(bad)
+
+    def test_parser_reports_parse_error(self):
+        parser = BollardFrameParser()
+        data = encode_frame(DETECTIONS, 640, 480)
+
+        self.assertEqual(parser.parse(io.BytesIO(data))["detections"], DETECTIONS)
+        with self.assertRaises(ParseError):
+            parser.parse(io.BytesIO(data[:-4]))
@@ -0,0 +1,87 @@
+import asyncio
+
+from django.test import SimpleTestCase
+
+from bollard.grpc_proto.result_pb2 import OptVal, Req
+from bollard.utils.grpc_aio import OPTION_QUEUE_SIZE, AsyncBollardServicer
+
+
+class FakeContext:
+    def invocation_metadata(self):
+        return ()
+
+
+class AsyncServicerTests(SimpleTestCase):
+    def setUp(self):
+        self.servicer = AsyncBollardServicer(keepalive_interval=0)
+        self.addCleanup(self.servicer.command_queue._listeners.remove, self.servicer)
+
+    def run_loop(self, scenario):
+        async def main():
+            self.servicer.bind_loop(asyncio.get_running_loop())
+            return await asyncio.wait_for(scenario(), timeout=5)
+
+        return asyncio.run(main())
+
+    def test_require_streams_result_changes_per_device(self):
+        self.servicer.set_system_active(True)
+
+        async def scenario():
+            first = self.servicer.Require(Req(request=701), FakeContext())
+            other = self.servicer.Require(Req(request=702), FakeContext())
+            self.assertFalse((await anext(first)).response)
+            self.assertFalse((await anext(other)).response)
+
+            self.servicer._publish_result(701, True, 0.0)
+            self.assertTrue((await anext(first)).response)
+
+            pending = asyncio.ensure_future(anext(other))
+            await asyncio.sleep(0.01)
+            self.assertFalse(pending.done())
+
+            self.servicer.set_system_active(False)
+            await asyncio.sleep(0)
+            with self.assertRaises(StopAsyncIteration):
+                await pending
+            await first.aclose()
+            return dict(self.servicer._result_queues)
+
+        self.assertEqual(self.run_loop(scenario), {})
+
+    def test_option_queues_exist_only_while_streams_are_connected(self):
+        async def scenario():
+            # 연결 전 옵션은 큐를 만들지 않음
+            self.servicer._publish_option(None, OptVal(manual_flag=True))
+            self.servicer._publish_option(703, OptVal(manual_flag=True))
+            self.assertEqual(dict(self.servicer._option_queues), {})
+
+            stream = self.servicer.Option(Req(request=703), FakeContext())
+            pending = asyncio.ensure_future(anext(stream))
+            await asyncio.sleep(0)
+            self.servicer._publish_option(None, OptVal(manual_flag=True, manual=True))
+            self.assertTrue((await pending).manual)
+
+            self.servicer._publish_option(703, OptVal(letsgo_flag=True, letsgo=True))
+            self.assertTrue((await anext(stream)).letsgo)
+            with self.assertRaises(StopAsyncIteration):
+                await anext(stream)
+            return dict(self.servicer._option_queues)
+
+        self.assertEqual(self.run_loop(scenario), {})
+        self.assertTrue(self.servicer.is_system_active())
+
+    def test_slow_option_stream_keeps_latest_options(self):
+        async def scenario():
+            stream = self.servicer.Option(Req(request=704), FakeContext())
+            pending = asyncio.ensure_future(anext(stream))
+            await asyncio.sleep(0)
+            (option_queue,) = self.servicer._option_queues[704]
+
+            for i in range(OPTION_QUEUE_SIZE + 5):
+                self.servicer._publish_option(704, OptVal(manual=bool(i % 2)))
+            self.assertEqual(option_queue.qsize(), OPTION_QUEUE_SIZE)
+            await pending
+            await stream.aclose()
+            return dict(self.servicer._option_queues)
+
+        self.assertEqual(self.run_loop(scenario), {})
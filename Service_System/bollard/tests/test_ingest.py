@@ -0,0 +1,113 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from bollard.grpc_proto.result_pb2 import Frame
+from bollard.models import BollardSetting
+from bollard.utils import ingest
+from bollard.utils.analyzer import BollardAnalyzer
+from bollard.utils.ingest import IngestMetrics, PendingEvents, process_frame
+
+# 640x480 이미지의 절반을 차지하는 자동차 한 대
+CAR = [0.0, 0.0, 640.0, 240.0, 0.9, 2.0]
+
+
+class ProcessFrameTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        BollardSetting.objects.create(
+            is_active=True, occupy_ratio=30, maintain_frame=1, target_object=2
+        )
+        analyzers = {}
+        self.events = []
+        self.pending = PendingEvents(wait=60)
+        patches = [
+            mock.patch.object(
+                ingest,
+                "get_analyzer",
+                side_effect=lambda i: analyzers.setdefault(i, BollardAnalyzer(i)),
+            ),
+            mock.patch.object(ingest, "send_detection_result"),
+            mock.patch.object(
+                ingest,
+                "submit_event",
+                side_effect=lambda func, **event: self.events.append(event),
+            ),
+            mock.patch.object(ingest, "pending_events", self.pending),
+            mock.patch.object(ingest, "metrics", IngestMetrics()),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def frame(self, seq, boxes=(), image=b"", **fields):
+        fields.setdefault("timestamp", 1_700_000_000.0 + seq)
+        return Frame(
+            bollard_id=fields.pop("bollard_id", 3),
+            seq=seq,
+            image_width=640,
+            image_height=480,
+            boxes=boxes,
+            image=image,
+            **fields,
+        )
+
+    def test_invalid_frames_get_error_decision(self):
+        frames = [
+            self.frame(1, bollard_id=-1),
+            self.frame(2, timestamp=float("nan")),
+            self.frame(3, timestamp=float("inf")),
+            self.frame(4, timestamp=1e20),
+        ]
+        for frame in frames:
+            decision = process_frame(frame)
+            self.assertEqual((decision.seq, decision.action), (frame.seq, "error"))
+
+        self.assertEqual(ingest.metrics.stats()["invalid"], 4)
+        # 스트림은 계속 사용 가능
+        self.assertEqual(process_frame(self.frame(5, CAR)).action, "close")
+
+    def test_state_change_waits_for_image_on_next_frame(self):
+        self.assertEqual(process_frame(self.frame(1, CAR)).action, "close")
+        self.assertEqual(self.events, [])
+
+        self.assertEqual(
+            process_frame(self.frame(2, CAR, image=b"jpeg")).action, "none"
+        )
+        self.assertEqual(len(self.events), 1)
+        self.assertEqual(self.events[0]["action"], "close")
+        self.assertEqual(self.events[0]["image_data"], b"jpeg")
+
+    def test_frame_with_image_records_event_immediately(self):
+        process_frame(self.frame(1, CAR, image=b"jpeg"))
+
+        self.assertEqual([e["image_data"] for e in self.events], [b"jpeg"])
+
+    def test_expired_wait_records_event_without_image(self):
+        self.pending.wait = 0
+        process_frame(self.frame(1, CAR))
+        process_frame(self.frame(2, CAR))
+
+        self.assertEqual([e["image_data"] for e in self.events], [None])
+
+    def test_end_stream_records_pending_events(self):
+        process_frame(self.frame(1, CAR))
+        process_frame(self.frame(1, CAR, bollard_id=4))
+        ingest.end_stream({3})
+
+        self.assertEqual([e["bollard_id"] for e in self.events], [3])
+        ingest.end_stream({3, 4})
+        self.assertEqual([e["bollard_id"] for e in self.events], [3, 4])
+
+
+class IngestMetricsTests(TestCase):
+    def test_stream_counters(self):
+        metrics = IngestMetrics()
+        metrics.stream_opened()
+        metrics.stream_opened()
+        metrics.stream_closed()
+        metrics.record_rejected()
+
+        stats = metrics.stats()
+        self.assertEqual((stats["streams"], stats["rejected"]), (1, 1))
@@ -0,0 +1,112 @@
+import os
+import shutil
+import socket
+import tempfile
+import time
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from bollard.utils.live_events import LiveEventHub, LiveEventRelay
+
+
+class LiveEventHubTests(SimpleTestCase):
+    def setUp(self):
+        relay = mock.patch(
+            "bollard.utils.live_events.get_live_relay", return_value=None
+        )
+        relay.start()
+        self.addCleanup(relay.stop)
+        self.hub = LiveEventHub(history=3, max_streams=2)
+
+    def open(self, **kwargs):
+        subscription = self.hub.stream(keepalive=0.01, **kwargs)
+        self.addCleanup(subscription.close)
+        return subscription, iter(subscription)
+
+    def test_subscriber_receives_initial_then_published_events(self):
+        _, messages = self.open(initial=[b"event: state\ndata: {}\n\n"])
+        self.assertEqual(next(messages), b"retry: 3000\n\n")
+        self.assertEqual(next(messages), b"event: state\ndata: {}\n\n")
+
+        self.hub.publish("log", {"id": 1, "action": "close"})
+        self.assertEqual(
+            next(messages),
+            b'id: 1\nevent: log\ndata: {"id": 1, "action": "close"}\n\n',
+        )
+        self.assertEqual(next(messages), b": keepalive\n\n")
+
+    def test_reconnect_replays_buffered_events_after_last_id(self):
+        for i in range(5):
+            self.hub.publish("log", {"id": i})
+
+        _, messages = self.open(last_event_id=3)
+        next(messages)  # retry
+        self.assertTrue(next(messages).startswith(b"id: 4\n"))
+        self.assertTrue(next(messages).startswith(b"id: 5\n"))
+
+        # 다른 워커의 더 큰 ID는 무시하고 새 이벤트부터
+        _, messages = self.open(last_event_id=99)
+        next(messages)
+        self.assertEqual(next(messages), b": keepalive\n\n")
+
+    def test_stream_limit_and_close_releases_slot(self):
+        first, _ = self.open()
+        self.open()
+        self.assertIsNone(self.hub.stream())
+        self.assertEqual(self.hub.stats()["rejected"], 1)
+
+        first.close()
+        first.close()
+        self.assertEqual(self.hub.subscribers, 1)
+        self.assertIsNotNone(self.open()[0])
+
+
+class LiveEventRelayTests(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def make_relay(self, name):
+        relay = LiveEventRelay(LiveEventHub(), self.directory)
+        relay.path = os.path.join(self.directory, f"{name}.sock")
+        return relay
+
+    def test_events_reach_listening_workers_and_stale_sockets_are_removed(self):
+        receiver = self.make_relay("receiver")
+        receiver.listen()
+        self.addCleanup(receiver._recv_sock.close)
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        stale.bind(os.path.join(self.directory, "stale.sock"))
+        stale.close()
+
+        sender = self.make_relay("sender")
+        sender.send("state", '{"bollard_id": 1}')
+
+        deadline = time.monotonic() + 5
+        while receiver.received == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(receiver.hub._seq, 1)
+        self.assertIn(b'data: {"bollard_id": 1}', receiver.hub._events[0][1])
+        self.assertEqual(sender.sent, 1)
+        self.assertFalse(os.path.exists(os.path.join(self.directory, "stale.sock")))
+
+
+class LiveStreamViewTests(TestCase):
+    def test_full_hub_answers_503_with_poll_url(self):
+        user = get_user_model().objects.create_user("viewer", password="pw")
+        self.client.force_login(user)
+        hub = LiveEventHub(max_streams=0)
+
+        with mock.patch("bollard.views.get_live_hub", return_value=hub), mock.patch(
+            "bollard.utils.live_events.get_live_relay", return_value=None
+        ):
+            response = self.client.get(
+                reverse("bollard_stream_api"), HTTP_ACCEPT="application/json"
+            )
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response["Retry-After"], "30")
+        self.assertEqual(response.json()["poll"], reverse("bollard_state_api"))
@@ -0,0 +1,92 @@
+import io
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from PIL import Image
+
+from blog.models import Post
+from blog.renditions import generate_renditions
+from bollard.models import ArchivedMedia, DetectionLog, OccupancyRollup
+from bollard.utils.archive import read_archived
+
+
+class RetentionTests(TestCase):
+    def setUp(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        self.media_root = os.path.join(root, "media")
+        settings_patch = override_settings(
+            MEDIA_ROOT=self.media_root,
+            BOLLARD_ARCHIVE_ROOT=os.path.join(root, "archive"),
+            BOLLARD_RETENTION={"detection_log": 30, "media": 30},
+        )
+        settings_patch.enable()
+        self.addCleanup(settings_patch.disable)
+
+    def run_retention(self, *tiers, dry_run=False):
+        out = io.StringIO()
+        call_command("bollard_retention", tier=list(tiers), dry_run=dry_run, stdout=out)
+        return out.getvalue()
+
+    def write_media(self, relative, data):
+        path = os.path.join(self.media_root, relative)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def test_old_logs_are_rolled_up_before_delete(self):
+        old = timezone.now() - timedelta(days=40)
+        for action in ("close", "open", "close"):
+            DetectionLog.objects.create(
+                timestamp=old, detected=True, occupy_ratio_actual=40.0, action=action
+            )
+        DetectionLog.objects.create(detected=False)
+
+        self.assertIn(
+            "3 rows would be deleted", self.run_retention("detection_log", dry_run=True)
+        )
+        self.run_retention("detection_log")
+
+        self.assertEqual(DetectionLog.objects.count(), 1)
+        day = OccupancyRollup.objects.get(period="day")
+        self.assertEqual((day.close_count, day.open_count), (2, 1))
+
+    def test_old_media_is_bundled_and_readable(self):
+        old = (timezone.localdate() - timedelta(days=40)).strftime("%Y/%m/%d")
+        new = timezone.localdate().strftime("%Y/%m/%d")
+        old_path = self.write_media(f"detection_logs/{old}/a.jpg", b"old frame")
+        new_path = self.write_media(f"detection_logs/{new}/b.jpg", b"new frame")
+
+        self.run_retention("media")
+        # 다시 실행해도 같은 번들/색인을 유지
+        self.run_retention("media")
+
+        self.assertFalse(os.path.exists(old_path))
+        self.assertTrue(os.path.exists(new_path))
+        self.assertEqual(read_archived(f"detection_logs/{old}/a.jpg"), b"old frame")
+        self.assertEqual(ArchivedMedia.objects.count(), 1)
+        self.assertIsNone(read_archived(f"detection_logs/{new}/b.jpg"))
+
+    def test_renditions_are_generated_from_archived_original(self):
+        old = (timezone.localdate() - timedelta(days=40)).strftime("%Y/%m/%d")
+        buffer = io.BytesIO()
+        Image.new("RGB", (1200, 600)).save(buffer, format="JPEG")
+        self.write_media(f"blog_image/{old}/event.jpg", buffer.getvalue())
+        author = get_user_model().objects.create_user("author", password="pw")
+        post = Post.objects.create(
+            author=author, title="event", text="", image=f"blog_image/{old}/event.jpg"
+        )
+
+        self.run_retention("media")
+        created = generate_renditions(post.pk)
+
+        self.assertEqual(
+            {r.name: r.width for r in created}, {"thumbnail": 320, "medium": 1024}
+        )
@@ -0,0 +1,67 @@
+from unittest import mock
+
+from django.db import DatabaseError
+from django.test import TestCase
+
+from bollard.models import OccupancyRollup
+from bollard.utils import rollup
+from bollard.utils.rollup import RollupBuffer, flush_rollups
+
+
+class RollupFlushTests(TestCase):
+    EPOCH = 1_700_000_000.0
+
+    def make_buffer(self, frames=3):
+        buffer = RollupBuffer()
+        for i in range(frames):
+            # 분 버킷 두 개에 걸치도록 40초 간격
+            buffer.add(self.EPOCH + i * 40, ratio=10.0 * (i + 1), action="close")
+        return buffer
+
+    def totals(self, period):
+        rows = OccupancyRollup.objects.filter(bollard_id=1, period=period)
+        return sum(row.frames for row in rows), sum(row.close_count for row in rows)
+
+    def test_flush_adds_to_existing_rows(self):
+        flush_rollups(1, self.make_buffer().drain())
+        flush_rollups(1, self.make_buffer().drain())
+
+        self.assertEqual(self.totals("minute"), (6, 6))
+        self.assertEqual(self.totals("day"), (6, 6))
+        day = OccupancyRollup.objects.get(bollard_id=1, period="day")
+        self.assertEqual(day.ratio_max, 30.0)
+        self.assertEqual(day.ratio_sum, 120.0)
+
+    def test_failed_flush_writes_nothing_and_merge_does_not_double_count(self):
+        buffer = self.make_buffer()
+        buckets = buffer.drain()
+        self.assertGreater(len(buckets), 2)
+
+        original = rollup._add_bucket
+        calls = []
+
+        def fail_on_third(*args):
+            calls.append(args)
+            if len(calls) == 3:
+                raise DatabaseError("disk full")
+            return original(*args)
+
+        with mock.patch.object(rollup, "_add_bucket", side_effect=fail_on_third):
+            with self.assertRaises(DatabaseError):
+                flush_rollups(1, buckets)
+
+        # 앞 버킷도 함께 롤백되어야 되돌린 뒤 다시 기록해도 한 번만 집계됨
+        self.assertFalse(OccupancyRollup.objects.exists())
+        buffer.merge(buckets)
+        flush_rollups(1, buffer.drain())
+        self.assertEqual(self.totals("minute"), (3, 3))
+        self.assertEqual(self.totals("hour"), (3, 3))
+
+    def test_merge_combines_with_new_frames(self):
+        buffer = self.make_buffer(frames=1)
+        buckets = buffer.drain()
+        buffer.add(self.EPOCH, ratio=50.0, action="open")
+        buffer.merge(buckets)
+
+        values = buffer.drain()[("minute", self.EPOCH - self.EPOCH % 60)]
+        self.assertEqual(values, [2, 1, 1, 60.0, 50.0])
@@ -0,0 +1,49 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from bollard.models import BollardSetting
+from bollard.utils.setting_cache import ActiveSettingCache
+
+
+class ActiveSettingCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.setting = BollardSetting.objects.create(is_active=True, occupy_ratio=30)
+
+    def test_invalidate_during_read_discards_stale_value(self):
+        setting_cache = ActiveSettingCache()
+        stale = BollardSetting.objects.get(pk=self.setting.pk)
+
+        def racing_load():
+            # DB를 읽은 직후 다른 요청이 설정을 바꾸고 invalidate()함
+            BollardSetting.objects.filter(pk=self.setting.pk).update(occupy_ratio=50)
+            setting_cache.invalidate()
+            return stale
+
+        with mock.patch.object(
+            BollardSetting, "load_active_setting", side_effect=racing_load
+        ):
+            self.assertEqual(setting_cache.get().occupy_ratio, 30)
+
+        self.assertEqual(setting_cache.get().occupy_ratio, 50)
+        self.assertEqual(ActiveSettingCache().get().occupy_ratio, 50)
+
+    def test_save_invalidates_shared_entry(self):
+        reader = ActiveSettingCache()
+        self.assertEqual(reader.get().occupy_ratio, 30)
+
+        self.setting.occupy_ratio = 70
+        self.setting.save()
+
+        # 새 프로세스 슬롯은 Django 캐시에서 새 세대 값을 읽음
+        self.assertEqual(ActiveSettingCache().get().occupy_ratio, 70)
+
+    def test_update_copy_does_not_leak_into_shared_instance(self):
+        shared = BollardSetting.get_active_setting()
+        editable = BollardSetting.get_active_setting_for_update()
+        self.assertIsNot(editable, shared)
+
+        editable.occupy_ratio = 99  # 저장 전 검증 실패 등으로 중단된 수정
+        self.assertEqual(BollardSetting.get_active_setting().occupy_ratio, 30)
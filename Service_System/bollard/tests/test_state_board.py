@@ -0,0 +1,109 @@
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import unittest
+from multiprocessing import shared_memory
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from bollard.models import BollardSetting, BollardState
+from bollard.utils import state_board
+from bollard.utils.analyzer import BollardAnalyzer
+from bollard.utils.state_board import SharedStateBoard
+
+
+@unittest.skipIf(state_board.fcntl is None, "shared state board needs fcntl")
+class SharedStateBoardTests(TestCase):
+    NAME = f"bollard_test_board_{os.getpid()}"
+
+    def setUp(self):
+        cache.clear()
+        BollardSetting.objects.create(is_active=True)
+        self.boards = []
+
+    def tearDown(self):
+        for board in self.boards:
+            board._shm.close()
+            os.close(board._lock_fd)
+        shared_memory.SharedMemory(name=self.NAME).unlink()
+        os.unlink(os.path.join(tempfile.gettempdir(), f"{self.NAME}.lock"))
+
+    def attach(self):
+        board = SharedStateBoard(name=self.NAME, slots=4)
+        self.boards.append(board)
+        return board
+
+    def store(self, board, bollard_id, **values):
+        state = BollardState(bollard_id=bollard_id, **values)
+        with board.locked_slot(bollard_id) as index:
+            board.store_state(index, state)
+
+    def test_analyzer_restores_state_written_by_another_worker(self):
+        board = self.attach()
+        BollardState.objects.create(bollard_id=2)
+        self.store(board, 2, is_closed=True, counter=4, manual_mode=True)
+
+        with mock.patch("bollard.utils.analyzer.get_state_board", return_value=board):
+            state = BollardAnalyzer(2).get_state()
+
+        self.assertEqual(
+            (state.is_closed, state.counter, state.manual_mode), (True, 4, True)
+        )
+
+    def test_first_attach_clears_state_left_by_previous_run(self):
+        self.store(self.attach(), 2, is_closed=True, counter=4)
+
+        # 이 프로세스 외에 붙어 있는 프로세스가 없으므로 새 실행으로 보고 초기화
+        board = self.attach()
+        state = BollardState(bollard_id=2)
+        with board.locked_slot(2) as index:
+            self.assertFalse(board.load_state(index, state))
+        self.assertEqual(board.stats()["slots_used"], 1)
+
+    def test_attach_keeps_state_while_another_process_is_attached(self):
+        self.store(self.attach(), 2, is_closed=True, counter=4)
+
+        code = textwrap.dedent(f"""
+            import django
+            django.setup()
+            from bollard.models import BollardState
+            from bollard.utils.state_board import SharedStateBoard
+            board = SharedStateBoard(name={self.NAME!r}, slots=4)
+            state = BollardState(bollard_id=2)
+            with board.locked_slot(2) as index:
+                print(board.load_state(index, state), state.counter)
+            """)
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE="photoblogserver.settings")
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True,
+            text=True,
+            env=env,
+            cwd=os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+            timeout=60,
+        )
+        self.assertEqual(result.stdout.split(), ["True", "4"], result.stderr)
+
+
+class AnalyzerSnapshotWriteTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        BollardSetting.objects.create(is_active=True, occupy_ratio=30, maintain_frame=3)
+
+    def test_older_snapshot_does_not_overwrite_newer_save(self):
+        analyzer = BollardAnalyzer(1)
+        analyzer.force_close()
+        with analyzer._lock:
+            analyzer._persist()
+            older = analyzer._pending
+            analyzer._state.is_closed = False
+            analyzer._persist()
+            newer, analyzer._pending = analyzer._pending, None
+
+        analyzer._write_state(newer)
+        analyzer._write_state(older)  # lock 밖에서 늦게 도착한 이전 사본
+        self.assertFalse(BollardState.objects.get(bollard_id=1).is_closed)
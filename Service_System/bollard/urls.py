@@ -11,6 +11,7 @@ from . import views
 
 router = DefaultRouter()
 router.register(r"settings", views.BollardSettingViewSet, basename="bollard-setting")
+router.register(r"logs", views.DetectionLogViewSet, basename="bollard-log")
 
 urlpatterns = [
     # YOLO 서버에서 검출 결과 수신
@@ -19,6 +20,12 @@ urlpatterns = [
         views.DetectionAPIView.as_view(),
         name="bollard_detection_api",
     ),
+    # YOLO 서버에서 검출 결과 일괄 수신 (프레임 배치)
+    path(
+        "api/bollard/detection/batch/",
+        views.DetectionBatchAPIView.as_view(),
+        name="bollard_detection_batch_api",
+    ),
     # 볼라드 수동 제어
     path(
         "api/bollard/control/",
@@ -31,6 +38,18 @@ urlpatterns = [
         views.BollardStateAPIView.as_view(),
         name="bollard_state_api",
     ),
+    # 상태/로그 실시간 스트림 (SSE)
+    path(
+        "api/bollard/stream/",
+        views.LiveStreamAPIView.as_view(),
+        name="bollard_stream_api",
+    ),
+    # 점유율 집계 (분/시간/일)
+    path(
+        "api/bollard/analytics/",
+        views.OccupancyAnalyticsAPIView.as_view(),
+        name="bollard_analytics_api",
+    ),
     # 시스템 전체 상태
     path(
         "api/bollard/status/",
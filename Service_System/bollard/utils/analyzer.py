@@ -1,5 +1,24 @@
-from typing import List, Dict, Any, Tuple
+import atexit
+import copy
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import List, Dict, Any, Iterator, Tuple, Optional
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+
 from bollard.models import BollardSetting, BollardState
+from bollard.utils.live_events import publish_state
+from bollard.utils.rollup import RollupBuffer, flush_rollups
+from bollard.utils.state_board import get_state_board
+
+logger = logging.getLogger(__name__)
+
+# 상태가 바뀌지 않아도 카운터를 DB에 기록하는 최대 간격 (초)
+DEFAULT_CHECKPOINT_INTERVAL = 5.0
 
 
 class BollardAnalyzer:
@@ -11,13 +30,146 @@ class BollardAnalyzer:
     2. 각 객체의 화면 점유율 계산 (바운딩 박스 면적 / 전체 이미지 면적)
     3. 최대 점유율이 occupy_ratio 임계값을 초과하면 카운터를 maintain_frame으로 설정
     4. 카운터 > 0이면 볼라드 닫힘 유지, 아니면 열림
+
+    상태 관리:
+    카운터, 닫힘 상태, 수동 모드는 프로세스 메모리의 BollardState 인스턴스에 유지합니다.
+    DB 저장은 열림/닫힘 또는 모드가 바뀔 때 즉시, 그 외에는 checkpoint_interval
+    간격으로만 수행합니다. 저장할 값은 lock 안에서 사본으로 떠 두고 실제 기록은
+    lock(과 공유 보드 슬롯 잠금)을 놓은 뒤 수행하며, 늦게 도착한 이전 사본은 버립니다.
+
+    분/시간/일 점유율 집계도 메모리 버킷(RollupBuffer)에 누적한 뒤 같은 간격으로
+    OccupancyRollup 행에 더합니다. 집계 기록은 lock을 놓은 뒤 수행하며, 프레임이 끊긴
+    카메라의 버킷은 백그라운드 flush 스레드(AnalyzerFlusher)가 기록합니다.
+
+    분석기는 볼라드(카메라) ID마다 하나씩 만들어지며 각자 BollardState 행과 lock을
+    가지므로, 서로 다른 카메라의 분석은 경합 없이 병렬로 실행됩니다.
+
+    워커 프로세스가 여러 개이면 BOLLARD_SHARED_STATE로 공유 상태 보드를 켜서 모든
+    워커가 같은 카운터/닫힘 상태를 사용하도록 합니다. (bollard.utils.state_board)
     """
 
-    def __init__(self):
-        pass
+    def __init__(
+        self, bollard_id: int = 0, checkpoint_interval: Optional[float] = None
+    ):
+        self.bollard_id = bollard_id
+        if checkpoint_interval is None:
+            checkpoint_interval = getattr(
+                settings,
+                "BOLLARD_STATE_CHECKPOINT_INTERVAL",
+                DEFAULT_CHECKPOINT_INTERVAL,
+            )
+        self.checkpoint_interval = checkpoint_interval
+
+        self._lock = threading.Lock()
+        self._state: Optional[BollardState] = None
+        self._dirty = False
+        self._last_checkpoint = 0.0
+        # lock 밖에서 기록할 상태 사본과 순번 (_write_lock으로 기록 순서 보장)
+        self._pending: Optional[Tuple[int, BollardState]] = None
+        self._version = 0
+        self._written_version = 0
+        self._write_lock = threading.Lock()
+        self._rollup = RollupBuffer()
+        self._last_rollup_flush = time.monotonic()
+
+    def _load_state(self) -> BollardState:
+        # 최초 호출 시 한 번만 DB에서 상태를 읽어옴 (lock 보유 상태에서 호출)
+        if self._state is None:
+            self._state = BollardState.get_instance(self.bollard_id)
+            self._last_checkpoint = time.monotonic()
+        return self._state
+
+    @contextmanager
+    def _locked_state(self) -> Iterator[BollardState]:
+        """
+        lock을 잡은 상태에서 BollardState를 넘겨줌
+
+        공유 상태 보드가 있으면 볼라드 슬롯도 잠그고 다른 워커가 기록한 상태를 읽어온 뒤,
+        블록이 끝나면 변경된 상태를 다시 보드에 기록합니다.
+        """
+        with self._lock:
+            state = self._load_state()
+            board = get_state_board()
+            if board is None:
+                yield state
+            else:
+                with board.locked_slot(self.bollard_id) as index:
+                    board.load_state(index, state)
+                    yield state
+                    board.store_state(index, state)
+            pending, self._pending = self._pending, None
+            rollups = self._drain_rollups()
+
+        # DB 기록은 lock 밖에서 (다른 프레임의 분석과 다른 워커의 슬롯 잠금을 막지 않도록)
+        self._write_state(pending)
+        self._write_rollups(rollups)
+
+    def _persist(self) -> None:
+        # lock 보유 상태에서 호출. 저장할 사본만 만들고 기록은 _write_state가 lock 밖에서 수행
+        self._version += 1
+        self._pending = (self._version, copy.copy(self._state))
+        self._dirty = False
+        self._last_checkpoint = time.monotonic()
+
+    def _write_state(self, pending: Optional[Tuple[int, BollardState]]) -> None:
+        """_persist가 만든 사본을 DB에 기록 (lock 밖에서 호출). 실패하면 다음 체크포인트에 재시도"""
+        if pending is None:
+            return
+        version, snapshot = pending
+        try:
+            with self._write_lock:
+                # 다른 스레드가 더 최신 사본을 이미 기록했으면 건너뜀
+                if version <= self._written_version:
+                    return
+                snapshot.save(
+                    update_fields=[
+                        "is_closed",
+                        "counter",
+                        "manual_mode",
+                        "last_updated",
+                    ]
+                )
+                self._written_version = version
+        except Exception as e:
+            logger.warning(f"Failed to save bollard {self.bollard_id} state: {e}")
+            with self._lock:
+                self._dirty = True
+
+    def _checkpoint(self) -> None:
+        if not self._dirty:
+            return
+        if time.monotonic() - self._last_checkpoint >= self.checkpoint_interval:
+            self._persist()
+
+    def _record_rollup(self, epoch: float, ratio: float, action: str) -> None:
+        # lock 보유 상태에서 호출
+        self._rollup.add(epoch, ratio, action)
+
+    def _drain_rollups(self, force: bool = False) -> Dict:
+        """기록할 때가 된 집계 버킷을 꺼냄 (lock 보유 상태에서 호출)"""
+        now = time.monotonic()
+        if not force and now - self._last_rollup_flush < self.checkpoint_interval:
+            return {}
+        self._last_rollup_flush = now
+        return self._rollup.drain() if self._rollup else {}
+
+    def _write_rollups(self, buckets: Dict) -> None:
+        """꺼낸 버킷을 DB에 기록 (lock 밖에서 호출). 실패하면 버퍼로 되돌림"""
+        if not buckets:
+            return
+        try:
+            flush_rollups(self.bollard_id, buckets)
+        except Exception as e:
+            logger.warning(f"Failed to flush bollard {self.bollard_id} rollups: {e}")
+            with self._lock:
+                self._rollup.merge(buckets)
 
     def analyze(
-        self, detections: List[Dict[str, Any]], image_width: int, image_height: int
+        self,
+        detections: List[Dict[str, Any]],
+        image_width: int,
+        image_height: int,
+        timestamp: Optional[datetime] = None,
     ) -> Tuple[bool, float, str]:
         """
         검출 결과 분석
@@ -31,6 +183,7 @@ class BollardAnalyzer:
                 }
             image_width: 이미지 너비 (픽셀)
             image_height: 이미지 높이 (픽셀)
+            timestamp: 프레임 촬영 시각 (집계 버킷 기준, 없으면 현재 시각)
 
         Returns:
             Tuple[bool, float, str]:
@@ -39,75 +192,188 @@ class BollardAnalyzer:
                 - action: 수행할 액션 ("open", "close", "none")
         """
         setting = BollardSetting.get_active_setting()
-        state = BollardState.get_instance()
-
-        if state.manual_mode:
-            return (state.is_closed, 0.0, "none")
 
         occupy_ratio = setting.occupy_ratio
         maintain_frame = setting.maintain_frame
         target_object = setting.target_object
 
         img_area = image_width * image_height
-        if img_area == 0:
-            return (False, 0.0, "none")
 
         # 타겟 객체 필터링 및 최대 점유율 계산
         max_ratio = 0.0
-        for det in detections:
-            if det.get("class_id") == target_object:
-                bbox = det.get("bbox", [0, 0, 0, 0])
-                if len(bbox) >= 4:
-                    x1, y1, x2, y2 = bbox[:4]
-                    box_area = (x2 - x1) * (y2 - y1)
-                    current_ratio = (box_area / img_area) * 100
-                    if current_ratio > max_ratio:
-                        max_ratio = current_ratio
-
-        if max_ratio > occupy_ratio:
-            state.counter = maintain_frame
-        else:
-            state.counter = max(0, state.counter - 1)
-
-        should_close = state.counter > 0
-
-        action = "none"
-        if should_close and not state.is_closed:
-            action = "close"
-            state.is_closed = True
-        elif not should_close and state.is_closed:
-            action = "open"
-            state.is_closed = False
+        if img_area > 0:
+            for det in detections:
+                if det.get("class_id") == target_object:
+                    bbox = det.get("bbox", [0, 0, 0, 0])
+                    if len(bbox) >= 4:
+                        x1, y1, x2, y2 = bbox[:4]
+                        box_area = (x2 - x1) * (y2 - y1)
+                        current_ratio = (box_area / img_area) * 100
+                        if current_ratio > max_ratio:
+                            max_ratio = current_ratio
+
+        epoch = timestamp.timestamp() if timestamp else time.time()
+
+        with self._locked_state() as state:
+
+            if state.manual_mode:
+                # 수동 모드에서도 점유율은 집계 (동작 없음)
+                if img_area > 0:
+                    self._record_rollup(epoch, max_ratio, "none")
+                return (state.is_closed, 0.0, "none")
+
+            if img_area == 0:
+                return (False, 0.0, "none")
+
+            if max_ratio > occupy_ratio:
+                counter = maintain_frame
+            else:
+                counter = max(0, state.counter - 1)
+
+            if counter != state.counter:
+                state.counter = counter
+                self._dirty = True
 
-        state.save()
+            should_close = counter > 0
+
+            action = "none"
+            if should_close and not state.is_closed:
+                action = "close"
+                state.is_closed = True
+            elif not should_close and state.is_closed:
+                action = "open"
+                state.is_closed = False
+
+            if action != "none":
+                self._persist()
+                publish_state(state)
+            else:
+                self._checkpoint()
+
+            self._record_rollup(epoch, max_ratio, action)
 
         return (should_close, max_ratio, action)
 
+    def get_state(self) -> BollardState:
+        """
+        메모리에 유지 중인 최신 상태의 사본 (DB 기록보다 최대 checkpoint_interval 앞설 수 있음)
+
+        lock 안에서 복사하므로 직렬화 도중 다른 프레임이 값을 바꿔도 섞이지 않습니다.
+        """
+        with self._locked_state() as state:
+            return copy.copy(state)
+
     def force_open(self) -> str:
-        state = BollardState.get_instance()
-        state.is_closed = True
-        state.manual_mode = True
-        state.save()
+        with self._locked_state() as state:
+            state.is_closed = False
+            state.counter = 0
+            state.manual_mode = True
+            self._persist()
+            publish_state(state)
+        return "open"
+
+    def force_close(self) -> str:
+        with self._locked_state() as state:
+            state.is_closed = True
+            state.manual_mode = True
+            self._persist()
+            publish_state(state)
         return "close"
 
     def set_auto_mode(self) -> None:
-        state = BollardState.get_instance()
-        state.manual_mode = False
-        state.save()
+        with self._locked_state() as state:
+            state.manual_mode = False
+            self._persist()
+            publish_state(state)
 
     def reset_state(self) -> None:
-        state = BollardState.get_instance()
-        state.is_closed = False
-        state.counter = 0
-        state.manual_mode = False
-        state.save()
+        with self._locked_state() as state:
+            state.is_closed = False
+            state.counter = 0
+            state.manual_mode = False
+            self._persist()
+            publish_state(state)
+
+    def flush(self) -> None:
+        """체크포인트 대기 중인 카운터와 집계 버킷을 즉시 DB에 기록"""
+        with self._lock:
+            if self._state is not None and self._dirty:
+                self._persist()
+            pending, self._pending = self._pending, None
+            rollups = self._drain_rollups(force=True)
+        self._write_state(pending)
+        self._write_rollups(rollups)
+
+
+_analyzers: Dict[int, BollardAnalyzer] = {}
+_analyzers_lock = threading.Lock()
+
+
+def _flush_analyzers_at_exit():
+    for analyzer in list(_analyzers.values()):
+        try:
+            analyzer.flush()
+        except Exception as e:
+            logger.warning(f"Failed to flush bollard {analyzer.bollard_id} state: {e}")
+
+
+atexit.register(_flush_analyzers_at_exit)
+
+
+class AnalyzerFlusher(threading.Thread):
+    """
+    체크포인트 간격마다 모든 분석기의 대기 중인 카운터/집계 버킷을 기록
+
+    분석기는 프레임이 들어올 때만 기록 시점을 확인하므로, 프레임이 끊긴 카메라의
+    마지막 버킷과 카운터는 이 스레드가 기록합니다.
+    """
+
+    def __init__(self, interval: float):
+        super().__init__(name="bollard-analyzer-flush", daemon=True)
+        self.interval = interval
+        self._stopped = threading.Event()
+
+    def run(self) -> None:
+        try:
+            while not self._stopped.wait(self.interval):
+                close_old_connections()
+                for analyzer in list(_analyzers.values()):
+                    try:
+                        analyzer.flush()
+                    except Exception as e:
+                        logger.warning(
+                            f"Failed to flush bollard {analyzer.bollard_id} state: {e}"
+                        )
+        finally:
+            connection.close()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+
+_flusher: Optional[AnalyzerFlusher] = None
+
 
+def get_analyzer(bollard_id: int = 0) -> BollardAnalyzer:
+    global _flusher
+    analyzer = _analyzers.get(bollard_id)
+    if analyzer is None:
+        with _analyzers_lock:
+            analyzer = _analyzers.get(bollard_id)
+            if analyzer is None:
+                analyzer = _analyzers[bollard_id] = BollardAnalyzer(bollard_id)
+            if _flusher is None:
+                _flusher = AnalyzerFlusher(max(analyzer.checkpoint_interval, 1.0))
+                _flusher.start()
+    return analyzer
 
-_analyzer_instance = None
 
+def get_analyzers(bollard_id: Optional[int] = None) -> List[BollardAnalyzer]:
+    """bollard_id가 None이면 DB에 상태가 있는 모든 볼라드의 분석기 반환"""
+    if bollard_id is not None:
+        return [get_analyzer(bollard_id)]
 
-def get_analyzer() -> BollardAnalyzer:
-    global _analyzer_instance
-    if _analyzer_instance is None:
-        _analyzer_instance = BollardAnalyzer()
-    return _analyzer_instance
+    bollard_ids = set(_analyzers)
+    bollard_ids.update(BollardState.objects.values_list("bollard_id", flat=True))
+    bollard_ids.add(0)
+    return [get_analyzer(i) for i in sorted(bollard_ids)]
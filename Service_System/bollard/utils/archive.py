@@ -0,0 +1,124 @@
+"""
+미디어 보관(아카이브) 번들
+
+MEDIA_ROOT/<prefix>/YYYY/MM/DD/ 날짜 디렉터리 하나를 BOLLARD_ARCHIVE_ROOT/<prefix>/
+YYYY-MM-DD.zip 번들 하나로 압축하고, 파일별 원래 경로를 ArchivedMedia에 색인합니다.
+zip은 멤버 단위로 읽을 수 있으므로 번들 전체를 풀지 않고 파일 하나를 꺼낼 수
+있습니다.
+
+번들 기록 -> 색인 커밋 -> 원본 삭제 순서로 처리하므로 중간에 중단되어도 파일이
+유실되지 않으며, 다시 실행하면 남은 파일부터 이어서 처리합니다.
+"""
+
+import os
+import zipfile
+from datetime import date
+from typing import Iterator, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+
+from bollard.models import ArchivedMedia
+
+# 날짜 디렉터리(YYYY/MM/DD)에 업로드되는 미디어
+# (blog_image/renditions/ 아래 렌디션은 목록 화면용이므로 보관하지 않음)
+ARCHIVE_PREFIXES = ("detection_logs", "blog_image")
+
+
+def get_archive_root() -> str:
+    return str(
+        getattr(
+            settings,
+            "BOLLARD_ARCHIVE_ROOT",
+            os.path.join(settings.BASE_DIR, "archive"),
+        )
+    )
+
+
+def iter_day_dirs(prefix: str, before: date) -> Iterator[Tuple[date, str]]:
+    """before 이전 날짜의 MEDIA_ROOT/prefix/YYYY/MM/DD 디렉터리 (오래된 순)"""
+    root = os.path.join(settings.MEDIA_ROOT, prefix)
+    for year in sorted(_numeric_entries(root)):
+        for month in sorted(_numeric_entries(os.path.join(root, year))):
+            for day in sorted(_numeric_entries(os.path.join(root, year, month))):
+                try:
+                    current = date(int(year), int(month), int(day))
+                except ValueError:
+                    continue
+                if current >= before:
+                    return
+                yield current, os.path.join(root, year, month, day)
+
+
+def _numeric_entries(path: str):
+    try:
+        return [name for name in os.listdir(path) if name.isdigit()]
+    except FileNotFoundError:
+        return []
+
+
+def archive_day_dir(prefix: str, day: date, directory: str) -> Tuple[int, int]:
+    """날짜 디렉터리를 번들로 옮김. (파일 수, 원본 바이트 수) 반환"""
+    files = []
+    for dirpath, _, filenames in os.walk(directory):
+        for filename in sorted(filenames):
+            absolute = os.path.join(dirpath, filename)
+            relative = os.path.relpath(absolute, settings.MEDIA_ROOT)
+            files.append((relative.replace(os.sep, "/"), absolute))
+    if not files:
+        _remove_empty_dirs(directory, prefix)
+        return 0, 0
+
+    bundle = f"{prefix}/{day:%Y-%m-%d}.zip"
+    bundle_path = os.path.join(get_archive_root(), bundle)
+    os.makedirs(os.path.dirname(bundle_path), exist_ok=True)
+
+    sizes = {}
+    with zipfile.ZipFile(bundle_path, "a", compression=zipfile.ZIP_DEFLATED) as zf:
+        archived = set(zf.namelist())
+        for relative, absolute in files:
+            sizes[relative] = os.path.getsize(absolute)
+            if relative not in archived:
+                zf.write(absolute, arcname=relative)
+
+    with transaction.atomic():
+        ArchivedMedia.objects.bulk_create(
+            [
+                ArchivedMedia(path=relative, bundle=bundle, size=size)
+                for relative, size in sizes.items()
+            ],
+            ignore_conflicts=True,
+        )
+
+    for _, absolute in files:
+        os.remove(absolute)
+    _remove_empty_dirs(directory, prefix)
+    return len(files), sum(sizes.values())
+
+
+def _remove_empty_dirs(directory: str, prefix: str) -> None:
+    stop = os.path.join(settings.MEDIA_ROOT, prefix)
+    for dirpath, _, _ in sorted(os.walk(directory), reverse=True):
+        _rmdir_quiet(dirpath)
+    parent = os.path.dirname(directory)
+    while parent.startswith(stop) and parent != stop:
+        if not _rmdir_quiet(parent):
+            break
+        parent = os.path.dirname(parent)
+
+
+def _rmdir_quiet(path: str) -> bool:
+    try:
+        os.rmdir(path)
+        return True
+    except OSError:
+        return False
+
+
+def read_archived(path: str) -> Optional[bytes]:
+    """보관된 미디어 파일 내용 (색인에 없으면 None)"""
+    entry = ArchivedMedia.objects.filter(path=path).first()
+    if entry is None:
+        return None
+    with zipfile.ZipFile(os.path.join(get_archive_root(), entry.bundle)) as zf:
+        return zf.read(path)
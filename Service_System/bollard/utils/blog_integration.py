@@ -1,6 +1,7 @@
 import base64
 import logging
-from typing import Optional
+from datetime import datetime
+from typing import Any, Dict, List, Optional
 from io import BytesIO
 
 from django.utils import timezone
@@ -8,6 +9,8 @@ from django.contrib.auth import get_user_model
 from django.core.files.base import ContentFile
 
 from blog.models import Post
+from bollard.models import DetectionLog
+from bollard.utils.live_events import publish_log
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +20,8 @@ def create_bollard_event_post(
     action: str,
     occupy_ratio: float = 0.0,
     author_username: str = "yolo_edge",
+    timestamp: Optional[datetime] = None,
+    image_data: Optional[bytes] = None,
 ) -> Optional[Post]:
     User = get_user_model()
 
@@ -33,7 +38,8 @@ def create_bollard_event_post(
             )
             logger.info(f"Created yolo_edge user: {author.id}")
 
-    timestamp = timezone.now()
+    if timestamp is None:
+        timestamp = timezone.now()
     timestamp_str = timestamp.strftime("%Y-%m-%d %H:%M:%S")
 
     if action == "close":
@@ -65,9 +71,10 @@ def create_bollard_event_post(
             created_date=timestamp,
         )
 
-        if image_base64:
+        if image_base64 or image_data:
             try:
-                image_data = base64.b64decode(image_base64)
+                if image_data is None:
+                    image_data = base64.b64decode(image_base64)
                 filename = f"bollard_{action}_{timestamp.strftime('%Y%m%d_%H%M%S')}.jpg"
                 post.image.save(filename, ContentFile(image_data), save=False)
             except Exception as e:
@@ -84,6 +91,61 @@ def create_bollard_event_post(
         return None
 
 
+def record_bollard_event(
+    image_base64: Optional[str],
+    action: str,
+    occupy_ratio: float,
+    detected: bool,
+    timestamp: Optional[datetime] = None,
+    image_data: Optional[bytes] = None,
+    bollard_id: int = 0,
+) -> DetectionLog:
+    """이벤트 포스트 생성 + DetectionLog 기록 (이벤트 큐 워커에서 실행)"""
+    post = create_bollard_event_post(
+        image_base64=image_base64,
+        action=action,
+        occupy_ratio=occupy_ratio,
+        timestamp=timestamp,
+        image_data=image_data,
+    )
+    log = DetectionLog.objects.create(
+        timestamp=timestamp or timezone.now(),
+        bollard_id=bollard_id,
+        detected=detected,
+        occupy_ratio_actual=occupy_ratio,
+        action=action,
+        post=post,
+    )
+    publish_log(log)
+    return log
+
+
+def record_bollard_events(events: List[Dict[str, Any]]) -> List[DetectionLog]:
+    """배치 처리 결과의 이벤트들을 포스트로 만들고 DetectionLog를 한 번에 기록"""
+    logs = []
+    for event in events:
+        post = create_bollard_event_post(
+            image_base64=event.get("image_base64"),
+            action=event["action"],
+            occupy_ratio=event["occupy_ratio"],
+            timestamp=event.get("timestamp"),
+        )
+        logs.append(
+            DetectionLog(
+                timestamp=event.get("timestamp") or timezone.now(),
+                bollard_id=event.get("bollard_id", 0),
+                detected=event["detected"],
+                occupy_ratio_actual=event["occupy_ratio"],
+                action=event["action"],
+                post=post,
+            )
+        )
+    logs = DetectionLog.objects.bulk_create(logs)
+    for log in logs:
+        publish_log(log)
+    return logs
+
+
 def create_manual_control_post(action: str, operator_username: str) -> Optional[Post]:
     User = get_user_model()
 
@@ -0,0 +1,149 @@
+"""
+검출 프레임 latest-wins 병합 (카메라별 부하 분산)
+
+서버가 밀리면 같은 카메라의 프레임 요청이 동시에 쌓이고, 요청마다 분석기와 게시글
+생성까지 실행되어 과부하가 커집니다. 카메라(볼라드 ID)마다 처리 중인 프레임 1개와
+대기 프레임 1개만 유지하고, 새 프레임이 오면 대기 중이던 프레임은 처리하지 않고
+"superseded"로 바로 응답합니다. 촬영 시각이 이미 처리한 프레임보다 앞선 프레임도
+같은 방식으로 버립니다.
+
+병합은 프로세스 단위이므로 워커가 여러 개이면 워커별로 적용됩니다.
+"""
+
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class _Ticket:
+    __slots__ = ("event", "superseded", "timestamp")
+
+    def __init__(self, timestamp: Optional[datetime]):
+        self.event = threading.Event()
+        self.superseded = False
+        self.timestamp = timestamp
+
+
+class _Lane:
+    __slots__ = (
+        "busy",
+        "pending",
+        "last_timestamp",
+        "processed",
+        "superseded",
+        "stale",
+        "max_depth",
+    )
+
+    def __init__(self):
+        self.busy = False
+        self.pending: Optional[_Ticket] = None
+        self.last_timestamp: Optional[datetime] = None
+        self.processed = 0
+        self.superseded = 0
+        self.stale = 0
+        self.max_depth = 0
+
+    @property
+    def depth(self) -> int:
+        return int(self.busy) + int(self.pending is not None)
+
+
+class FrameCoalescer:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._lanes: Dict[int, _Lane] = {}
+
+    def submit(
+        self,
+        bollard_id: int,
+        process: Callable[[], T],
+        timestamp: Optional[datetime] = None,
+    ) -> Optional[T]:
+        """
+        process()를 실행하고 결과 반환. 더 새로운 프레임에 밀려나면 None
+
+        같은 카메라의 프레임이 처리 중이면 대기하며, 그동안 새 프레임이 오면 대기를
+        포기하고 None을 반환합니다.
+        """
+        with self._lock:
+            lane = self._lanes.get(bollard_id)
+            if lane is None:
+                lane = self._lanes[bollard_id] = _Lane()
+
+            if (
+                timestamp is not None
+                and lane.last_timestamp is not None
+                and timestamp < lane.last_timestamp
+            ):
+                lane.stale += 1
+                return None
+
+            ticket = None
+            if lane.busy:
+                pending = lane.pending
+                if (
+                    pending is not None
+                    and timestamp is not None
+                    and pending.timestamp is not None
+                    and timestamp < pending.timestamp
+                ):
+                    lane.stale += 1
+                    return None
+                if pending is not None:
+                    pending.superseded = True
+                    pending.event.set()
+                    lane.superseded += 1
+                ticket = lane.pending = _Ticket(timestamp)
+            else:
+                lane.busy = True
+            lane.max_depth = max(lane.max_depth, lane.depth)
+
+        if ticket is not None:
+            ticket.event.wait()
+            if ticket.superseded:
+                return None
+            # 앞 프레임 처리가 끝나 차례가 넘어옴 (busy 유지)
+
+        try:
+            return process()
+        finally:
+            with self._lock:
+                lane.processed += 1
+                if timestamp is not None and (
+                    lane.last_timestamp is None or timestamp > lane.last_timestamp
+                ):
+                    lane.last_timestamp = timestamp
+                if lane.pending is not None:
+                    lane.pending.event.set()
+                    lane.pending = None
+                else:
+                    lane.busy = False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lanes = {
+                bollard_id: {
+                    "depth": lane.depth,
+                    "max_depth": lane.max_depth,
+                    "processed": lane.processed,
+                    "superseded": lane.superseded,
+                    "stale": lane.stale,
+                }
+                for bollard_id, lane in self._lanes.items()
+            }
+        return {
+            "queue_depth": sum(lane["depth"] for lane in lanes.values()),
+            "processed": sum(lane["processed"] for lane in lanes.values()),
+            "shed": sum(lane["superseded"] + lane["stale"] for lane in lanes.values()),
+            "cameras": lanes,
+        }
+
+
+_coalescer = FrameCoalescer()
+
+
+def get_frame_coalescer() -> FrameCoalescer:
+    return _coalescer
@@ -0,0 +1,203 @@
+"""
+웹 워커 -> gRPC 컨트롤 플레인 명령 채널 (Unix 도메인 데이터그램 소켓)
+
+gRPC 서버를 별도 프로세스(python manage.py bollard_grpc)로 실행하면, Django 워커는
+판단 결과/수동 제어/시스템 활성 명령을 이 채널로 보냅니다. 데이터그램 하나가 명령
+하나이며 연결 과정이 없어 전달 지연은 수십 마이크로초 수준입니다.
+
+메시지 레이아웃 (little endian, 14바이트):
+    종류(uint8), 볼라드 ID(int32, -1이면 전체), 값(uint8), 전송 시각(float64, epoch)
+
+송신은 non-blocking이므로 컨트롤 플레인이 내려가 있거나 수신 버퍼가 가득 차도
+요청 처리가 막히지 않고 해당 명령만 버려집니다 (dropped 통계).
+"""
+
+import logging
+import os
+import socket
+import struct
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+
+from bollard.utils.state_board import decode_option, encode_option
+
+logger = logging.getLogger(__name__)
+
+MESSAGE = struct.Struct("<BiBd")
+
+KIND_RESULT = 1
+KIND_OPTION = 2
+KIND_SYSTEM_ACTIVE = 3
+
+ALL_DEVICES = -1
+
+DEFAULT_SOCKET_PATH = "/tmp/bollard_control.sock"
+
+
+def get_socket_path() -> str:
+    return getattr(settings, "BOLLARD_CONTROL_SOCKET", DEFAULT_SOCKET_PATH)
+
+
+class ControlChannelClient:
+    def __init__(self, path: str):
+        self.path = path
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._sock.setblocking(False)
+        self.sent = 0
+        self.dropped = 0
+        self._last_warning = 0.0
+
+    def _send(self, kind: int, device_id: Optional[int], value: int) -> bool:
+        message = MESSAGE.pack(
+            kind,
+            ALL_DEVICES if device_id is None else device_id,
+            value,
+            time.time(),
+        )
+        try:
+            self._sock.sendto(message, self.path)
+        except OSError as e:
+            self.dropped += 1
+            # 컨트롤 플레인이 내려가 있으면 매 요청마다 경고가 쌓이지 않도록 제한
+            now = time.monotonic()
+            if now - self._last_warning >= 10:
+                self._last_warning = now
+                logger.warning(f"Control plane unreachable at {self.path}: {e}")
+            return False
+        self.sent += 1
+        return True
+
+    def send_result(self, device_id: int, should_close: bool) -> bool:
+        return self._send(KIND_RESULT, device_id, int(should_close))
+
+    def send_option(self, opt_val, device_id: Optional[int] = None) -> bool:
+        return self._send(KIND_OPTION, device_id, encode_option(opt_val))
+
+    def send_system_active(self, active: bool) -> bool:
+        return self._send(KIND_SYSTEM_ACTIVE, None, int(active))
+
+    def stats(self) -> Dict[str, Any]:
+        return {"path": self.path, "sent": self.sent, "dropped": self.dropped}
+
+
+class ControlChannelServer(threading.Thread):
+    """컨트롤 플레인 프로세스에서 명령을 받아 BollardCommandQueue/서비서에 반영"""
+
+    def __init__(self, path: str):
+        super().__init__(name="bollard-control-channel", daemon=True)
+        self.path = path
+        if os.path.exists(path):
+            os.unlink(path)
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._sock.bind(path)
+        self._running = True
+        self.received = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    def run(self) -> None:
+        from bollard.utils.grpc_client import BollardCommandQueue, get_grpc_servicer
+
+        command_queue = BollardCommandQueue()
+        servicer = get_grpc_servicer()
+
+        while self._running:
+            try:
+                data = self._sock.recv(MESSAGE.size)
+            except OSError:
+                break
+            if len(data) != MESSAGE.size:
+                continue
+
+            kind, device_id, value, sent_at = MESSAGE.unpack(data)
+            received_at = time.time()
+            if device_id == ALL_DEVICES:
+                device_id = None
+
+            if kind == KIND_RESULT:
+                # 워커의 전송 시각부터 Require 스트림 전송까지를 지연으로 집계
+                command_queue.apply_result(
+                    bool(value),
+                    device_id,
+                    changed_at=time.monotonic() - (received_at - sent_at),
+                )
+            elif kind == KIND_OPTION:
+                command_queue.deliver_option(decode_option(value), device_id)
+            elif kind == KIND_SYSTEM_ACTIVE:
+                servicer.set_system_active(bool(value))
+            else:
+                continue
+
+            latency = received_at - sent_at
+            self.received += 1
+            self.latency_total += latency
+            self.latency_max = max(self.latency_max, latency)
+
+    def stop(self) -> None:
+        self._running = False
+        self._sock.close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    def stats(self) -> Dict[str, Any]:
+        avg = self.latency_total / self.received if self.received else 0.0
+        return {
+            "path": self.path,
+            "received": self.received,
+            "latency_avg_ms": avg * 1e3,
+            "latency_max_ms": self.latency_max * 1e3,
+        }
+
+
+_client: Optional[ControlChannelClient] = None
+_server: Optional[ControlChannelServer] = None
+_lock = threading.Lock()
+
+
+def use_control_plane() -> bool:
+    return getattr(settings, "BOLLARD_CONTROL_PLANE", False)
+
+
+def get_control_client() -> Optional[ControlChannelClient]:
+    """
+    명령을 컨트롤 플레인으로 보내야 하는 프로세스면 클라이언트, 아니면 None
+
+    컨트롤 플레인을 쓰지 않거나, 이 프로세스가 컨트롤 플레인이면 None입니다.
+    """
+    global _client
+    if _server is not None or not use_control_plane():
+        return None
+    if _client is None:
+        with _lock:
+            if _client is None:
+                _client = ControlChannelClient(get_socket_path())
+    return _client
+
+
+def start_control_server(path: Optional[str] = None) -> ControlChannelServer:
+    global _server
+    with _lock:
+        if _server is None:
+            _server = ControlChannelServer(path or get_socket_path())
+            _server.start()
+            logger.info(f"Control channel listening on {_server.path}")
+    return _server
+
+
+def stop_control_server() -> None:
+    global _server
+    with _lock:
+        if _server is not None:
+            _server.stop()
+            _server = None
+
+
+def get_control_stats() -> Optional[Dict[str, Any]]:
+    if _server is not None:
+        return _server.stats()
+    if _client is not None:
+        return _client.stats()
+    return None
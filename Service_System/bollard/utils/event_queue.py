@@ -0,0 +1,162 @@
+"""
+볼라드 이벤트 비동기 처리 큐
+
+블로그 포스트 생성(이미지 디코딩/저장, post.save, post.publish)과 DetectionLog 기록을
+요청 경로에서 분리하여 백그라운드 워커 스레드에서 처리합니다.
+
+- 큐 크기가 제한되어 있어 가득 차면 submit_timeout 동안만 대기하고 작업을 버립니다.
+- 제출/처리/실패/버림 횟수와 현재 큐 길이를 stats()로 확인할 수 있습니다.
+- 프로세스 종료 시 남은 작업을 처리한 뒤 워커를 정지합니다.
+"""
+
+import atexit
+import logging
+import queue
+import threading
+from typing import Any, Callable, Dict
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 1
+DEFAULT_QUEUE_SIZE = 100
+DEFAULT_SUBMIT_TIMEOUT = 0.05
+DEFAULT_SHUTDOWN_TIMEOUT = 10.0
+
+_STOP = object()
+
+
+class BollardEventQueue:
+    def __init__(
+        self,
+        workers: int = DEFAULT_WORKERS,
+        maxsize: int = DEFAULT_QUEUE_SIZE,
+        submit_timeout: float = DEFAULT_SUBMIT_TIMEOUT,
+    ):
+        self.workers = max(1, workers)
+        self.submit_timeout = submit_timeout
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._threads = []
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._started = False
+        self._closed = False
+        self.submitted = 0
+        self.processed = 0
+        self.failed = 0
+        self.dropped = 0
+
+    def start(self) -> None:
+        with self._lock:
+            if self._started:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(
+                    target=self._worker, name=f"bollard-event-{i}", daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+            self._started = True
+            atexit.register(self.shutdown)
+
+    def submit(self, func: Callable, *args, **kwargs) -> bool:
+        """작업을 큐에 넣음. 큐가 가득 차 버려지면 False 반환"""
+        if self._closed:
+            self._count("dropped")
+            return False
+
+        self.start()
+        try:
+            self._queue.put((func, args, kwargs), timeout=self.submit_timeout)
+        except queue.Full:
+            self._count("dropped")
+            logger.warning(f"Bollard event queue full, dropped {func.__name__}")
+            return False
+
+        self._count("submitted")
+        return True
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def _worker(self) -> None:
+        try:
+            while True:
+                item = self._queue.get()
+                if item is _STOP:
+                    self._queue.task_done()
+                    break
+
+                func, args, kwargs = item
+                close_old_connections()
+                try:
+                    func(*args, **kwargs)
+                    self._count("processed")
+                except Exception as e:
+                    self._count("failed")
+                    logger.error(f"Bollard event job {func.__name__} failed: {e}")
+                finally:
+                    self._queue.task_done()
+        finally:
+            connection.close()
+
+    def shutdown(self, timeout: float = DEFAULT_SHUTDOWN_TIMEOUT) -> None:
+        """남은 작업을 모두 처리한 뒤 워커 정지"""
+        with self._lock:
+            if not self._started or self._closed:
+                return
+            self._closed = True
+
+        for _ in self._threads:
+            self._queue.put(_STOP)
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+
+        remaining = self._queue.qsize()
+        if remaining:
+            logger.warning(f"Bollard event queue stopped with {remaining} pending jobs")
+        else:
+            logger.info("Bollard event queue flushed")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "queue_size": self._queue.qsize(),
+            "queue_capacity": self._queue.maxsize,
+            "submitted": self.submitted,
+            "processed": self.processed,
+            "failed": self.failed,
+            "dropped": self.dropped,
+        }
+
+
+_event_queue = None
+_event_queue_lock = threading.Lock()
+
+
+def get_event_queue() -> BollardEventQueue:
+    global _event_queue
+    if _event_queue is None:
+        with _event_queue_lock:
+            if _event_queue is None:
+                _event_queue = BollardEventQueue(
+                    workers=getattr(settings, "BOLLARD_EVENT_WORKERS", DEFAULT_WORKERS),
+                    maxsize=getattr(
+                        settings, "BOLLARD_EVENT_QUEUE_SIZE", DEFAULT_QUEUE_SIZE
+                    ),
+                    submit_timeout=getattr(
+                        settings, "BOLLARD_EVENT_SUBMIT_TIMEOUT", DEFAULT_SUBMIT_TIMEOUT
+                    ),
+                )
+    return _event_queue
+
+
+def submit_event(func: Callable, *args, **kwargs) -> bool:
+    """BOLLARD_EVENT_ASYNC가 꺼져 있으면 요청 스레드에서 바로 실행"""
+    if not getattr(settings, "BOLLARD_EVENT_ASYNC", True):
+        func(*args, **kwargs)
+        return True
+    return get_event_queue().submit(func, *args, **kwargs)
@@ -0,0 +1,87 @@
+"""
+볼라드 검출 결과 바이너리 전송 포맷
+
+JSON + base64 대신 사용하는 압축 포맷입니다. (Content-Type: application/x-bollard-frame)
+
+레이아웃 (little endian):
+    header      magic "BLD1", image_width(uint32), image_height(uint32),
+                timestamp(float64, epoch 초, 0이면 서버 시간), detection 수(uint32),
+                JPEG 길이(uint32)
+    detections  detection 수 x float32[6] = x1, y1, x2, y2, confidence, class_id
+    image       JPEG 원본 바이트 (base64 인코딩 없음)
+"""
+
+import struct
+from datetime import datetime, timezone as dt_timezone
+from typing import Any, Dict, List, Optional, Sequence
+
+MEDIA_TYPE = "application/x-bollard-frame"
+MAGIC = b"BLD1"
+
+HEADER = struct.Struct("<4sIIdII")
+BOX = struct.Struct("<6f")
+
+
+class FrameDecodeError(ValueError):
+    pass
+
+
+def encode_frame(
+    detections: Sequence[Dict[str, Any]],
+    image_width: int,
+    image_height: int,
+    image: bytes = b"",
+    timestamp: Optional[float] = None,
+) -> bytes:
+    boxes = b"".join(
+        BOX.pack(*det["bbox"][:4], det.get("confidence", 0.0), det["class_id"])
+        for det in detections
+    )
+    header = HEADER.pack(
+        MAGIC,
+        image_width,
+        image_height,
+        timestamp or 0.0,
+        len(detections),
+        len(image),
+    )
+    return header + boxes + image
+
+
+def decode_frame(data: bytes) -> Dict[str, Any]:
+    """DetectionResultSerializer.validated_data와 같은 형태의 dict 반환"""
+    if len(data) < HEADER.size:
+        raise FrameDecodeError("Frame is shorter than its header")
+
+    magic, width, height, timestamp, count, image_len = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise FrameDecodeError("Unknown frame format")
+
+    boxes_end = HEADER.size + count * BOX.size
+    if len(data) != boxes_end + image_len:
+        raise FrameDecodeError("Frame length does not match its header")
+
+    detections: List[Dict[str, Any]] = []
+    for x1, y1, x2, y2, confidence, class_id in BOX.iter_unpack(
+        data[HEADER.size : boxes_end]
+    ):
+        detections.append(
+            {
+                "class_id": int(class_id),
+                "confidence": confidence,
+                "bbox": [x1, y1, x2, y2],
+            }
+        )
+
+    frame = {
+        "image_width": width,
+        "image_height": height,
+        "detections": detections,
+        "image_data": data[boxes_end:] if image_len else None,
+    }
+    if timestamp:
+        try:
+            frame["timestamp"] = datetime.fromtimestamp(timestamp, tz=dt_timezone.utc)
+        except (ValueError, OverflowError, OSError):
+            raise FrameDecodeError("Frame timestamp is not a valid time")
+    return frame
@@ -0,0 +1,273 @@
+"""
+asyncio 기반 볼라드 gRPC 서버 (grpc.aio)
+
+스트림마다 스레드를 점유하는 ThreadPoolExecutor 서버와 달리 하나의 이벤트 루프
+스레드에서 모든 Require/Option 스트림을 처리합니다.
+
+Django 뷰는 기존과 같이 BollardCommandQueue에 결과/옵션을 넣고, 큐의 리스너가
+call_soon_threadsafe로 이벤트 루프에 전달하여 스트림별 asyncio 큐를 채웁니다.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Optional, Set
+
+import grpc
+
+from bollard.grpc_proto.result_pb2 import OptVal, Res
+from bollard.utils.grpc_client import (
+    DEFAULT_KEEPALIVE_INTERVAL,
+    BollardCommandQueue,
+    StreamMetrics,
+    get_device_id,
+)
+from bollard.utils.ingest import authenticate, end_stream, process_frame
+from bollard.utils.ingest import metrics as ingest_metrics
+from bollard.utils.state_board import start_board_watcher
+
+logger = logging.getLogger(__name__)
+
+# Option 스트림별 대기 옵션 수 (가득 차면 가장 오래된 옵션을 버림)
+OPTION_QUEUE_SIZE = 16
+
+
+class AsyncBollardServicer:
+    def __init__(self, keepalive_interval: float = DEFAULT_KEEPALIVE_INTERVAL):
+        self.command_queue = BollardCommandQueue()
+        self.keepalive_interval = keepalive_interval
+        self.metrics = StreamMetrics()
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._system_active = False
+        self._system_event: Optional[asyncio.Event] = None
+        # 볼라드 ID별 구독 스트림 큐 (발행 비용은 해당 볼라드의 구독자 수에만 비례)
+        # 연결된 Option 스트림의 큐만 유지 (연결되지 않은 볼라드로 가는 옵션은 버림)
+        self._result_queues: Dict[int, Set[asyncio.Queue]] = defaultdict(set)
+        self._option_queues: Dict[int, Set[asyncio.Queue]] = defaultdict(set)
+
+    def bind_loop(self, loop: asyncio.AbstractEventLoop) -> None:
+        # 이벤트 루프 스레드에서 호출
+        self._loop = loop
+        self._system_event = asyncio.Event()
+        if self._system_active:
+            self._system_event.set()
+        self.command_queue.add_listener(self)
+
+    def _call_in_loop(self, func, *args) -> None:
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(func, *args)
+
+    # BollardCommandQueue 리스너 (임의의 스레드에서 호출)
+    def on_result(self, device_id: int, should_close: bool, changed_at: float) -> None:
+        self._call_in_loop(self._publish_result, device_id, should_close, changed_at)
+
+    def on_option(self, device_id: Optional[int], opt_val: OptVal) -> None:
+        self._call_in_loop(self._publish_option, device_id, opt_val)
+
+    def set_system_active(self, active: bool) -> None:
+        self._system_active = active
+        self._call_in_loop(self._apply_system_active, active)
+
+    def is_system_active(self) -> bool:
+        return self._system_active
+
+    # 이하 이벤트 루프 스레드 전용
+    def _apply_system_active(self, active: bool) -> None:
+        if active:
+            self._system_event.set()
+        else:
+            self._system_event.clear()
+            # 대기 중인 Require 스트림이 종료 조건을 확인하도록 깨움
+            for result_queues in self._result_queues.values():
+                for result_queue in result_queues:
+                    self._offer(result_queue, None)
+
+    def _publish_result(
+        self, device_id: int, should_close: bool, changed_at: float
+    ) -> None:
+        # 같은 튜플 객체를 모든 구독 스트림이 공유
+        item = (should_close, changed_at)
+        for result_queue in self._result_queues.get(device_id, ()):
+            self._offer(result_queue, item)
+
+    def _publish_option(self, device_id: Optional[int], opt_val: OptVal) -> None:
+        if device_id is None:
+            # 브로드캐스트: 현재 연결된 모든 Option 스트림
+            subscribers = list(self._option_queues.values())
+        else:
+            subscribers = [self._option_queues.get(device_id, ())]
+        for option_queues in subscribers:
+            for option_queue in option_queues:
+                self._offer(option_queue, opt_val)
+
+    @staticmethod
+    def _offer(result_queue: asyncio.Queue, item) -> None:
+        # 가득 차면 가장 오래된 값을 버림 (느린 스트림이 지난 상태를 쌓아두지 않도록)
+        if result_queue.full():
+            result_queue.get_nowait()
+        result_queue.put_nowait(item)
+
+    async def Require(self, request, context):
+        device_id = get_device_id(request, context)
+        logger.info(f"Raspberry Pi {device_id} connected to Require stream")
+
+        result_queue = asyncio.Queue(maxsize=1)
+        self._result_queues[device_id].add(result_queue)
+        keepalive = self.keepalive_interval or None
+
+        try:
+            should_close = self.command_queue.get_current_result(device_id)
+            yield Res(response=should_close)
+            self.metrics.record_keepalive()
+
+            while self._system_event.is_set():
+                try:
+                    item = await asyncio.wait_for(result_queue.get(), timeout=keepalive)
+                except asyncio.TimeoutError:
+                    yield Res(response=should_close)
+                    self.metrics.record_keepalive()
+                    continue
+
+                if item is None or not self._system_event.is_set():
+                    break
+
+                should_close, changed_at = item
+                yield Res(response=should_close)
+                self.metrics.record_change(time.monotonic() - changed_at)
+        finally:
+            subscribers = self._result_queues[device_id]
+            subscribers.discard(result_queue)
+            if not subscribers:
+                del self._result_queues[device_id]
+            logger.info(f"Require stream for {device_id} ended")
+
+    async def Option(self, request, context):
+        device_id = get_device_id(request, context)
+        logger.info(f"Raspberry Pi {device_id} connected to Option stream")
+        option_queue = asyncio.Queue(maxsize=OPTION_QUEUE_SIZE)
+        self._option_queues[device_id].add(option_queue)
+
+        try:
+            while not self._system_event.is_set():
+                opt_val = await option_queue.get()
+                yield opt_val
+
+                if opt_val.letsgo_flag and opt_val.letsgo:
+                    self.set_system_active(True)
+                    break
+        finally:
+            subscribers = self._option_queues[device_id]
+            subscribers.discard(option_queue)
+            if not subscribers:
+                del self._option_queues[device_id]
+            logger.info("Option stream ended")
+
+    async def Ingest(self, request_iterator, context):
+        # 분석기/인증은 DB를 사용하므로 이벤트 루프 밖(기본 executor)에서 실행
+        if not await asyncio.to_thread(authenticate, context):
+            ingest_metrics.record_rejected()
+            await context.abort(grpc.StatusCode.UNAUTHENTICATED, "Invalid token")
+
+        ingest_metrics.stream_opened()
+        logger.info("Edge connected to Ingest stream")
+        bollard_ids = set()
+        try:
+            async for frame in request_iterator:
+                bollard_ids.add(frame.bollard_id)
+                yield await asyncio.to_thread(process_frame, frame)
+        finally:
+            ingest_metrics.stream_closed()
+            end_stream(bollard_ids)
+            logger.info("Ingest stream ended")
+
+
+_aio_servicer: Optional[AsyncBollardServicer] = None
+_aio_server = None
+_aio_loop: Optional[asyncio.AbstractEventLoop] = None
+_aio_lock = threading.Lock()
+
+
+def get_async_servicer() -> AsyncBollardServicer:
+    global _aio_servicer
+    if _aio_servicer is None:
+        from django.conf import settings
+
+        _aio_servicer = AsyncBollardServicer(
+            keepalive_interval=getattr(
+                settings, "BOLLARD_GRPC_KEEPALIVE", DEFAULT_KEEPALIVE_INTERVAL
+            )
+        )
+    return _aio_servicer
+
+
+def start_aio_grpc_server(port: int = 50051) -> bool:
+    """전용 이벤트 루프 스레드에서 grpc.aio 서버 시작"""
+    global _aio_server, _aio_loop
+
+    with _aio_lock:
+        if _aio_server is not None:
+            logger.warning("gRPC aio server already running")
+            return False
+
+        from bollard.grpc_proto.result_pb2_grpc import add_ResultServicer_to_server
+
+        servicer = get_async_servicer()
+        loop = asyncio.new_event_loop()
+        started = threading.Event()
+        errors = []
+
+        async def serve():
+            global _aio_server
+            servicer.bind_loop(loop)
+            server = grpc.aio.server()
+            add_ResultServicer_to_server(servicer, server)
+            server.add_insecure_port(f"[::]:{port}")
+            await server.start()
+            _aio_server = server
+
+        def run():
+            asyncio.set_event_loop(loop)
+            try:
+                loop.run_until_complete(serve())
+            except Exception as e:
+                errors.append(e)
+                loop.close()
+                return
+            finally:
+                started.set()
+
+            # stop_aio_grpc_server()가 loop.stop()을 호출할 때까지 실행
+            try:
+                loop.run_forever()
+            finally:
+                loop.close()
+
+        threading.Thread(target=run, name="bollard-grpc-aio", daemon=True).start()
+        started.wait()
+
+        if errors:
+            logger.error(f"Failed to start gRPC aio server: {errors[0]}")
+            return False
+
+        _aio_loop = loop
+        start_board_watcher()
+        logger.info(f"gRPC aio server started on port {port}")
+        return True
+
+
+def stop_aio_grpc_server(grace: float = 5) -> None:
+    global _aio_server, _aio_loop
+
+    with _aio_lock:
+        if _aio_server is None:
+            return
+        future = asyncio.run_coroutine_threadsafe(_aio_server.stop(grace), _aio_loop)
+        future.result(timeout=grace + 1)
+        _aio_loop.call_soon_threadsafe(_aio_loop.stop)
+        _aio_server = None
+        _aio_loop = None
+        logger.info("gRPC aio server stopped")
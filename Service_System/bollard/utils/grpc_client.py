@@ -1,14 +1,80 @@
 import grpc
 import logging
 import threading
+import time
 import queue
-from typing import Optional
+from collections import deque
+from typing import Any, Dict, Optional, Tuple
 from concurrent import futures
 
+from django.conf import settings
+
 from bollard.grpc_proto.result_pb2 import Req, Res, OptVal
+from bollard.utils.control_channel import get_control_client
+from bollard.utils.state_board import get_state_board, start_board_watcher
 
 logger = logging.getLogger(__name__)
 
+# 상태 변화가 없을 때 Require 스트림으로 보내는 keepalive 간격 (초, 0이면 보내지 않음)
+DEFAULT_KEEPALIVE_INTERVAL = 5.0
+# keepalive를 끈 경우 스트림/시스템 상태를 다시 확인하는 간격 (초)
+IDLE_CHECK_INTERVAL = 1.0
+
+# 볼라드 ID를 보내지 않는 기존 라즈베리파이(Req.request = 0)가 사용하는 ID
+DEFAULT_DEVICE_ID = 0
+# 볼라드 ID를 전달하는 gRPC 메타데이터 키 (없으면 Req.request 사용)
+DEVICE_METADATA_KEY = "bollard-id"
+
+
+class StreamMetrics:
+    """Require 스트림 전송 통계 (메시지 수, 상태 변경 -> 전송 지연)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sent_times = deque(maxlen=10000)
+        self.changes_sent = 0
+        self.keepalives_sent = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    def record_change(self, latency: float):
+        with self._lock:
+            self._sent_times.append(time.monotonic())
+            self.changes_sent += 1
+            self.latency_total += latency
+            self.latency_max = max(self.latency_max, latency)
+
+    def record_keepalive(self):
+        with self._lock:
+            self._sent_times.append(time.monotonic())
+            self.keepalives_sent += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            cutoff = time.monotonic() - 60
+            per_minute = sum(1 for t in self._sent_times if t >= cutoff)
+            avg = self.latency_total / self.changes_sent if self.changes_sent else 0.0
+            return {
+                "changes_sent": self.changes_sent,
+                "keepalives_sent": self.keepalives_sent,
+                "messages_per_minute": per_minute,
+                "latency_avg_ms": avg * 1e3,
+                "latency_max_ms": self.latency_max * 1e3,
+            }
+
+
+class DeviceChannel:
+    """볼라드 한 대의 결과 상태와 옵션 큐"""
+
+    def __init__(self, device_id: int):
+        self.device_id = device_id
+        self.cond = threading.Condition()
+        self.current_result = False
+        self.version = 0
+        self.changed_at = time.monotonic()
+        self.wake_seq = 0
+        self.option_queue = queue.Queue()
+
 
 class BollardCommandQueue:
     _instance = None
@@ -19,62 +85,209 @@ class BollardCommandQueue:
             with cls._lock:
                 if cls._instance is None:
                     cls._instance = super().__new__(cls)
-                    cls._instance._result_queue = queue.Queue()
-                    cls._instance._option_queue = queue.Queue()
-                    cls._instance._current_result = False
+                    cls._instance._devices = {
+                        DEFAULT_DEVICE_ID: DeviceChannel(DEFAULT_DEVICE_ID)
+                    }
+                    cls._instance._devices_lock = threading.Lock()
+                    cls._instance._listeners = []
         return cls._instance
 
-    def put_result(self, should_close: bool):
-        self._current_result = should_close
-
-    def get_current_result(self) -> bool:
-        return self._current_result
-
-    def put_option(self, opt_val: OptVal):
-        try:
-            self._option_queue.put_nowait(opt_val)
-        except queue.Full:
-            pass
-
-    def get_option(self, timeout: float = 1.0) -> Optional[OptVal]:
+    def channel(self, device_id: int = DEFAULT_DEVICE_ID) -> DeviceChannel:
+        channel = self._devices.get(device_id)
+        if channel is None:
+            with self._devices_lock:
+                channel = self._devices.get(device_id)
+                if channel is None:
+                    channel = self._devices[device_id] = DeviceChannel(device_id)
+        return channel
+
+    def device_ids(self):
+        return list(self._devices)
+
+    def add_listener(self, listener):
+        """결과/옵션 변경을 전달받을 리스너 등록 (on_result, on_option 구현)"""
+        with self._devices_lock:
+            if listener not in self._listeners:
+                self._listeners.append(listener)
+
+    def put_result(self, should_close: bool, device_id: int = DEFAULT_DEVICE_ID):
+        # 컨트롤 플레인 채널 또는 공유 상태 보드로 gRPC 서버 프로세스에도 전달
+        client = get_control_client()
+        if client is not None:
+            client.send_result(device_id, should_close)
+        else:
+            board = get_state_board()
+            if board is not None:
+                board.put_result(device_id, should_close)
+        self.apply_result(should_close, device_id)
+
+    def apply_result(
+        self,
+        should_close: bool,
+        device_id: int = DEFAULT_DEVICE_ID,
+        changed_at: Optional[float] = None,
+    ):
+        """이 프로세스의 채널/리스너에만 결과 반영"""
+        channel = self.channel(device_id)
+        with channel.cond:
+            if should_close == channel.current_result:
+                return
+            channel.current_result = should_close
+            channel.version += 1
+            if changed_at is None:
+                changed_at = time.monotonic()
+            channel.changed_at = changed_at
+            channel.cond.notify_all()
+
+        for listener in list(self._listeners):
+            listener.on_result(device_id, should_close, changed_at)
+
+    def get_current_result(self, device_id: int = DEFAULT_DEVICE_ID) -> bool:
+        return self.channel(device_id).current_result
+
+    def get_result_snapshot(
+        self, device_id: int = DEFAULT_DEVICE_ID
+    ) -> Tuple[int, bool, float]:
+        channel = self.channel(device_id)
+        with channel.cond:
+            return (channel.version, channel.current_result, channel.changed_at)
+
+    def wait_for_result(
+        self,
+        version: int,
+        timeout: Optional[float],
+        device_id: int = DEFAULT_DEVICE_ID,
+    ) -> Tuple[int, bool, float]:
+        """결과가 version 이후로 바뀌거나 timeout이 지날 때까지 대기"""
+        channel = self.channel(device_id)
+        with channel.cond:
+            wake_seq = channel.wake_seq
+            channel.cond.wait_for(
+                lambda: channel.version != version or channel.wake_seq != wake_seq,
+                timeout=timeout,
+            )
+            return (channel.version, channel.current_result, channel.changed_at)
+
+    def wake_result_waiters(self, device_id: Optional[int] = None):
+        # 스트림 종료/시스템 정지 시 대기 중인 Require 스트림을 깨움
+        if device_id is None:
+            channels = list(self._devices.values())
+        else:
+            channels = [self.channel(device_id)]
+        for channel in channels:
+            with channel.cond:
+                channel.wake_seq += 1
+                channel.cond.notify_all()
+
+    def put_option(self, opt_val: OptVal, device_id: Optional[int] = None):
+        """device_id가 None이면 모든 볼라드에 같은 OptVal 객체를 전달 (복사 없음)"""
+        client = get_control_client()
+        if client is not None:
+            client.send_option(opt_val, device_id)
+            return
+        board = get_state_board()
+        if board is not None:
+            board.put_option(opt_val, device_id)
+        self.deliver_option(opt_val, device_id)
+
+    def deliver_option(self, opt_val: OptVal, device_id: Optional[int] = None):
+        """이 프로세스의 옵션 큐/리스너에만 옵션 전달"""
+        # 리스너(asyncio 서버)가 있으면 옵션 큐 대신 리스너로 전달
+        listeners = list(self._listeners)
+        if listeners:
+            for listener in listeners:
+                listener.on_option(device_id, opt_val)
+            return
+
+        if device_id is None:
+            channels = list(self._devices.values())
+        else:
+            channels = [self.channel(device_id)]
+        for channel in channels:
+            try:
+                channel.option_queue.put_nowait(opt_val)
+            except queue.Full:
+                pass
+
+    def get_option(
+        self, timeout: float = 1.0, device_id: int = DEFAULT_DEVICE_ID
+    ) -> Optional[OptVal]:
         try:
-            return self._option_queue.get(timeout=timeout)
+            return self.channel(device_id).option_queue.get(timeout=timeout)
         except queue.Empty:
             return None
 
 
+def get_device_id(request, context) -> int:
+    """메타데이터 bollard-id, 없으면 Req.request 값을 볼라드 ID로 사용"""
+    for key, value in context.invocation_metadata() or ():
+        if key == DEVICE_METADATA_KEY:
+            try:
+                return int(value)
+            except ValueError:
+                break
+    return request.request
+
+
 class BollardGrpcServicer:
-    def __init__(self):
+    def __init__(self, keepalive_interval: Optional[float] = None):
         self.command_queue = BollardCommandQueue()
         self._system_active = threading.Event()
+        if keepalive_interval is None:
+            keepalive_interval = getattr(
+                settings, "BOLLARD_GRPC_KEEPALIVE", DEFAULT_KEEPALIVE_INTERVAL
+            )
+        self.keepalive_interval = keepalive_interval
+        self.metrics = StreamMetrics()
 
     def set_system_active(self, active: bool):
         if active:
             self._system_active.set()
         else:
             self._system_active.clear()
+        self.command_queue.wake_result_waiters()
 
     def is_system_active(self) -> bool:
         return self._system_active.is_set()
 
     def Require(self, request, context):
-        logger.info("Raspberry Pi connected to Require stream")
+        device_id = get_device_id(request, context)
+        logger.info(f"Raspberry Pi {device_id} connected to Require stream")
 
-        while context.is_active() and self._system_active.is_set():
-            should_close = self.command_queue.get_current_result()
-            yield Res(response=should_close)
+        command_queue = self.command_queue
+        context.add_callback(lambda: command_queue.wake_result_waiters(device_id))
 
-            import time
+        # 연결 직후 현재 상태를 한 번 전송하고, 이후에는 상태 변경 시에만 전송
+        version, should_close, _ = command_queue.get_result_snapshot(device_id)
+        yield Res(response=should_close)
+        self.metrics.record_keepalive()
 
-            time.sleep(0.1)
+        keepalive = self.keepalive_interval
+        wait_timeout = keepalive if keepalive > 0 else IDLE_CHECK_INTERVAL
 
-        logger.info("Require stream ended")
+        while context.is_active() and self._system_active.is_set():
+            new_version, should_close, changed_at = command_queue.wait_for_result(
+                version, timeout=wait_timeout, device_id=device_id
+            )
+            if not (context.is_active() and self._system_active.is_set()):
+                break
+
+            if new_version != version:
+                version = new_version
+                yield Res(response=should_close)
+                self.metrics.record_change(time.monotonic() - changed_at)
+            elif keepalive > 0:
+                yield Res(response=should_close)
+                self.metrics.record_keepalive()
+
+        logger.info(f"Require stream for {device_id} ended")
 
     def Option(self, request, context):
-        logger.info("Raspberry Pi connected to Option stream")
+        device_id = get_device_id(request, context)
+        logger.info(f"Raspberry Pi {device_id} connected to Option stream")
 
         while context.is_active() and not self._system_active.is_set():
-            opt_val = self.command_queue.get_option(timeout=1.0)
+            opt_val = self.command_queue.get_option(timeout=1.0, device_id=device_id)
             if opt_val:
                 yield opt_val
 
@@ -84,14 +297,47 @@ class BollardGrpcServicer:
 
         logger.info("Option stream ended")
 
+    def Ingest(self, request_iterator, context):
+        from bollard.utils.ingest import (
+            authenticate,
+            end_stream,
+            metrics,
+            process_frame,
+        )
+
+        if not authenticate(context):
+            metrics.record_rejected()
+            context.abort(grpc.StatusCode.UNAUTHENTICATED, "Invalid token")
+
+        metrics.stream_opened()
+        logger.info("Edge connected to Ingest stream")
+        bollard_ids = set()
+        try:
+            for frame in request_iterator:
+                bollard_ids.add(frame.bollard_id)
+                yield process_frame(frame)
+        finally:
+            metrics.stream_closed()
+            end_stream(bollard_ids)
+            logger.info("Ingest stream ended")
+
 
 _grpc_servicer: Optional[BollardGrpcServicer] = None
 _grpc_server = None
 _grpc_lock = threading.Lock()
 
 
-def get_grpc_servicer() -> BollardGrpcServicer:
+def use_async_server() -> bool:
+    return getattr(settings, "BOLLARD_GRPC_ASYNC", False)
+
+
+def get_grpc_servicer():
     global _grpc_servicer
+    if use_async_server():
+        from bollard.utils.grpc_aio import get_async_servicer
+
+        return get_async_servicer()
+
     if _grpc_servicer is None:
         _grpc_servicer = BollardGrpcServicer()
     return _grpc_servicer
@@ -100,6 +346,11 @@ def get_grpc_servicer() -> BollardGrpcServicer:
 def start_grpc_server(port: int = 50051) -> bool:
     global _grpc_server, _grpc_servicer
 
+    if use_async_server():
+        from bollard.utils.grpc_aio import start_aio_grpc_server
+
+        return start_aio_grpc_server(port=port)
+
     with _grpc_lock:
         if _grpc_server is not None:
             logger.warning("gRPC server already running")
@@ -113,6 +364,7 @@ def start_grpc_server(port: int = 50051) -> bool:
             add_ResultServicer_to_server(_grpc_servicer, _grpc_server)
             _grpc_server.add_insecure_port(f"[::]:{port}")
             _grpc_server.start()
+            start_board_watcher()
 
             logger.info(f"gRPC server started on port {port}")
             return True
@@ -125,6 +377,12 @@ def start_grpc_server(port: int = 50051) -> bool:
 def stop_grpc_server():
     global _grpc_server
 
+    if use_async_server():
+        from bollard.utils.grpc_aio import stop_aio_grpc_server
+
+        stop_aio_grpc_server()
+        return
+
     with _grpc_lock:
         if _grpc_server:
             _grpc_server.stop(grace=5)
@@ -133,39 +391,49 @@ def stop_grpc_server():
 
 
 # 볼라드 제어 함수들 (Django 뷰에서 호출)
-def send_bollard_open():
-    servicer = get_grpc_servicer()
-    command_queue = BollardCommandQueue()
-
-    opt_val = OptVal(manual_flag=True, manual=True, letsgo_flag=False, letsgo=False)
-    command_queue.put_option(opt_val)
-    logger.info("Bollard OPEN command queued")
+# device_id가 None이면 모든 볼라드에 전달
+OPEN_COMMAND = OptVal(manual_flag=True, manual=True, letsgo_flag=False, letsgo=False)
+CLOSE_COMMAND = OptVal(manual_flag=True, manual=False, letsgo_flag=False, letsgo=False)
+AUTO_COMMAND = OptVal(manual_flag=False, manual=False, letsgo_flag=True, letsgo=True)
 
 
-def send_bollard_close():
-    servicer = get_grpc_servicer()
-    command_queue = BollardCommandQueue()
+def send_bollard_open(device_id: Optional[int] = None):
+    BollardCommandQueue().put_option(OPEN_COMMAND, device_id)
+    logger.info(
+        f"Bollard OPEN command queued for {'all' if device_id is None else device_id}"
+    )
 
-    opt_val = OptVal(manual_flag=True, manual=False, letsgo_flag=False, letsgo=False)
-    command_queue.put_option(opt_val)
-    logger.info("Bollard CLOSE command queued")
 
+def send_bollard_close(device_id: Optional[int] = None):
+    BollardCommandQueue().put_option(CLOSE_COMMAND, device_id)
+    logger.info(
+        f"Bollard CLOSE command queued for {'all' if device_id is None else device_id}"
+    )
 
-def send_auto_mode():
-    servicer = get_grpc_servicer()
-    command_queue = BollardCommandQueue()
 
-    opt_val = OptVal(manual_flag=False, manual=False, letsgo_flag=True, letsgo=True)
-    command_queue.put_option(opt_val)
-    servicer.set_system_active(True)
-    logger.info("Auto mode command queued")
+def send_auto_mode(device_id: Optional[int] = None):
+    BollardCommandQueue().put_option(AUTO_COMMAND, device_id)
+    set_system_active(True)
+    logger.info(
+        f"Auto mode command queued for {'all' if device_id is None else device_id}"
+    )
 
 
-def send_detection_result(should_close: bool):
-    command_queue = BollardCommandQueue()
-    command_queue.put_result(should_close)
+def send_detection_result(should_close: bool, device_id: int = DEFAULT_DEVICE_ID):
+    BollardCommandQueue().put_result(should_close, device_id)
 
 
 def set_system_active(active: bool):
     servicer = get_grpc_servicer()
     servicer.set_system_active(active)
+    client = get_control_client()
+    if client is not None:
+        client.send_system_active(active)
+        return
+    board = get_state_board()
+    if board is not None:
+        board.set_system_active(active)
+
+
+def get_stream_stats() -> Dict[str, Any]:
+    return get_grpc_servicer().metrics.stats()
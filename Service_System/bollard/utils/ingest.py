@@ -0,0 +1,231 @@
+"""
+gRPC Ingest 스트림 처리 (엣지 -> 서버 검출 결과)
+
+HTTP 검출 API(DetectionAPIView)와 같은 판단/기록을 하지만, 토큰 인증은 스트림을 열 때
+한 번만 하고 프레임마다 DRF 파싱/검증 없이 Frame 메시지를 바로 분석기로 넘깁니다.
+응답 Decision은 같은 스트림으로 돌려보내며 seq로 프레임과 짝을 맞춥니다.
+
+엣지는 gRPC 메타데이터 authorization: "Token <key>"로 인증합니다.
+
+볼라드 ID가 음수이거나 timestamp가 유효한 시각이 아닌 프레임은 스트림을 끊지 않고
+action "error" Decision으로 응답합니다. (HTTP API의 min_value=0 검증과 같은 규칙)
+
+프레임에는 보통 JPEG를 싣지 않습니다. 상태가 바뀐(action이 open/close인) 프레임에
+이미지가 없으면 이벤트 기록을 잠시 미뤄 두고, 엣지가 그 Decision을 받은 뒤 다음
+프레임에 붙여 보내는 이미지로 포스트를 만듭니다. IMAGE_WAIT초 안에 이미지가 오지
+않거나 스트림이 끝나면 이미지 없이 기록합니다.
+"""
+
+import logging
+import math
+import threading
+import time
+from datetime import datetime, timezone as dt_timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from django.utils import timezone
+
+from bollard.grpc_proto.result_pb2 import Decision, Frame
+from bollard.utils.analyzer import get_analyzer
+from bollard.utils.blog_integration import record_bollard_event
+from bollard.utils.event_queue import submit_event
+from bollard.utils.grpc_client import send_detection_result
+
+logger = logging.getLogger(__name__)
+
+AUTH_METADATA_KEY = "authorization"
+BOX_FIELDS = 6
+ACTION_ERROR = "error"
+# 상태 변경 프레임의 이미지를 기다리는 최대 시간 (초)
+IMAGE_WAIT = 2.0
+
+
+def authenticate(context) -> bool:
+    """메타데이터의 DRF 토큰이 활성 사용자 것인지 확인 (스트림당 한 번)"""
+    from rest_framework.authtoken.models import Token
+
+    for key, value in context.invocation_metadata() or ():
+        if key != AUTH_METADATA_KEY:
+            continue
+        keyword, _, token = value.partition(" ")
+        if keyword != "Token" or not token:
+            return False
+        try:
+            return Token.objects.select_related("user").get(key=token).user.is_active
+        except Token.DoesNotExist:
+            return False
+    return False
+
+
+def frame_detections(boxes: Sequence[float]) -> List[Dict[str, Any]]:
+    return [
+        {
+            "class_id": int(boxes[i + 5]),
+            "confidence": boxes[i + 4],
+            "bbox": boxes[i : i + 4],
+        }
+        for i in range(0, len(boxes) - BOX_FIELDS + 1, BOX_FIELDS)
+    ]
+
+
+class IngestMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.streams = 0
+        self.frames = 0
+        self.rejected = 0
+        self.invalid = 0
+        self.process_total = 0.0
+        self.process_max = 0.0
+
+    def stream_opened(self) -> None:
+        with self._lock:
+            self.streams += 1
+
+    def stream_closed(self) -> None:
+        with self._lock:
+            self.streams -= 1
+
+    def record_rejected(self) -> None:
+        with self._lock:
+            self.rejected += 1
+
+    def record_invalid(self) -> None:
+        with self._lock:
+            self.invalid += 1
+
+    def record(self, elapsed: float) -> None:
+        with self._lock:
+            self.frames += 1
+            self.process_total += elapsed
+            self.process_max = max(self.process_max, elapsed)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            avg = self.process_total / self.frames if self.frames else 0.0
+            return {
+                "streams": self.streams,
+                "frames": self.frames,
+                "rejected": self.rejected,
+                "invalid": self.invalid,
+                "process_avg_us": avg * 1e6,
+                "process_max_us": self.process_max * 1e6,
+            }
+
+
+metrics = IngestMetrics()
+
+
+class PendingEvents:
+    """이미지를 기다리는 상태 변경 이벤트 (볼라드당 최대 1개)"""
+
+    def __init__(self, wait: float = IMAGE_WAIT):
+        self.wait = wait
+        self._lock = threading.Lock()
+        self._events: Dict[int, Tuple[float, Dict[str, Any]]] = {}
+
+    def hold(self, bollard_id: int, event: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """event를 보류하고, 밀려난 이전 이벤트가 있으면 반환 (바로 기록할 것)"""
+        with self._lock:
+            previous = self._events.get(bollard_id)
+            self._events[bollard_id] = (time.monotonic() + self.wait, event)
+        return previous[1] if previous else None
+
+    def take(self, bollard_id: int, image: bytes) -> Optional[Dict[str, Any]]:
+        """이미지가 왔거나 기다릴 시간이 지났으면 보류 중인 이벤트를 꺼냄"""
+        with self._lock:
+            pending = self._events.get(bollard_id)
+            if pending is None or (not image and time.monotonic() < pending[0]):
+                return None
+            del self._events[bollard_id]
+        event = pending[1]
+        if image:
+            event["image_data"] = image
+        return event
+
+    def release(self, bollard_ids: Iterable[int]) -> List[Dict[str, Any]]:
+        """스트림이 끝날 때 해당 볼라드의 보류 이벤트를 모두 꺼냄 (이미지 없이 기록)"""
+        with self._lock:
+            return [
+                self._events.pop(bollard_id)[1]
+                for bollard_id in bollard_ids
+                if bollard_id in self._events
+            ]
+
+
+pending_events = PendingEvents()
+
+
+def frame_timestamp(frame: Frame) -> Optional[datetime]:
+    """Frame.timestamp (epoch 초, 0이면 None). 유효한 시각이 아니면 ValueError"""
+    if not frame.timestamp:
+        return None
+    if not math.isfinite(frame.timestamp):
+        raise ValueError("timestamp must be finite")
+    try:
+        return datetime.fromtimestamp(frame.timestamp, tz=dt_timezone.utc)
+    except (OverflowError, OSError) as e:
+        raise ValueError(f"timestamp out of range: {e}")
+
+
+def submit_frame_event(event: Dict[str, Any]) -> None:
+    submit_event(record_bollard_event, **event)
+
+
+def end_stream(bollard_ids: Iterable[int]) -> None:
+    """Ingest 스트림 종료 시 호출. 이미지를 기다리던 이벤트를 이미지 없이 기록"""
+    for event in pending_events.release(bollard_ids):
+        submit_frame_event(event)
+
+
+def process_frame(frame: Frame) -> Decision:
+    started = time.perf_counter()
+    try:
+        if frame.bollard_id < 0:
+            raise ValueError("bollard_id must be >= 0")
+        timestamp = frame_timestamp(frame)
+    except ValueError as e:
+        metrics.record_invalid()
+        logger.warning(f"Rejected ingest frame {frame.seq}: {e}")
+        return Decision(seq=frame.seq, action=ACTION_ERROR)
+
+    event = pending_events.take(frame.bollard_id, frame.image)
+    if event is not None:
+        submit_frame_event(event)
+
+    should_close, max_ratio, action = get_analyzer(frame.bollard_id).analyze(
+        detections=frame_detections(frame.boxes),
+        image_width=frame.image_width,
+        image_height=frame.image_height,
+        timestamp=timestamp,
+    )
+    send_detection_result(should_close, frame.bollard_id)
+
+    if action != "none":
+        event = dict(
+            bollard_id=frame.bollard_id,
+            image_base64=None,
+            image_data=frame.image or None,
+            action=action,
+            occupy_ratio=max_ratio,
+            detected=should_close,
+            timestamp=timestamp or timezone.now(),
+        )
+        if not frame.image:
+            # 엣지가 이 Decision을 받고 다음 프레임에 이미지를 붙여 보냄
+            event = pending_events.hold(frame.bollard_id, event)
+        if event is not None:
+            submit_frame_event(event)
+        logger.info(f"Bollard action: {action}, ratio: {max_ratio:.1f}%")
+
+    metrics.record(time.perf_counter() - started)
+    return Decision(
+        seq=frame.seq,
+        should_close=should_close,
+        occupy_ratio=max_ratio,
+        action=action,
+    )
+
+
+def get_ingest_stats() -> Dict[str, Any]:
+    return metrics.stats()
@@ -0,0 +1,281 @@
+"""
+대시보드/클라이언트용 실시간 이벤트 허브 (Server-Sent Events)
+
+분석기의 상태 전환과 새 DetectionLog를 발행하면, 모든 접속자가 하나의 이벤트 버퍼를
+공유하여 읽습니다. 이벤트는 발행 시 한 번만 SSE 메시지로 직렬화되며, 접속자 수와
+관계없이 DB 조회는 발생하지 않습니다.
+
+허브는 프로세스마다 하나이므로 워커를 여러 개 실행하면 BOLLARD_LIVE_RELAY를 켭니다.
+SSE 접속자가 있는 프로세스는 BOLLARD_LIVE_RELAY_DIR에 자기 pid의 Unix 데이터그램
+소켓을 열고, 이벤트를 발행한 프로세스는 디렉터리의 다른 소켓으로 이벤트를 한 번씩
+보냅니다. 이벤트 ID는 프로세스별 순번이므로 다른 워커로 재접속하면 버퍼 재전송 대신
+접속 시 보내는 현재 상태부터 다시 받습니다.
+
+SSE 접속 하나는 WSGI 스레드 하나를 응답이 끝날 때까지 점유하므로, 프로세스당 동시
+스트림은 BOLLARD_LIVE_MAX_STREAMS개로 제한합니다. 한도를 넘으면 stream()이 None을
+반환하고 뷰는 상태 조회 API를 폴링하도록 안내합니다.
+"""
+
+import json
+import logging
+import os
+import socket
+import threading
+from collections import deque
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HISTORY = 100
+# 변화가 없을 때 연결 유지를 위해 보내는 주석 간격 (초)
+DEFAULT_KEEPALIVE = 15.0
+DEFAULT_MAX_STREAMS = 20
+DEFAULT_RELAY_DIR = "/tmp/bollard_live"
+# 릴레이 데이터그램 최대 크기 (이벤트 종류 + 줄바꿈 + JSON)
+RELAY_MAX_SIZE = 65536
+
+
+class LiveSubscription:
+    """
+    stream()이 반환하는 SSE 접속 하나
+
+    StreamingHttpResponse가 응답을 닫을 때 close()를 호출하므로, 스트림을 한 번도
+    읽기 전에 연결이 끊겨도 접속 수가 반환됩니다.
+    """
+
+    def __init__(self, hub: "LiveEventHub", messages: Iterator[bytes]):
+        self._hub = hub
+        self._messages = messages
+        self._closed = False
+
+    def __iter__(self) -> Iterator[bytes]:
+        return self._messages
+
+    def close(self) -> None:
+        self._messages.close()
+        with self._hub._cond:
+            if not self._closed:
+                self._closed = True
+                self._hub.subscribers -= 1
+
+
+class LiveEventHub:
+    def __init__(
+        self, history: int = DEFAULT_HISTORY, max_streams: int = DEFAULT_MAX_STREAMS
+    ):
+        self._cond = threading.Condition()
+        self._events = deque(maxlen=history)
+        self._seq = 0
+        self.max_streams = max_streams
+        self.subscribers = 0
+        self.rejected = 0
+
+    def publish(self, event_type: str, data: Dict[str, Any]) -> None:
+        payload = json.dumps(data, cls=DjangoJSONEncoder, ensure_ascii=False)
+        self.append(event_type, payload)
+        relay = get_live_relay()
+        if relay is not None:
+            relay.send(event_type, payload)
+
+    def append(self, event_type: str, payload: str) -> None:
+        """직렬화된 이벤트를 버퍼에 추가 (다른 프로세스에서 릴레이된 이벤트 포함)"""
+        with self._cond:
+            self._seq += 1
+            message = f"id: {self._seq}\nevent: {event_type}\ndata: {payload}\n\n"
+            self._events.append((self._seq, message.encode("utf-8")))
+            self._cond.notify_all()
+
+    def stream(
+        self,
+        last_event_id: Optional[int] = None,
+        initial: Iterable[bytes] = (),
+        keepalive: float = DEFAULT_KEEPALIVE,
+    ) -> Optional[LiveSubscription]:
+        """
+        SSE 메시지 스트림 생성 (동시 스트림 한도를 넘으면 None)
+
+        last_event_id가 있으면 버퍼에 남아 있는 이후 이벤트부터 다시 보냄 (재접속).
+        initial은 스트림을 처음 읽을 때 평가되므로 한도 확인 뒤에 만들어집니다.
+        """
+        relay = get_live_relay()
+        if relay is not None:
+            try:
+                relay.listen()
+            except OSError as e:
+                logger.warning(f"Live event relay unavailable: {e}")
+
+        with self._cond:
+            if self.subscribers >= self.max_streams:
+                self.rejected += 1
+                return None
+            self.subscribers += 1
+            # 다른 워커가 준 ID는 이 프로세스의 순번과 관계없으므로 무시
+            if last_event_id is None or last_event_id > self._seq:
+                last_event_id = self._seq
+
+        return LiveSubscription(self, self._messages(last_event_id, initial, keepalive))
+
+    def _messages(
+        self, last_seq: int, initial: Iterable[bytes], keepalive: float
+    ) -> Iterator[bytes]:
+        yield b"retry: 3000\n\n"
+        for message in initial:
+            yield message
+
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._seq > last_seq, timeout=keepalive)
+                pending = [m for seq, m in self._events if seq > last_seq]
+                last_seq = self._seq
+
+            if not pending:
+                yield b": keepalive\n\n"
+            for message in pending:
+                yield message
+
+    def stats(self) -> Dict[str, Any]:
+        stats = {
+            "subscribers": self.subscribers,
+            "max_streams": self.max_streams,
+            "rejected": self.rejected,
+            "last_event_id": self._seq,
+        }
+        relay = get_live_relay()
+        if relay is not None:
+            stats["relay"] = relay.stats()
+        return stats
+
+
+class LiveEventRelay(threading.Thread):
+    """
+    다른 워커 프로세스의 허브와 이벤트를 주고받는 릴레이
+
+    수신 소켓은 이 프로세스에 SSE 접속자가 처음 생길 때 열며(listen), 송신은 항상
+    non-blocking이므로 수신 버퍼가 가득 찬 워커의 이벤트만 버려집니다 (dropped 통계).
+    종료된 프로세스가 남긴 소켓 파일은 송신 중 발견하면 지웁니다.
+    """
+
+    def __init__(self, hub: LiveEventHub, directory: str):
+        super().__init__(name="bollard-live-relay", daemon=True)
+        self.hub = hub
+        self.directory = directory
+        self.path = os.path.join(directory, f"{os.getpid()}.sock")
+        self._send_sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._send_sock.setblocking(False)
+        self._recv_sock: Optional[socket.socket] = None
+        self._listen_lock = threading.Lock()
+        self.sent = 0
+        self.dropped = 0
+        self.received = 0
+
+    def listen(self) -> None:
+        if self._recv_sock is not None:
+            return
+        with self._listen_lock:
+            if self._recv_sock is not None:
+                return
+            os.makedirs(self.directory, mode=0o700, exist_ok=True)
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            sock.bind(self.path)
+            self._recv_sock = sock
+            self.start()
+            logger.info(f"Live event relay listening on {self.path}")
+
+    def send(self, event_type: str, payload: str) -> None:
+        message = f"{event_type}\n{payload}".encode("utf-8")
+        if len(message) > RELAY_MAX_SIZE:
+            self.dropped += 1
+            return
+        try:
+            entries = list(os.scandir(self.directory))
+        except FileNotFoundError:
+            return
+        for entry in entries:
+            if entry.path == self.path or not entry.name.endswith(".sock"):
+                continue
+            try:
+                self._send_sock.sendto(message, entry.path)
+                self.sent += 1
+            except (ConnectionRefusedError, FileNotFoundError):
+                # 종료된 워커의 소켓
+                try:
+                    os.unlink(entry.path)
+                except OSError:
+                    pass
+            except OSError:
+                self.dropped += 1
+
+    def run(self) -> None:
+        while True:
+            try:
+                data = self._recv_sock.recv(RELAY_MAX_SIZE)
+            except OSError:
+                break
+            event_type, _, payload = data.decode("utf-8").partition("\n")
+            if not payload:
+                continue
+            self.received += 1
+            self.hub.append(event_type, payload)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "path": self.path if self._recv_sock is not None else None,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "received": self.received,
+        }
+
+
+def format_event(event_type: str, data: Dict[str, Any]) -> bytes:
+    """버퍼에 넣지 않는 1회성 SSE 메시지 (접속 시 현재 상태 전송용)"""
+    payload = json.dumps(data, cls=DjangoJSONEncoder, ensure_ascii=False)
+    return f"event: {event_type}\ndata: {payload}\n\n".encode("utf-8")
+
+
+_hub: Optional[LiveEventHub] = None
+_relay: Optional[LiveEventRelay] = None
+_lock = threading.Lock()
+
+
+def get_live_hub() -> LiveEventHub:
+    global _hub
+    if _hub is None:
+        with _lock:
+            if _hub is None:
+                _hub = LiveEventHub(
+                    max_streams=getattr(
+                        settings, "BOLLARD_LIVE_MAX_STREAMS", DEFAULT_MAX_STREAMS
+                    )
+                )
+    return _hub
+
+
+def get_live_relay() -> Optional[LiveEventRelay]:
+    """BOLLARD_LIVE_RELAY가 켜져 있으면 릴레이, 아니면 None"""
+    global _relay
+    if _relay is None and getattr(settings, "BOLLARD_LIVE_RELAY", False):
+        hub = get_live_hub()
+        with _lock:
+            if _relay is None:
+                _relay = LiveEventRelay(
+                    hub,
+                    getattr(settings, "BOLLARD_LIVE_RELAY_DIR", DEFAULT_RELAY_DIR),
+                )
+    return _relay
+
+
+def publish_state(state) -> None:
+    from bollard.serializers import BollardStateSerializer
+
+    get_live_hub().publish("state", BollardStateSerializer(state).data)
+
+
+def publish_log(log) -> None:
+    from bollard.serializers import DetectionLogSerializer
+
+    get_live_hub().publish("log", DetectionLogSerializer(log).data)
@@ -0,0 +1,200 @@
+"""
+점유율 집계(rollup) 버킷
+
+분석기는 프레임마다 RollupBuffer.add()로 분/시간/일 버킷에 프레임 수, 열림/닫힘
+횟수, 점유율 합계/최대값을 누적하고, 주기적으로 drain()한 버킷을 flush_rollups()로
+OccupancyRollup 행에 더합니다. (UPDATE ... SET frames = frames + n)
+
+여러 프로세스가 같은 버킷을 동시에 기록해도 증분 UPDATE와 unique 제약으로 값이
+합산됩니다.
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Dict, List, Tuple
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from bollard.models import OccupancyRollup
+
+logger = logging.getLogger(__name__)
+
+# 버킷 길이 (초). 일 버킷은 UTC가 아닌 현지 자정 기준으로 나눔
+PERIOD_SECONDS = {"minute": 60, "hour": 3600, "day": 86400}
+PERIODS = tuple(PERIOD_SECONDS)
+
+# 버킷 값: [frames, close_count, open_count, ratio_sum, ratio_max]
+BucketKey = Tuple[str, float]
+
+
+class RollupBuffer:
+    """볼라드 하나의 메모리 집계 버킷 (호출 측 lock 안에서 사용)"""
+
+    def __init__(self):
+        self._buckets: Dict[BucketKey, list] = {}
+        # 현재 일 버킷 [시작, 끝) epoch 캐시
+        self._day_start = 0.0
+        self._day_end = 0.0
+
+    def __len__(self):
+        return len(self._buckets)
+
+    def _day_bucket(self, epoch: float) -> float:
+        if not self._day_start <= epoch < self._day_end:
+            local = timezone.localtime(
+                datetime.fromtimestamp(epoch, tz=dt_timezone.utc)
+            )
+            midnight = local.replace(hour=0, minute=0, second=0, microsecond=0)
+            self._day_start = midnight.timestamp()
+            self._day_end = (midnight + timedelta(days=1)).timestamp()
+        return self._day_start
+
+    def add(self, epoch: float, ratio: float, action: str) -> None:
+        closed = action == "close"
+        opened = action == "open"
+        for period in PERIODS:
+            if period == "day":
+                start = self._day_bucket(epoch)
+            else:
+                seconds = PERIOD_SECONDS[period]
+                start = epoch - epoch % seconds
+            bucket = self._buckets.get((period, start))
+            if bucket is None:
+                self._buckets[(period, start)] = [
+                    1,
+                    int(closed),
+                    int(opened),
+                    ratio,
+                    ratio,
+                ]
+                continue
+            bucket[0] += 1
+            bucket[1] += closed
+            bucket[2] += opened
+            bucket[3] += ratio
+            if ratio > bucket[4]:
+                bucket[4] = ratio
+
+    def drain(self) -> Dict[BucketKey, list]:
+        buckets, self._buckets = self._buckets, {}
+        return buckets
+
+    def merge(self, buckets: Dict[BucketKey, list]) -> None:
+        """기록에 실패한 버킷을 되돌림"""
+        for key, values in buckets.items():
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                self._buckets[key] = values
+                continue
+            for i in range(4):
+                bucket[i] += values[i]
+            bucket[4] = max(bucket[4], values[4])
+
+
+def flush_rollups(bollard_id: int, buckets: Dict[BucketKey, list]) -> int:
+    """
+    버킷 값을 OccupancyRollup 행에 더함. 기록한 버킷 수 반환
+
+    모든 버킷을 한 트랜잭션으로 기록하므로, 실패하면 아무 버킷도 반영되지 않아
+    호출 측이 버킷 전체를 다시 merge()해도 중복 집계되지 않습니다.
+    """
+    with transaction.atomic():
+        for key, values in sorted(buckets.items()):
+            _add_bucket(bollard_id, key, values)
+    return len(buckets)
+
+
+def _add_bucket(bollard_id: int, key: BucketKey, values: list) -> None:
+    period, start = key
+    frames, closes, opens, ratio_sum, ratio_max = values
+    rows = OccupancyRollup.objects.filter(
+        bollard_id=bollard_id,
+        period=period,
+        bucket_start=datetime.fromtimestamp(start, tz=dt_timezone.utc),
+    )
+    increment = {
+        "frames": F("frames") + frames,
+        "close_count": F("close_count") + closes,
+        "open_count": F("open_count") + opens,
+        "ratio_sum": F("ratio_sum") + ratio_sum,
+        "ratio_max": Greatest(F("ratio_max"), Value(ratio_max)),
+    }
+    if rows.update(**increment):
+        return
+    try:
+        with transaction.atomic():
+            OccupancyRollup.objects.create(
+                bollard_id=bollard_id,
+                period=period,
+                bucket_start=datetime.fromtimestamp(start, tz=dt_timezone.utc),
+                frames=frames,
+                close_count=closes,
+                open_count=opens,
+                ratio_sum=ratio_sum,
+                ratio_max=ratio_max,
+            )
+    except IntegrityError:
+        # 다른 프로세스가 먼저 행을 만듦
+        rows.update(**increment)
+
+
+def summarize(rows: List[OccupancyRollup]) -> Dict[str, float]:
+    frames = sum(row.frames for row in rows)
+    return {
+        "frames": frames,
+        "close_count": sum(row.close_count for row in rows),
+        "open_count": sum(row.open_count for row in rows),
+        "ratio_max": max((row.ratio_max for row in rows), default=0.0),
+        "ratio_mean": sum(row.ratio_sum for row in rows) / frames if frames else 0.0,
+    }
+
+
+def backfill_rollups_from_logs(since: datetime, until: datetime) -> int:
+    """
+    [since, until) 구간 DetectionLog로 빠진 시간/일 버킷을 채움 (로그 삭제 전 호출)
+
+    분석기가 기록한 버킷이 있으면 그대로 두고, 집계 도입 이전처럼 버킷이 없는
+    구간만 열림/닫힘 횟수와 최대 점유율로 만듭니다. 프레임 수는 로그로 알 수
+    없으므로 0입니다. 구간은 현지 일 단위로 맞춰 호출해야 버킷이 나뉘지 않습니다.
+    """
+    from django.db.models import Count, Max, Q
+    from django.db.models.functions import TruncDay, TruncHour
+
+    from bollard.models import DetectionLog
+
+    logs = DetectionLog.objects.filter(timestamp__gte=since, timestamp__lt=until)
+    created = 0
+    for period, trunc in (("hour", TruncHour), ("day", TruncDay)):
+        existing = set(
+            OccupancyRollup.objects.filter(
+                period=period, bucket_start__gte=since, bucket_start__lt=until
+            ).values_list("bollard_id", "bucket_start")
+        )
+        buckets = (
+            logs.order_by()
+            .annotate(bucket=trunc("timestamp"))
+            .values("bollard_id", "bucket")
+            .annotate(
+                closes=Count("id", filter=Q(action="close")),
+                opens=Count("id", filter=Q(action="open")),
+                ratio_max=Max("occupy_ratio_actual"),
+            )
+        )
+        rollups = [
+            OccupancyRollup(
+                bollard_id=bucket["bollard_id"],
+                period=period,
+                bucket_start=bucket["bucket"],
+                close_count=bucket["closes"],
+                open_count=bucket["opens"],
+                ratio_max=bucket["ratio_max"] or 0.0,
+            )
+            for bucket in buckets
+            if (bucket["bollard_id"], bucket["bucket"]) not in existing
+        ]
+        OccupancyRollup.objects.bulk_create(rollups, ignore_conflicts=True)
+        created += len(rollups)
+    return created
@@ -0,0 +1,114 @@
+"""
+활성 BollardSetting 캐시
+
+검출/제어/상태 요청마다 실행되던 filter(is_active=True).first() 조회를 없애기 위해
+활성 설정을 프로세스 메모리와 Django 캐시 프레임워크에 2단계로 보관합니다.
+BollardSetting의 post_save/post_delete 시그널에서 invalidate()가 호출됩니다.
+
+무효화는 Django 캐시를 통해 전달되므로 여러 워커 프로세스 사이에서는 공유 캐시(settings의
+DJANGO_CACHE_REDIS_URL)를 쓸 때만 동작합니다. 기본 LocMemCache는 프로세스별이라 단일
+프로세스 배포를 전제로 하며, 이때 다른 프로세스는 BOLLARD_SETTING_CACHE_TIMEOUT까지
+이전 설정을 쓸 수 있습니다.
+
+invalidate()는 세대(generation) 번호를 올립니다. 공유 캐시 키에 세대 번호가 들어가고
+프로세스 슬롯도 세대를 확인하므로, invalidate() 전에 DB를 읽기 시작한 요청이 이전
+설정을 캐시에 다시 써 넣어도 이후 조회에는 쓰이지 않습니다.
+
+반환하는 인스턴스는 모든 분석기가 공유하므로 값을 바꾸면 안 됩니다. 설정을 수정할
+때는 BollardSetting.get_active_setting_for_update()로 DB에서 새로 읽은 사본을 씁니다.
+"""
+
+import threading
+import time
+from typing import Dict
+
+from django.conf import settings
+from django.core.cache import cache
+
+CACHE_KEY = "bollard:active_setting"
+GENERATION_KEY = "bollard:active_setting:generation"
+
+# Django 캐시 보관 시간 (초)
+DEFAULT_CACHE_TIMEOUT = 300
+# 프로세스 메모리 보관 시간 (초)
+# 공유 캐시를 쓸 때 다른 워커의 변경이 반영되기까지의 최대 지연
+DEFAULT_LOCAL_TTL = 1.0
+
+
+class ActiveSettingCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._setting = None
+        self._expires_at = 0.0
+        self._generation = 0
+        self.local_hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+
+    @property
+    def cache_timeout(self) -> int:
+        return getattr(settings, "BOLLARD_SETTING_CACHE_TIMEOUT", DEFAULT_CACHE_TIMEOUT)
+
+    @property
+    def local_ttl(self) -> float:
+        return getattr(settings, "BOLLARD_SETTING_LOCAL_TTL", DEFAULT_LOCAL_TTL)
+
+    def get(self):
+        from bollard.models import BollardSetting
+
+        setting = self._setting
+        if setting is not None and time.monotonic() < self._expires_at:
+            self.local_hits += 1
+            return setting
+
+        generation = self._generation
+        key = f"{CACHE_KEY}:{self._shared_generation()}"
+        setting = cache.get(key)
+        if setting is not None:
+            self.shared_hits += 1
+        else:
+            self.misses += 1
+            setting = BollardSetting.load_active_setting()
+            cache.set(key, setting, self.cache_timeout)
+
+        with self._lock:
+            # 조회 중에 invalidate()가 호출되었으면 읽은 값을 슬롯에 넣지 않음
+            if self._generation == generation:
+                self._setting = setting
+                self._expires_at = time.monotonic() + self.local_ttl
+        return setting
+
+    @staticmethod
+    def _shared_generation() -> int:
+        generation = cache.get(GENERATION_KEY)
+        if generation is None:
+            cache.add(GENERATION_KEY, 0, None)
+            generation = cache.get(GENERATION_KEY, 0)
+        return generation
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._setting = None
+            self._expires_at = 0.0
+        try:
+            cache.incr(GENERATION_KEY)
+        except ValueError:
+            # 세대 키가 없으면(만료/재시작) 새로 시작. 이전 세대 키는 읽히지 않음
+            if not cache.add(GENERATION_KEY, 1, None):
+                cache.incr(GENERATION_KEY)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.local_hits + self.shared_hits,
+            "local_hits": self.local_hits,
+            "shared_hits": self.shared_hits,
+            "misses": self.misses,
+        }
+
+
+_setting_cache = ActiveSettingCache()
+
+
+def get_setting_cache() -> ActiveSettingCache:
+    return _setting_cache
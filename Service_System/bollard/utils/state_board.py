@@ -0,0 +1,422 @@
+"""
+워커 프로세스 간 공유 상태 보드 (multiprocessing.shared_memory)
+
+gunicorn/uvicorn 등으로 Django 워커를 여러 개 띄우면 분석기 카운터와 볼라드별 현재
+결과가 프로세스마다 따로 존재합니다. 보드는 같은 호스트의 모든 워커가 하나의 공유
+메모리 세그먼트를 읽고 쓰도록 하여 다음을 맞춥니다.
+
+- 볼라드별 분석기 상태 (닫힘 여부, 유지 카운터, 수동 모드)
+- 볼라드별 현재 판단 결과와 버전 (라즈베리파이로 보낼 값)
+- 수동 제어 옵션 / 시스템 활성 상태 (최신 값만 유지하는 우편함)
+
+gRPC 서버를 실행하는 프로세스는 BoardWatcher로 보드 변경을 감시하여 다른 워커가
+쓴 결과와 옵션을 자신의 BollardCommandQueue로 전달합니다.
+
+레이아웃 (little endian):
+    header  magic "BSB1", 슬롯 수(uint32), 변경 순번(uint64),
+            브로드캐스트 옵션 순번(uint64)/옵션(uint8)/기록 pid(uint32),
+            시스템 활성 순번(uint64)/값(uint8)/기록 pid(uint32)
+    slot    볼라드 ID(uint32), 플래그(uint8), 카운터(int32),
+            결과 버전(uint64), 결과 변경 시각(float64, epoch),
+            옵션 순번(uint64)/옵션(uint8)/기록 pid(uint32)
+
+잠금은 잠금 파일의 바이트 범위 잠금(fcntl.lockf)으로 슬롯마다 따로 걸리므로 서로
+다른 볼라드의 갱신은 경합하지 않습니다.
+
+세그먼트는 워커가 모두 종료되어도 남아 있으므로, 보드에 붙은 프로세스는 살아 있는
+동안 잠금 파일의 ATTACH_LOCK 바이트에 공유 잠금을 유지합니다. 붙을 때 이 바이트에
+배타 잠금을 바로 잡을 수 있으면 살아 있는 다른 프로세스가 없다는 뜻이므로 이전
+실행이 남긴 값을 모두 지우고 시작합니다. (DB에서 읽은 BollardState를 이전 실행의
+카운터/닫힘 상태가 덮어쓰지 않도록) fcntl이 없는 플랫폼(Windows)에서는 보드를
+사용하지 않고 기존처럼 프로세스별 상태로 동작합니다.
+"""
+
+import logging
+import os
+import struct
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"BSB1"
+HEADER = struct.Struct("<4sIQQBIQBI")
+SLOT = struct.Struct("<IBiQdQBI")
+
+DEFAULT_NAME = "bollard_state_board"
+DEFAULT_SLOTS = 256
+# gRPC 서버 프로세스가 보드 변경을 확인하는 간격 (초)
+DEFAULT_POLL_INTERVAL = 0.02
+
+FLAG_IN_USE = 0x01
+FLAG_LOADED = 0x02
+FLAG_CLOSED = 0x04
+FLAG_MANUAL = 0x08
+FLAG_RESULT = 0x10
+
+# 잠금 파일 바이트 0은 헤더, 1 + i는 i번째 슬롯, ATTACH_LOCK은 붙어 있는 프로세스 표시
+HEADER_LOCK = 0
+ATTACH_LOCK = 1 << 20
+
+
+def encode_option(opt_val) -> int:
+    return (
+        opt_val.manual_flag
+        | opt_val.manual << 1
+        | opt_val.letsgo_flag << 2
+        | opt_val.letsgo << 3
+    )
+
+
+def decode_option(bits: int):
+    from bollard.grpc_proto.result_pb2 import OptVal
+
+    return OptVal(
+        manual_flag=bool(bits & 1),
+        manual=bool(bits & 2),
+        letsgo_flag=bool(bits & 4),
+        letsgo=bool(bits & 8),
+    )
+
+
+class SharedStateBoard:
+    def __init__(self, name: str = DEFAULT_NAME, slots: int = DEFAULT_SLOTS):
+        self.name = name
+        self.slots = slots
+        size = HEADER.size + SLOT.size * slots
+
+        try:
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            self._shm = shared_memory.SharedMemory(name=name)
+        # 워커 하나가 종료될 때 resource_tracker가 세그먼트를 지우지 않도록 함
+        resource_tracker.unregister(self._shm._name, "shared_memory")
+
+        if self._shm.size < size:
+            self._shm.close()
+            raise ValueError(
+                f"Shared state board '{name}' is smaller than {slots} slots"
+            )
+
+        self._buf = self._shm.buf
+        self._lock_fd = os.open(
+            os.path.join(tempfile.gettempdir(), f"{name}.lock"),
+            os.O_RDWR | os.O_CREAT,
+            0o600,
+        )
+        # 같은 프로세스의 스레드끼리는 fcntl 잠금이 배타적이지 않으므로 함께 사용
+        self._thread_locks: Dict[int, threading.Lock] = {}
+        self._thread_locks_guard = threading.Lock()
+        self._index: Dict[int, int] = {}
+
+        with self._locked(HEADER_LOCK):
+            magic = HEADER.unpack_from(self._buf, 0)[0]
+            if magic != MAGIC:
+                self._reset()
+            elif self._first_attached():
+                logger.info(f"Cleared stale shared state board '{name}'")
+                self._reset()
+            # 프로세스가 끝나면 운영체제가 잠금을 풀어 줌
+            fcntl.lockf(self._lock_fd, fcntl.LOCK_SH, 1, ATTACH_LOCK)
+
+    def _first_attached(self) -> bool:
+        """보드에 붙어 있는 다른 프로세스가 없으면 True (헤더 잠금 안에서 호출)"""
+        try:
+            fcntl.lockf(self._lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB, 1, ATTACH_LOCK)
+        except OSError:
+            return False
+        return True
+
+    def _reset(self) -> None:
+        size = HEADER.size + SLOT.size * self.slots
+        self._buf[:size] = bytes(size)
+        HEADER.pack_into(self._buf, 0, MAGIC, self.slots, 0, 0, 0, 0, 0, 0, 0)
+        self._index.clear()
+
+    # 잠금
+    def _thread_lock(self, offset: int) -> threading.Lock:
+        lock = self._thread_locks.get(offset)
+        if lock is None:
+            with self._thread_locks_guard:
+                lock = self._thread_locks.setdefault(offset, threading.Lock())
+        return lock
+
+    @contextmanager
+    def _locked(self, offset: int) -> Iterator[None]:
+        with self._thread_lock(offset):
+            fcntl.lockf(self._lock_fd, fcntl.LOCK_EX, 1, offset)
+            try:
+                yield
+            finally:
+                fcntl.lockf(self._lock_fd, fcntl.LOCK_UN, 1, offset)
+
+    # 헤더
+    def _header(self) -> list:
+        return list(HEADER.unpack_from(self._buf, 0))
+
+    def _bump(self, seq: Optional[int] = None, values: Tuple[int, ...] = ()) -> None:
+        """
+        헤더 변경 순번 증가
+
+        seq가 주어지면 해당 위치의 순번도 올리고 바로 뒤 필드들을 values로 갱신
+        """
+        with self._locked(HEADER_LOCK):
+            header = self._header()
+            header[2] += 1
+            if seq is not None:
+                header[seq] += 1
+                header[seq + 1 : seq + 1 + len(values)] = values
+            HEADER.pack_into(self._buf, 0, *header)
+
+    def change_seq(self) -> int:
+        # 잠금 없이 읽음 (찢어진 값이면 감시자가 한 번 더 확인할 뿐)
+        return HEADER.unpack_from(self._buf, 0)[2]
+
+    # 슬롯
+    def _offset(self, index: int) -> int:
+        return HEADER.size + SLOT.size * index
+
+    def _read(self, index: int) -> list:
+        return list(SLOT.unpack_from(self._buf, self._offset(index)))
+
+    def _write(self, index: int, values: list) -> None:
+        SLOT.pack_into(self._buf, self._offset(index), *values)
+
+    def slot_index(self, bollard_id: int) -> int:
+        index = self._index.get(bollard_id)
+        if index is not None:
+            return index
+
+        with self._locked(HEADER_LOCK):
+            free = None
+            for i in range(self.slots):
+                slot_id, flags = SLOT.unpack_from(self._buf, self._offset(i))[:2]
+                if flags & FLAG_IN_USE and slot_id == bollard_id:
+                    index = i
+                    break
+                if free is None and not flags & FLAG_IN_USE:
+                    free = i
+            else:
+                if free is None:
+                    raise RuntimeError(
+                        f"Shared state board '{self.name}' has no free slot"
+                    )
+                index = free
+                self._write(index, [bollard_id, FLAG_IN_USE, 0, 0, 0.0, 0, 0, 0])
+
+        self._index[bollard_id] = index
+        return index
+
+    @contextmanager
+    def locked_slot(self, bollard_id: int) -> Iterator[int]:
+        index = self.slot_index(bollard_id)
+        with self._locked(1 + index):
+            yield index
+
+    # 분석기 상태
+    def load_state(self, index: int, state) -> bool:
+        """보드 값을 state에 복사 (locked_slot 안에서 호출). 값이 없으면 False"""
+        flags, counter = self._read(index)[1:3]
+        if not flags & FLAG_LOADED:
+            return False
+        state.is_closed = bool(flags & FLAG_CLOSED)
+        state.manual_mode = bool(flags & FLAG_MANUAL)
+        state.counter = counter
+        return True
+
+    def store_state(self, index: int, state) -> None:
+        values = self._read(index)
+        flags = values[1] & (FLAG_IN_USE | FLAG_RESULT) | FLAG_LOADED
+        if state.is_closed:
+            flags |= FLAG_CLOSED
+        if state.manual_mode:
+            flags |= FLAG_MANUAL
+        values[1] = flags
+        values[2] = state.counter
+        self._write(index, values)
+
+    # 판단 결과
+    def put_result(self, bollard_id: int, should_close: bool) -> bool:
+        """결과가 바뀌었으면 기록하고 True"""
+        with self.locked_slot(bollard_id) as index:
+            values = self._read(index)
+            if bool(values[1] & FLAG_RESULT) == should_close:
+                return False
+            values[1] ^= FLAG_RESULT
+            values[3] += 1
+            values[4] = time.time()
+            self._write(index, values)
+        self._bump()
+        return True
+
+    # 옵션 / 시스템 활성
+    def put_option(self, opt_val, bollard_id: Optional[int] = None) -> None:
+        bits = encode_option(opt_val)
+        if bollard_id is None:
+            self._bump(3, (bits, os.getpid()))
+            return
+        with self.locked_slot(bollard_id) as index:
+            values = self._read(index)
+            values[5] += 1
+            values[6] = bits
+            values[7] = os.getpid()
+            self._write(index, values)
+        self._bump()
+
+    def set_system_active(self, active: bool) -> None:
+        self._bump(6, (int(active), os.getpid()))
+
+    def snapshot(self) -> Tuple[list, List[list]]:
+        """(헤더, 사용 중인 슬롯 목록) - 감시자용"""
+        with self._locked(HEADER_LOCK):
+            header = self._header()
+        slots = []
+        for i in range(self.slots):
+            with self._locked(1 + i):
+                values = self._read(i)
+            if not values[1] & FLAG_IN_USE:
+                # 슬롯은 앞에서부터 할당되고 해제되지 않으므로 이후는 모두 빈 슬롯
+                break
+            slots.append(values)
+        return header, slots
+
+    def stats(self) -> Dict[str, int]:
+        used = sum(
+            1
+            for i in range(self.slots)
+            if SLOT.unpack_from(self._buf, self._offset(i))[1] & FLAG_IN_USE
+        )
+        return {
+            "slots": self.slots,
+            "slots_used": used,
+            "change_seq": self.change_seq(),
+        }
+
+
+class BoardWatcher(threading.Thread):
+    """
+    보드 변경을 이 프로세스의 BollardCommandQueue/서비서에 반영 (gRPC 서버 프로세스)
+
+    결과는 값이 같으면 무시되므로 자신이 쓴 값도 그대로 적용하고, 옵션과 시스템 활성은
+    다른 프로세스가 쓴 것만 적용합니다.
+    """
+
+    def __init__(self, board: SharedStateBoard, interval: float):
+        super().__init__(name="bollard-state-board", daemon=True)
+        self.board = board
+        self.interval = interval
+        self._stop_event = threading.Event()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def run(self) -> None:
+        from bollard.utils.grpc_client import (
+            BollardCommandQueue,
+            get_grpc_servicer,
+        )
+
+        command_queue = BollardCommandQueue()
+        pid = os.getpid()
+        header, slots = self.board.snapshot()
+        seen_seq = header[2]
+        broadcast_seq, system_seq = header[3], header[6]
+        results = {slot[0]: slot[3] for slot in slots}
+        options = {slot[0]: slot[5] for slot in slots}
+
+        while not self._stop_event.wait(self.interval):
+            if self.board.change_seq() == seen_seq:
+                continue
+            header, slots = self.board.snapshot()
+            seen_seq = header[2]
+
+            for slot in slots:
+                bollard_id, flags, _, version, changed_at, option_seq, bits, writer = (
+                    slot
+                )
+                if results.get(bollard_id, 0) != version:
+                    results[bollard_id] = version
+                    # 다른 프로세스의 기록 시각을 이 프로세스의 monotonic 기준으로 변환
+                    command_queue.apply_result(
+                        bool(flags & FLAG_RESULT),
+                        bollard_id,
+                        changed_at=time.monotonic() - (time.time() - changed_at),
+                    )
+                if options.get(bollard_id, 0) != option_seq:
+                    options[bollard_id] = option_seq
+                    if writer != pid:
+                        command_queue.deliver_option(decode_option(bits), bollard_id)
+
+            if header[3] != broadcast_seq:
+                broadcast_seq = header[3]
+                if header[5] != pid:
+                    command_queue.deliver_option(decode_option(header[4]), None)
+
+            if header[6] != system_seq:
+                system_seq = header[6]
+                if header[8] != pid:
+                    get_grpc_servicer().set_system_active(bool(header[7]))
+
+
+_board: Optional[SharedStateBoard] = None
+_board_checked = False
+_board_lock = threading.Lock()
+
+
+def get_state_board() -> Optional[SharedStateBoard]:
+    """BOLLARD_SHARED_STATE가 켜져 있으면 공유 보드, 아니면 None"""
+    global _board, _board_checked
+    if _board_checked:
+        return _board
+
+    with _board_lock:
+        if _board_checked:
+            return _board
+        if getattr(settings, "BOLLARD_SHARED_STATE", False):
+            if fcntl is None:
+                logger.warning(
+                    "Shared state board needs fcntl, using per-process state"
+                )
+            else:
+                try:
+                    _board = SharedStateBoard(
+                        name=getattr(
+                            settings, "BOLLARD_SHARED_STATE_NAME", DEFAULT_NAME
+                        ),
+                        slots=getattr(
+                            settings, "BOLLARD_SHARED_STATE_SLOTS", DEFAULT_SLOTS
+                        ),
+                    )
+                    logger.info(f"Attached shared state board '{_board.name}'")
+                except Exception as e:
+                    logger.error(f"Failed to attach shared state board: {e}")
+        _board_checked = True
+    return _board
+
+
+_watcher: Optional[BoardWatcher] = None
+
+
+def start_board_watcher() -> None:
+    """gRPC 서버를 시작한 프로세스에서 호출 (보드를 사용하지 않으면 아무것도 하지 않음)"""
+    global _watcher
+    board = get_state_board()
+    if board is None or _watcher is not None:
+        return
+    _watcher = BoardWatcher(
+        board,
+        interval=getattr(settings, "BOLLARD_SHARED_STATE_POLL", DEFAULT_POLL_INTERVAL),
+    )
+    _watcher.start()
+    logger.info("Shared state board watcher started")
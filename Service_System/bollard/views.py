@@ -1,82 +1,225 @@
 import logging
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
 from django.shortcuts import render, redirect
+from django.urls import reverse
 from django.contrib.auth.decorators import login_required
 from django.views.decorators.csrf import csrf_exempt
 from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
 
 from rest_framework import status, viewsets
 from rest_framework.decorators import api_view, permission_classes, action
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.views import APIView
 
-from .models import BollardSetting, BollardState, DetectionLog
+from .models import BollardSetting, DetectionLog, OccupancyRollup
+from .pagination import DetectionLogCursorPagination
+from .parsers import BollardFrameParser
+from .renderers import EventStreamRenderer
 from .serializers import (
     DetectionResultSerializer,
+    DetectionBatchSerializer,
     BollardSettingSerializer,
     BollardStateSerializer,
     DetectionLogSerializer,
     BollardControlSerializer,
+    OccupancyRollupSerializer,
 )
-from .utils.analyzer import get_analyzer
+from .utils.analyzer import get_analyzer, get_analyzers
+from .utils.setting_cache import get_setting_cache
 from .utils.blog_integration import (
-    create_bollard_event_post,
     create_manual_control_post,
+    record_bollard_event,
+    record_bollard_events,
 )
+from .utils.event_queue import get_event_queue, submit_event
+from .utils.live_events import format_event, get_live_hub
+from .utils.rollup import PERIOD_SECONDS, PERIODS, summarize
+from .utils.state_board import get_state_board
+from .utils.coalescer import get_frame_coalescer
+from .utils.control_channel import get_control_stats
+from .utils.ingest import get_ingest_stats
 from .utils.grpc_client import (
+    DEFAULT_DEVICE_ID,
     send_bollard_open,
     send_bollard_close,
     send_auto_mode,
     send_detection_result,
     set_system_active,
+    get_stream_stats,
 )
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_ANALYTICS_MAX_BUCKETS = 3000
+
+# JSON 검출 결과와 같은 규칙(정수, 0 이상)으로 쿼리 파라미터의 bollard_id를 검증
+BOLLARD_ID_FIELD = DetectionResultSerializer().fields["bollard_id"]
+
+
+def parse_bollard_id(params):
+    """bollard_id 쿼리 파라미터 (생략 시 기본 볼라드)"""
+    try:
+        return BOLLARD_ID_FIELD.run_validation(
+            params.get("bollard_id", DEFAULT_DEVICE_ID)
+        )
+    except ValidationError as e:
+        raise ValidationError({"bollard_id": e.detail})
+
+
+def parse_time_param(params, name):
+    """ISO 8601 날짜/시각 쿼리 파라미터 (naive 값은 현재 시간대로 해석)"""
+    value = params.get(name)
+    if not value:
+        return None
+    try:
+        parsed = parse_datetime(value) or parse_date(value)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ValidationError({name: "Expected ISO 8601 date or datetime"})
+    if not isinstance(parsed, datetime):
+        parsed = datetime.combine(parsed, time.min)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
 
 class DetectionAPIView(APIView):
     permission_classes = [IsAuthenticated]
+    parser_classes = [BollardFrameParser, *api_settings.DEFAULT_PARSER_CLASSES]
 
     def post(self, request):
-        serializer = DetectionResultSerializer(data=request.data)
-
-        if not serializer.is_valid():
-            return Response(
-                {"error": "Invalid data", "details": serializer.errors},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
+        if request.content_type.startswith(BollardFrameParser.media_type):
+            # 바이너리 포맷은 디코딩 시 구조가 검증되므로 시리얼라이저 생략
+            data = request.data
+            try:
+                data["bollard_id"] = parse_bollard_id(request.query_params)
+            except ValidationError as e:
+                return Response(
+                    {"error": "Invalid data", "details": e.detail},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+        else:
+            serializer = DetectionResultSerializer(data=request.data)
+
+            if not serializer.is_valid():
+                return Response(
+                    {"error": "Invalid data", "details": serializer.errors},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            data = serializer.validated_data
+
+        if not getattr(settings, "BOLLARD_DETECTION_COALESCE", True):
+            return Response(self.process(data))
+
+        # 같은 카메라의 프레임이 처리 중이면 최신 프레임만 처리 (latest-wins)
+        result = get_frame_coalescer().submit(
+            data["bollard_id"], lambda: self.process(data), data.get("timestamp")
+        )
+        if result is None:
+            return Response({"status": "superseded", "bollard_id": data["bollard_id"]})
+        return Response(result)
 
-        data = serializer.validated_data
-        analyzer = get_analyzer()
+    @staticmethod
+    def process(data):
+        analyzer = get_analyzer(data["bollard_id"])
         should_close, max_ratio, action = analyzer.analyze(
             detections=data["detections"],
             image_width=data["image_width"],
             image_height=data["image_height"],
+            timestamp=data.get("timestamp"),
         )
 
-        send_detection_result(should_close)
+        send_detection_result(should_close, data["bollard_id"])
 
         if action != "none":
-            # Blog 포스트 생성
-            post = create_bollard_event_post(
-                image_base64=data.get("image"), action=action, occupy_ratio=max_ratio
-            )
-
-            log = DetectionLog.objects.create(
-                detected=should_close,
-                occupy_ratio_actual=max_ratio,
+            # Blog 포스트 생성 및 로그 기록은 이벤트 큐에서 비동기로 처리
+            submit_event(
+                record_bollard_event,
+                bollard_id=data["bollard_id"],
+                image_base64=data.get("image"),
+                image_data=data.get("image_data"),
                 action=action,
-                post=post,
+                occupy_ratio=max_ratio,
+                detected=should_close,
+                timestamp=data.get("timestamp") or timezone.now(),
             )
 
             logger.info(f"Bollard action: {action}, ratio: {max_ratio:.1f}%")
 
+        return {
+            "status": "processed",
+            "should_close": should_close,
+            "max_ratio": max_ratio,
+            "action": action,
+        }
+
+
+class DetectionBatchAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        serializer = DetectionBatchSerializer(data=request.data)
+
+        if not serializer.is_valid():
+            return Response(
+                {"error": "Invalid data", "details": serializer.errors},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        results = []
+        events = []
+        latest = {}
+
+        # 프레임 순서대로 분석 (카운터가 프레임 순서에 의존)
+        for frame in serializer.validated_data["frames"]:
+            analyzer = get_analyzer(frame["bollard_id"])
+            should_close, max_ratio, action = analyzer.analyze(
+                detections=frame["detections"],
+                image_width=frame["image_width"],
+                image_height=frame["image_height"],
+                timestamp=frame.get("timestamp"),
+            )
+            results.append(
+                {"should_close": should_close, "max_ratio": max_ratio, "action": action}
+            )
+            latest[frame["bollard_id"]] = should_close
+
+            if action != "none":
+                events.append(
+                    {
+                        "bollard_id": frame["bollard_id"],
+                        "image_base64": frame.get("image"),
+                        "action": action,
+                        "occupy_ratio": max_ratio,
+                        "detected": should_close,
+                        "timestamp": frame.get("timestamp") or timezone.now(),
+                    }
+                )
+                logger.info(f"Bollard action: {action}, ratio: {max_ratio:.1f}%")
+
+        # 볼라드별 마지막 판단만 라즈베리파이로 전달
+        for bollard_id, bollard_should_close in latest.items():
+            send_detection_result(bollard_should_close, bollard_id)
+        should_close = results[-1]["should_close"]
+
+        if events:
+            submit_event(record_bollard_events, events)
+
         return Response(
             {
                 "status": "processed",
+                "count": len(results),
                 "should_close": should_close,
-                "max_ratio": max_ratio,
-                "action": action,
+                "results": results,
             }
         )
 
@@ -94,38 +237,44 @@ class BollardControlAPIView(APIView):
             )
 
         action = serializer.validated_data["action"]
-        analyzer = get_analyzer()
-        setting = BollardSetting.get_active_setting()
+        bollard_id = serializer.validated_data.get("bollard_id")
+        analyzers = get_analyzers(bollard_id)
 
         if action == "open":
-            analyzer.force_open()
-            send_bollard_open()
+            for analyzer in analyzers:
+                analyzer.force_open()
+            send_bollard_open(bollard_id)
             set_system_active(False)
             create_manual_control_post("open", request.user.username)
             message = "볼라드가 열렸습니다"
 
         elif action == "close":
-            analyzer.force_close()
-            send_bollard_close()
+            for analyzer in analyzers:
+                analyzer.force_close()
+            send_bollard_close(bollard_id)
             set_system_active(False)
             create_manual_control_post("close", request.user.username)
             message = "볼라드가 닫혔습니다"
 
         elif action == "auto":
-            analyzer.set_auto_mode()
-            send_auto_mode()
+            for analyzer in analyzers:
+                analyzer.set_auto_mode()
+            send_auto_mode(bollard_id)
             set_system_active(True)
             message = "자동 모드로 전환되었습니다"
 
         elif action == "start_system":
+            setting = BollardSetting.get_active_setting_for_update()
             setting.is_active = True
             setting.save()
-            analyzer.set_auto_mode()
+            for analyzer in analyzers:
+                analyzer.set_auto_mode()
             send_auto_mode()
             set_system_active(True)
             message = "시스템이 시작되었습니다"
 
         elif action == "stop_system":
+            setting = BollardSetting.get_active_setting_for_update()
             setting.is_active = False
             setting.save()
             set_system_active(False)
@@ -147,7 +296,7 @@ class BollardSettingViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=["post", "patch"])
     def update_active(self, request):
-        setting = BollardSetting.get_active_setting()
+        setting = BollardSetting.get_active_setting_for_update()
         serializer = self.get_serializer(setting, data=request.data, partial=True)
 
         if serializer.is_valid():
@@ -166,18 +315,145 @@ class BollardStateAPIView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        state = BollardState.get_instance()
+        bollard_id = parse_bollard_id(request.query_params)
+        state = get_analyzer(bollard_id).get_state()
         serializer = BollardStateSerializer(state)
         return Response(serializer.data)
 
 
+class LiveStreamAPIView(APIView):
+    """
+    상태 전환/감지 로그 실시간 스트림 (Server-Sent Events)
+
+    접속 시 현재 볼라드 상태를 보낸 뒤, 이후 발행되는 state/log 이벤트를 전달합니다.
+    재접속 시 Last-Event-ID 이후의 버퍼된 이벤트부터 이어서 받습니다.
+    동시 스트림 한도(BOLLARD_LIVE_MAX_STREAMS)를 넘으면 503과 폴링할 상태 API 주소를 반환합니다.
+    """
+
+    permission_classes = [IsAuthenticated]
+    renderer_classes = [EventStreamRenderer, *api_settings.DEFAULT_RENDERER_CLASSES]
+
+    def get(self, request):
+        try:
+            last_event_id = int(request.headers["Last-Event-ID"])
+        except (KeyError, ValueError):
+            last_event_id = None
+
+        # 스트림을 처음 읽을 때 평가 (동시 스트림 한도를 넘으면 만들지 않음)
+        initial = (
+            format_event("state", BollardStateSerializer(analyzer.get_state()).data)
+            for analyzer in get_analyzers()
+        )
+        stream = get_live_hub().stream(last_event_id=last_event_id, initial=initial)
+        if stream is None:
+            return Response(
+                {
+                    "error": "Too many live streams",
+                    "poll": reverse("bollard_state_api"),
+                },
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={"Retry-After": "30"},
+            )
+        response = StreamingHttpResponse(stream, content_type="text/event-stream")
+        response["Cache-Control"] = "no-cache"
+        # nginx 등 리버스 프록시 버퍼링 비활성화
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+
 class DetectionLogViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = DetectionLog.objects.all().order_by("-timestamp")
+    """
+    감지 로그 조회 (커서 페이지네이션)
+
+    필터 (모두 인덱스 사용):
+        ?action=open|close|none
+        ?since=<ISO 8601>  ?until=<ISO 8601>  (since <= timestamp < until)
+    """
+
+    queryset = DetectionLog.objects.all()
     serializer_class = DetectionLogSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = DetectionLogCursorPagination
 
     def get_queryset(self):
-        return self.queryset[:100]
+        queryset = self.queryset
+        params = self.request.query_params
+
+        action = params.get("action")
+        if action:
+            if action not in dict(DetectionLog.ACTION_CHOICES):
+                raise ValidationError({"action": f"Unknown action '{action}'"})
+            queryset = queryset.filter(action=action)
+
+        since = parse_time_param(params, "since")
+        if since:
+            queryset = queryset.filter(timestamp__gte=since)
+        until = parse_time_param(params, "until")
+        if until:
+            queryset = queryset.filter(timestamp__lt=until)
+        return queryset
+
+
+class OccupancyAnalyticsAPIView(APIView):
+    """
+    점유율 집계 조회
+
+    ?bollard_id=0 ?period=minute|hour|day (생략 시 기간에 맞춰 선택)
+    ?since=<ISO 8601> ?until=<ISO 8601> (기본: 최근 24시간)
+
+    OccupancyRollup 버킷만 읽으므로 원본 로그 크기와 관계없이 조회 행 수는
+    BOLLARD_ANALYTICS_MAX_BUCKETS 이하입니다. 최근 checkpoint 간격 동안의 프레임은
+    아직 반영되지 않았을 수 있습니다.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        params = request.query_params
+        bollard_id = parse_bollard_id(params)
+
+        until = parse_time_param(params, "until") or timezone.now()
+        since = parse_time_param(params, "since") or until - timedelta(days=1)
+        if since >= until:
+            raise ValidationError({"since": "since must be earlier than until"})
+
+        max_buckets = getattr(
+            settings, "BOLLARD_ANALYTICS_MAX_BUCKETS", DEFAULT_ANALYTICS_MAX_BUCKETS
+        )
+        span = (until - since).total_seconds()
+        period = params.get("period")
+        if period is None:
+            # 버킷 수가 한도 안에 드는 가장 세밀한 단위
+            period = next(
+                (p for p in PERIODS if span / PERIOD_SECONDS[p] <= max_buckets),
+                PERIODS[-1],
+            )
+        elif period not in PERIOD_SECONDS:
+            raise ValidationError({"period": f"Unknown period '{period}'"})
+
+        if span / PERIOD_SECONDS[period] > max_buckets:
+            raise ValidationError(
+                {"period": f"Range exceeds {max_buckets} {period} buckets"}
+            )
+
+        rows = list(
+            OccupancyRollup.objects.filter(
+                bollard_id=bollard_id,
+                period=period,
+                bucket_start__gte=since,
+                bucket_start__lt=until,
+            ).order_by("bucket_start")
+        )
+        return Response(
+            {
+                "bollard_id": bollard_id,
+                "period": period,
+                "since": since,
+                "until": until,
+                "totals": summarize(rows),
+                "buckets": OccupancyRollupSerializer(rows, many=True).data,
+            }
+        )
 
 
 class SystemStatusAPIView(APIView):
@@ -185,19 +461,28 @@ class SystemStatusAPIView(APIView):
 
     def get(self, request):
         setting = BollardSetting.get_active_setting()
-        state = BollardState.get_instance()
+        state = get_analyzer().get_state()
+        board = get_state_board()
 
         return Response(
             {
                 "setting": BollardSettingSerializer(setting).data,
                 "state": BollardStateSerializer(state).data,
+                "setting_cache": get_setting_cache().stats(),
+                "event_queue": get_event_queue().stats(),
+                "grpc_stream": get_stream_stats(),
+                "live_stream": get_live_hub().stats(),
+                "shared_state": board.stats() if board else None,
+                "control_channel": get_control_stats(),
+                "grpc_ingest": get_ingest_stats(),
+                "detection_coalescing": get_frame_coalescer().stats(),
             }
         )
 
 
 def bollard_dashboard(request):
     setting = BollardSetting.get_active_setting()
-    state = BollardState.get_instance()
+    state = get_analyzer().get_state()
     recent_logs = DetectionLog.objects.all().order_by("-timestamp")[:20]
 
     context = {
@@ -211,12 +496,13 @@ def bollard_dashboard(request):
 
 def bollard_setting_view(request):
     setting = BollardSetting.get_active_setting()
-    state = BollardState.get_instance()
+    state = get_analyzer().get_state()
 
     message = ""
     system_status = "run" if setting.is_active and not state.manual_mode else "stop"
 
     if request.method == "POST":
+        setting = BollardSetting.get_active_setting_for_update()
         action = request.POST.get("action")
 
         if action == "bopen":
@@ -265,6 +551,9 @@ def bollard_setting_view(request):
             system_status = "run"
             message = "시스템이 시작되었습니다"
 
+        # get_state()는 사본이므로 제어 후의 상태를 다시 읽음
+        state = get_analyzer().get_state()
+
     context = {
         "setting": setting,
         "state": state,
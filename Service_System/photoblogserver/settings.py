@@ -57,7 +57,6 @@ REST_FRAMEWORK = {
         "rest_framework.authentication.SessionAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": ["rest_framework.permissions.IsAdminUser"],
-    "PAGE_SIZE": 10,
 }
 
 MIDDLEWARE = [
@@ -144,3 +143,90 @@ MEDIA_ROOT = os.path.join(BASE_DIR, "media")
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+# 볼라드 분석기 상태 체크포인트 간격 (초)
+# 열림/닫힘 전환은 즉시 저장되고, 카운터 변화는 이 간격마다 DB에 기록됩니다.
+BOLLARD_STATE_CHECKPOINT_INTERVAL = float(
+    os.environ.get("BOLLARD_STATE_CHECKPOINT_INTERVAL", "5.0")
+)
+
+# Django 캐시
+# 기본값 LocMemCache는 프로세스마다 따로 있으므로 설정 변경(무효화)이 다른 워커에 전달되지
+# 않습니다. 여러 워커 프로세스로 실행할 때는 DJANGO_CACHE_REDIS_URL로 공유 캐시(Redis,
+# pip install redis)를 지정해야 합니다. (예: redis://127.0.0.1:6379/1)
+DJANGO_CACHE_REDIS_URL = os.environ.get("DJANGO_CACHE_REDIS_URL")
+if DJANGO_CACHE_REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": DJANGO_CACHE_REDIS_URL,
+        }
+    }
+else:
+    CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+# 활성 볼라드 설정 캐시
+# Django 캐시 보관 시간(초)과 프로세스 메모리 보관 시간(초)
+BOLLARD_SETTING_CACHE_TIMEOUT = 300
+BOLLARD_SETTING_LOCAL_TTL = 1.0
+
+# 볼라드 이벤트(포스트 생성, 감지 로그) 비동기 처리 큐
+# SQLite는 쓰기 잠금이 하나뿐이므로 워커 1개를 기본으로 사용합니다.
+BOLLARD_EVENT_ASYNC = True
+BOLLARD_EVENT_WORKERS = 1
+BOLLARD_EVENT_QUEUE_SIZE = 100
+BOLLARD_EVENT_SUBMIT_TIMEOUT = 0.05
+
+# 검출 결과 배치 API 한 요청당 최대 프레임 수
+BOLLARD_DETECTION_BATCH_MAX = 500
+
+# Require 스트림 keepalive 간격 (초, 0이면 상태 변경 시에만 전송)
+BOLLARD_GRPC_KEEPALIVE = 5.0
+
+# grpc.aio(asyncio) 서버 사용 여부
+# 스트림마다 스레드를 점유하지 않으므로 많은 수의 라즈베리파이 연결을 처리할 수 있습니다.
+BOLLARD_GRPC_ASYNC = True
+
+# 점유율 집계 조회 시 최대 버킷 수 (기간이 길면 더 큰 단위로 조회)
+BOLLARD_ANALYTICS_MAX_BUCKETS = 3000
+
+# 게시글 이미지 렌디션 (이름: 긴 변 최대 픽셀)
+BLOG_IMAGE_RENDITIONS = {"thumbnail": 320, "medium": 1024}
+BLOG_IMAGE_RENDITION_QUALITY = 80
+# 원본 업로드 이미지 캐시 시간 (초, 렌디션은 1년 immutable)
+BLOG_MEDIA_MAX_AGE = 86400
+
+# 보존 정책 (일, None이면 무기한) - python manage.py bollard_retention
+BOLLARD_RETENTION = {
+    "detection_log": 90,
+    "rollup_minute": 14,
+    "rollup_hour": 400,
+    "rollup_day": None,
+    "media": 30,
+}
+# 오래된 미디어 압축 번들 저장 위치
+BOLLARD_ARCHIVE_ROOT = os.path.join(BASE_DIR, "archive")
+
+# 워커 프로세스 간 공유 상태 보드 (분석기 상태/판단 결과/수동 제어를 모든 워커가 공유)
+# gunicorn 등으로 워커를 여러 개 실행할 때 켭니다. (fcntl이 있는 POSIX 환경)
+BOLLARD_SHARED_STATE = os.environ.get("BOLLARD_SHARED_STATE", "False") == "True"
+BOLLARD_SHARED_STATE_NAME = "bollard_state_board"
+BOLLARD_SHARED_STATE_SLOTS = 256
+# gRPC 서버 프로세스가 다른 워커의 변경을 확인하는 간격 (초)
+BOLLARD_SHARED_STATE_POLL = 0.02
+
+# 실시간 이벤트(SSE) 릴레이 - 워커가 여러 개이면 다른 워커에서 발행된 이벤트도 전달
+BOLLARD_LIVE_RELAY = BOLLARD_SHARED_STATE
+BOLLARD_LIVE_RELAY_DIR = "/tmp/bollard_live"
+# 프로세스당 동시 SSE 스트림 수 (스트림마다 WSGI 스레드 하나를 점유, 넘으면 폴링 안내)
+BOLLARD_LIVE_MAX_STREAMS = 20
+
+# gRPC 서버를 별도 프로세스로 실행 (python manage.py bollard_grpc)
+# 켜면 웹 워커는 gRPC 서버를 띄우지 않고 명령을 Unix 도메인 소켓으로 전달합니다.
+BOLLARD_CONTROL_PLANE = os.environ.get("BOLLARD_CONTROL_PLANE", "False") == "True"
+BOLLARD_CONTROL_SOCKET = os.environ.get(
+    "BOLLARD_CONTROL_SOCKET", "/tmp/bollard_control.sock"
+)
+
+# 검출 API latest-wins 병합 (카메라별로 처리 중 1개 + 대기 1개만 유지, 나머지는 superseded 응답)
+BOLLARD_DETECTION_COALESCE = True
@@ -21,6 +21,8 @@ from django.urls import path, include
 from django.conf.urls.static import static
 from rest_framework.authtoken.views import obtain_auth_token
 
+from blog.views import serve_media
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("", include("blog.urls")),
@@ -29,4 +31,6 @@ urlpatterns = [
 ]
 
 urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+urlpatterns += static(
+    settings.MEDIA_URL, view=serve_media, document_root=settings.MEDIA_ROOT
+)